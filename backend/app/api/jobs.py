@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, Query, HTTPException
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.models import Job
+from app.schemas import JobCreate, JobResponse, JOB_PARAMS
+from app.services.jobs import JobConflict, cancel_job, submit_job
+from typing import List, Optional
+import json
+
+router = APIRouter()
+
+def _job_response(job: Job, with_result: bool = True) -> dict:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "params": json.loads(job.params or '{}'),
+        "result": json.loads(job.result) if with_result and job.result else None,
+        "error": job.error,
+        "progress": job.progress,
+        "cancel_requested": job.cancel_requested,
+        "worker": job.worker,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "heartbeat_at": job.heartbeat_at,
+        "finished_at": job.finished_at
+    }
+
+def _get_job(db: Session, job_id: int) -> Job:
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.post("/", response_model=JobResponse, status_code=202)
+def create_job(body: JobCreate, db: Session = Depends(get_db)):
+    """
+    Queue a harvest, retrain or reindex job
+    
+    The job runs in scripts/run_worker.py, not in the API; poll
+    GET /api/jobs/{id} for progress. 409 if a job of this kind is already
+    queued.
+    """
+    try:
+        params = JOB_PARAMS[body.kind](**body.params).model_dump(exclude_none=True)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+    
+    try:
+        job = submit_job(db, body.kind, params)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return _job_response(job)
+
+@router.get("/", response_model=List[JobResponse])
+def get_jobs(
+    status: Optional[str] = Query(None),
+    kind: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Most recent jobs first (results omitted, see the detail endpoint)"""
+    query = db.query(Job)
+    if status:
+        query = query.filter(Job.status == status)
+    if kind:
+        query = query.filter(Job.kind == kind)
+    
+    return [_job_response(job, with_result=False) for job in query.order_by(Job.id.desc()).limit(limit)]
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    """Job status, progress and result"""
+    return _job_response(_get_job(db, job_id))
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+def cancel(job_id: int, db: Session = Depends(get_db)):
+    """
+    Cancel a job: queued jobs immediately, running jobs at their next
+    progress point (next loaded batch / training stage)
+    """
+    try:
+        job = cancel_job(db, _get_job(db, job_id))
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return _job_response(job)
@@ -1,13 +1,40 @@
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
-from app.database import get_db
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import func, or_, select
+from app.database import get_read_db, read_session
 from app.models import Publication, Author, Topic, publication_authors, PublicationTopic
 from app.schemas import PublicationResponse, PublicationDetail, PaginatedPublicationResponse
+from app.services.analytics import get_analytics_snapshot
+from app.services.counts import count_publications
+from app.services.export import EXPORT_FORMATS, build_export_query, stream_export
+from app.services.facets import compute_facets
 from typing import List, Optional
+import importlib.util
 
 router = APIRouter()
 
+def apply_publication_filters(query, year: Optional[int], topic_id: Optional[int], search: Optional[str]):
+    """Apply the shared year / topic / search filters to a Query or select()"""
+    if year:
+        query = query.filter(Publication.year == year)
+    
+    if topic_id:
+        query = query.join(
+            PublicationTopic, PublicationTopic.publication_id == Publication.id
+        ).filter(PublicationTopic.topic_id == topic_id)
+    
+    if search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            or_(
+                Publication.title.ilike(search_term),
+                Publication.abstract.ilike(search_term)
+            )
+        )
+    
+    return query
+
 @router.get("/", response_model=PaginatedPublicationResponse)
 def get_publications(
     page: int = Query(1, ge=1),
@@ -15,7 +42,7 @@ def get_publications(
     year: Optional[int] = Query(None),
     topic_id: Optional[int] = Query(None),
     search: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get paginated publications with optional filters
@@ -27,44 +54,36 @@ def get_publications(
         topic_id: Filter by topic ID
         search: Search in title and abstract
     """
-    query = db.query(Publication)
-    
-    # Apply filters
-    if year:
-        query = query.filter(Publication.year == year)
-    
-    if topic_id:
-        query = query.join(PublicationTopic).filter(PublicationTopic.topic_id == topic_id)
-    
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Publication.title.ilike(search_term),
-                Publication.abstract.ilike(search_term)
-            )
-        )
+    query = apply_publication_filters(db.query(Publication), year, topic_id, search)
     
-    # Get total count
-    total = query.count()
+    # Get total count (summary table / planner estimate / cache)
+    total, approximate = count_publications(
+        db, query, year=year, topic_id=topic_id, search=search
+    )
     
     # Calculate pagination
     skip = (page - 1) * per_page
     total_pages = (total + per_page - 1) // per_page
     
-    # Get paginated results
-    publications = query.order_by(
+    # Get paginated results - one extra row tells us if a next page exists;
+    # authors come in one extra IN query instead of one lazy load per row
+    publications = query.options(
+        selectinload(Publication.authors)
+    ).order_by(
         Publication.year.desc(),
         Publication.id.desc()
-    ).offset(skip).limit(per_page).all()
+    ).offset(skip).limit(per_page + 1).all()
+    
+    has_next = len(publications) > per_page
     
     return {
-        "items": publications,
+        "items": publications[:per_page],
         "total": total,
+        "total_is_approximate": approximate,
         "page": page,
         "per_page": per_page,
         "total_pages": total_pages,
-        "has_next": page < total_pages,
+        "has_next": has_next,
         "has_prev": page > 1
     }
 
@@ -72,7 +91,7 @@ def get_publications(
 def search_publications(
     q: str = Query(..., min_length=2),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Quick search endpoint for autocomplete
@@ -99,9 +118,24 @@ def search_publications(
     }
 
 @router.get("/stats")
-def get_publication_stats(db: Session = Depends(get_db)):
+def get_publication_stats(db: Session = Depends(get_read_db)):
     """Get statistics about publications"""
     
+    # Columnar snapshot when there is one; the database otherwise
+    snapshot = get_analytics_snapshot()
+    if snapshot is not None:
+        totals = snapshot.totals()
+        return {
+            "total_publications": totals['publications'],
+            "total_authors": totals['authors'],
+            "total_topics": totals['topics'],
+            "publications_by_year": {str(year): count for year, count in snapshot.publications_by_year()},
+            "top_authors": [
+                {"name": name, "count": count}
+                for name, _, count in snapshot.top_authors(10)
+            ]
+        }
+    
     total_pubs = db.query(func.count(Publication.id)).scalar()
     total_authors = db.query(func.count(func.distinct(Author.id))).scalar()
     total_topics = db.query(func.count(Topic.id)).scalar()
@@ -129,10 +163,72 @@ def get_publication_stats(db: Session = Depends(get_db)):
         ]
     }
 
+@router.get("/facets")
+def get_publication_facets(
+    year: Optional[int] = Query(None),
+    topic_id: Optional[int] = Query(None),
+    search: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get year, topic and institution counts for the current filters
+    
+    All facets are computed in a single SQL statement; each facet counts
+    its own distinct (publication, value) pairs.
+    
+    Args:
+        limit: Max values per topic / institution facet
+    """
+    filtered = apply_publication_filters(
+        select(Publication.id, Publication.year), year, topic_id, search
+    )
+    
+    return compute_facets(db, filtered, limit=limit)
+
+@router.get("/export")
+def export_publications(
+    fmt: str = Query("csv", alias="format", pattern="^(csv|ndjson|parquet)$"),
+    year: Optional[int] = Query(None),
+    topic_id: Optional[int] = Query(None),
+    search: Optional[str] = Query(None)
+):
+    """
+    Stream all publications matching the filters as CSV, NDJSON or Parquet
+    
+    Same filters as the list endpoint, but no pagination: rows are read
+    through a server-side cursor and written out batch by batch, so memory
+    stays constant for a full-table export.
+    """
+    if fmt == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    
+    media_type, extension = EXPORT_FORMATS[fmt]
+    
+    def generate():
+        # The request-scoped session is closed before streaming starts,
+        # so the generator owns its own session
+        db = read_session()
+        try:
+            stmt = apply_publication_filters(
+                build_export_query(db.get_bind().dialect.name), year, topic_id, search
+            )
+            yield from stream_export(db, stmt, fmt)
+        finally:
+            db.close()
+    
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="publications.{extension}"'}
+    )
+
 @router.get("/{publication_id}", response_model=PublicationDetail)
-def get_publication(publication_id: int, db: Session = Depends(get_db)):
+def get_publication(publication_id: int, db: Session = Depends(get_read_db)):
     """Get detailed information about a specific publication"""
-    pub = db.query(Publication).filter(Publication.id == publication_id).first()
+    pub = db.query(Publication).options(
+        joinedload(Publication.authors)
+    ).filter(Publication.id == publication_id).first()
     
     if not pub:
         raise HTTPException(status_code=404, detail="Publication not found")
@@ -142,12 +238,6 @@ def get_publication(publication_id: int, db: Session = Depends(get_db)):
         PublicationTopic.publication_id == publication_id
     ).all()
     
-    # FIXED: Explicitly load authors relationship
-    from sqlalchemy.orm import joinedload
-    pub = db.query(Publication).options(
-        joinedload(Publication.authors)
-    ).filter(Publication.id == publication_id).first()
-    
     return {
         "id": pub.id,
         "title": pub.title,
@@ -155,6 +245,48 @@ def get_publication(publication_id: int, db: Session = Depends(get_db)):
         "year": pub.year,
         "source": pub.source,
         "url": pub.url,
-        "authors": pub.authors,  # Now properly loaded
+        "doi": pub.doi,
+        "authors": pub.authors,
         "topics": topics
-    }
\ No newline at end of file
+    }
+
+@router.get("/{publication_id}/related")
+def get_related_publications(
+    publication_id: int,
+    k: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_read_db)
+):
+    """Get the publications most similar to this one (cosine over topic vectors)"""
+    # numpy is only loaded by the first related request, not at app import
+    from app.services.similarity import get_similarity_index
+
+    index = get_similarity_index()
+    
+    if index is None:
+        raise HTTPException(status_code=503, detail="Similarity index not built yet")
+    
+    neighbours = index.related(publication_id, k)
+    
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail="Publication not in similarity index")
+    
+    ids = [pub_id for pub_id, _ in neighbours]
+    pubs = {
+        p.id: p for p in db.query(
+            Publication.id, Publication.title, Publication.year
+        ).filter(Publication.id.in_(ids)).all()
+    } if ids else {}
+    
+    return {
+        "publication_id": publication_id,
+        "results": [
+            {
+                "id": pub_id,
+                "title": pubs[pub_id].title,
+                "year": pubs[pub_id].year,
+                "score": round(score, 4)
+            }
+            for pub_id, score in neighbours
+            if pub_id in pubs
+        ]
+    }
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.database import get_db
+from sqlalchemy import func, tuple_
+from app.database import get_read_db
 from app.models import Topic, PublicationTopic, Publication
-from typing import List
+from app.services.analytics import get_analytics_snapshot
+from typing import List, Optional
 
 router = APIRouter()
 
 @router.get("/")
-def get_topics(db: Session = Depends(get_db)):
+def get_topics(db: Session = Depends(get_read_db)):
     """Get all topics with publication counts"""
     topics = db.query(
         Topic.id,
@@ -27,10 +28,13 @@ def get_topics(db: Session = Depends(get_db)):
         for t in topics
     ]
 
-@router.get("/trends")
-def get_topic_trends(db: Session = Depends(get_db)):
-    """Get topic distribution over years"""
-    trends = db.query(
+def _trend_rows(db: Session):
+    """(year, topic name, count) from the analytics snapshot, or from the database"""
+    snapshot = get_analytics_snapshot()
+    if snapshot is not None:
+        return snapshot.topic_trends()
+    
+    return db.query(
         Publication.year,
         Topic.name,
         func.count(PublicationTopic.id).label('count')
@@ -45,12 +49,129 @@ def get_topic_trends(db: Session = Depends(get_db)):
     ).order_by(
         Publication.year, Topic.name
     ).all()
+
+def _trend_version(db: Session) -> str:
+    """Changes whenever the trend data can have changed (ingestion, retrain)"""
+    snapshot = get_analytics_snapshot()
+    if snapshot is not None:
+        return snapshot.version
     
+    # Index-only lookups: new publications, new topics (retrain), new assignments
+    return "db-{}-{}-{}".format(
+        db.query(func.max(Publication.id)).scalar() or 0,
+        db.query(func.max(Topic.id)).scalar() or 0,
+        db.query(func.max(PublicationTopic.id)).scalar() or 0
+    )
+
+@router.get("/trends")
+def get_topic_trends(db: Session = Depends(get_read_db)):
+    """Get topic distribution over years"""
     return [
         {
-            "year": t.year,
-            "topic": t.name,
-            "count": t.count
+            "year": year,
+            "topic": topic,
+            "count": count
         }
-        for t in trends
-    ]
\ No newline at end of file
+        for year, topic, count in _trend_rows(db)
+    ]
+
+@router.get("/emerging")
+def get_emerging_topics(
+    window: int = Query(3, ge=1, le=10),
+    limit: int = Query(10, ge=1, le=50),
+    min_publications: int = Query(5, ge=0),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Topics ranked by how much their share of output grew: the last `window`
+    years against the `window` years before, with YoY growth and moving
+    average per topic (computed server-side, cached per data version)
+    """
+    # numpy is only loaded by the first request, not at app import
+    from app.services.topic_growth import emerging_topics
+    
+    return emerging_topics(
+        _trend_version(db), lambda: _trend_rows(db),
+        window=window, limit=limit, min_publications=min_publications
+    )
+
+def _parse_cursor(cursor: str):
+    """Decode a keyset cursor of the form '<probability>:<publication_id>'"""
+    try:
+        probability, publication_id = cursor.split(':', 1)
+        return float(probability), int(publication_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/{topic_id}/publications")
+def get_topic_publications(
+    topic_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get the most representative publications for a topic
+    
+    Results are ordered by topic probability (highest first) and paginated
+    with a keyset cursor, so every page is an index range scan on
+    (topic_id, probability DESC, publication_id DESC).
+    
+    Args:
+        topic_id: Topic ID
+        limit: Items per page (max 100)
+        cursor: `next_cursor` value from the previous page
+    """
+    topic = db.query(Topic.id, Topic.name).filter(Topic.id == topic_id).first()
+    
+    if not topic:
+        raise HTTPException(status_code=404, detail="Topic not found")
+    
+    query = db.query(
+        PublicationTopic.publication_id,
+        PublicationTopic.probability,
+        Publication.title,
+        Publication.year
+    ).join(
+        Publication, Publication.id == PublicationTopic.publication_id
+    ).filter(
+        PublicationTopic.topic_id == topic_id,
+        PublicationTopic.probability != None
+    )
+    
+    if cursor:
+        last_probability, last_id = _parse_cursor(cursor)
+        query = query.filter(
+            tuple_(PublicationTopic.probability, PublicationTopic.publication_id)
+            < tuple_(last_probability, last_id)
+        )
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(
+        PublicationTopic.probability.desc(),
+        PublicationTopic.publication_id.desc()
+    ).limit(limit + 1).all()
+    
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    
+    next_cursor = None
+    if has_next:
+        last = rows[-1]
+        next_cursor = f"{last.probability!r}:{last.publication_id}"
+    
+    return {
+        "topic_id": topic.id,
+        "topic": topic.name,
+        "items": [
+            {
+                "id": r.publication_id,
+                "title": r.title,
+                "year": r.year,
+                "probability": r.probability
+            }
+            for r in rows
+        ],
+        "next_cursor": next_cursor,
+        "has_next": has_next
+    }
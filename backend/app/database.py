@@ -1,20 +1,91 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+"""
+Engine and sessions
+
+The engine is created on first use - get_engine(), the first SessionLocal()
+or the app's lifespan - never at import, so importing the app needs no
+database. Tables are managed by scripts/init_database.py and
+scripts/migrate_database.py, not by the API.
+
+Read-only endpoints use get_read_db(), which routes to the read replicas in
+DATABASE_REPLICA_URLS when they are healthy and current (app/replicas.py).
+"""
 import os
+import threading
+from typing import Optional
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from dotenv import load_dotenv
+from app.query_profiler import install_query_hooks
+from app.replicas import REPLICA_URLS, ReplicaRouter
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+_read_router: Optional[ReplicaRouter] = None
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker that binds itself to the engine on the first session"""
+
+    def __call__(self, **local_kw):
+        if _engine is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+SessionLocal = _LazySessionmaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+def get_engine() -> Engine:
+    """The process-wide engine; creating it does not open a connection yet"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            database_url = os.getenv("DATABASE_URL")
+            if not database_url:
+                raise RuntimeError("DATABASE_URL is not set")
+            engine = create_engine(database_url)
+            # Statement timing, slow-query log and N+1 detection (app/query_profiler.py)
+            install_query_hooks(engine)
+            SessionLocal.configure(bind=engine)
+            _engine = engine
+    return _engine
+
+def get_read_router() -> ReplicaRouter:
+    """Router over the configured replicas (none configured: always the primary)"""
+    global _read_router
+    with _engine_lock:
+        if _read_router is None:
+            _read_router = ReplicaRouter.from_urls(SessionLocal, REPLICA_URLS)
+    return _read_router
+
+def read_session() -> Session:
+    """Session for read-only work; may be on a replica, so never write with it"""
+    return get_read_router().session()
+
+def dispose_engine():
+    """Close pooled connections (app shutdown); the engines reconnect if used again"""
+    if _engine is not None:
+        _engine.dispose()
+    if _read_router is not None:
+        _read_router.dispose()
+
+def __getattr__(name: str):
+    # `from app.database import engine` in the scripts
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    db = read_session()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,39 +1,65 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.api import publications, topics
+from app.database import get_engine, dispose_engine
+from app.api import publications, topics, jobs
+from app.metrics import MetricsMiddleware, render_metrics
 import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="BRIN Research Explorer API",
-    description="API for BRIN publication topic analysis",
-    version="1.0.0"
-)
-
-# CORS
-origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Routes
-app.include_router(publications.router, prefix="/api/publications", tags=["Publications"])
-app.include_router(topics.router, prefix="/api/topics", tags=["Topics"])
-
-@app.get("/")
-def read_root():
-    return {"message": "BRIN Research Explorer API"}
-
-@app.get("/health")
-def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Engine (and connection pool) per worker process; connections are only
+    # opened by the first request, so startup does not wait for the database
+    get_engine()
+    yield
+    dispose_engine()
+
+def create_app() -> FastAPI:
+    """
+    Build the API application
+
+    Importing this module has no side effects beyond building the app:
+    tables are created by scripts/init_database.py / scripts/migrate_database.py.
+    """
+    app = FastAPI(
+        title="BRIN Research Explorer API",
+        description="API for BRIN publication topic analysis",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # CORS
+    origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Per-route latency / size / DB time, exposed on /metrics
+    app.add_middleware(MetricsMiddleware)
+
+    # Routes
+    app.include_router(publications.router, prefix="/api/publications", tags=["Publications"])
+    app.include_router(topics.router, prefix="/api/topics", tags=["Topics"])
+    app.include_router(jobs.router, prefix="/api/jobs", tags=["Jobs"])
+
+    @app.get("/")
+    def read_root():
+        return {"message": "BRIN Research Explorer API"}
+
+    @app.get("/health")
+    def health_check():
+        return {"status": "healthy"}
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        """Prometheus scrape endpoint"""
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+    return app
+
+app = create_app()
@@ -0,0 +1,102 @@
+import time
+from prometheus_client import CollectorRegistry, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from app.query_profiler import track_queries
+
+# Own registry: only the metrics below, no process/GC collectors
+REGISTRY = CollectorRegistry()
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency until the last body chunk is sent',
+    ['method', 'route', 'status'], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size',
+    ['method', 'route'], buckets=SIZE_BUCKETS, registry=REGISTRY
+)
+REQUEST_DB_TIME = Histogram(
+    'http_request_db_seconds', 'Time spent executing SQL per request',
+    ['method', 'route'], buckets=LATENCY_BUCKETS, registry=REGISTRY
+)
+REQUEST_DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL statements executed per request',
+    ['method', 'route'], buckets=QUERY_BUCKETS, registry=REGISTRY
+)
+IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'Requests being served', registry=REGISTRY
+)
+
+_METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+def _route_label(scope) -> str:
+    # FastAPI stores the matched route; its path is the template (/{pub_id}),
+    # so label cardinality stays bounded by the number of routes
+    route = scope.get('route')
+    return getattr(route, 'path', None) or 'unmatched'
+
+_children_cache = {}
+
+def _children(method: str, route: str, status: int):
+    """Labelled histograms of one (method, route, status), resolved once"""
+    key = (method, route, status)
+    children = _children_cache.get(key)
+    if children is None:
+        children = _children_cache[key] = (
+            REQUEST_LATENCY.labels(method, route, str(status)),
+            RESPONSE_SIZE.labels(method, route),
+            REQUEST_DB_TIME.labels(method, route),
+            REQUEST_DB_QUERIES.labels(method, route),
+        )
+    return children
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, response size, DB time and
+    query count, plus the number of in-flight requests
+
+    Plain ASGI rather than BaseHTTPMiddleware: no extra task per request and
+    streamed responses (exports) are timed until their last chunk.
+    DB time and query count come from the query profiler, which also checks
+    each request for N+1 patterns (and raises in N_PLUS_ONE_STRICT mode).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {'status': 500, 'bytes': 0}
+        method = scope['method'] if scope['method'] in _METHODS else 'OTHER'
+
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['bytes'] += len(message.get('body', b''))
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            with track_queries() as db:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    db.label = f"{method} {_route_label(scope)}"
+        finally:
+            IN_FLIGHT.dec()
+            latency, size, db_time, db_queries = _children(method, _route_label(scope), response['status'])
+            latency.observe(time.perf_counter() - started)
+            size.observe(response['bytes'])
+            db_time.observe(db.seconds)
+            db_queries.observe(db.count)
+
+def render_metrics():
+    """(body, content type) in Prometheus text exposition format"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,5 +1,6 @@
 # backend/app/models.py
-from sqlalchemy import Column, Integer, String, Text, Date, Table, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Float, Boolean, LargeBinary, Table, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -7,7 +8,8 @@ from app.database import Base
 publication_authors = Table(
     'publication_authors', Base.metadata,
     Column('publication_id', Integer, ForeignKey('publications.id')),
-    Column('author_id', Integer, ForeignKey('authors.id'))
+    Column('author_id', Integer, ForeignKey('authors.id')),
+    UniqueConstraint('publication_id', 'author_id', name='uq_publication_authors')
 )
 
 class Publication(Base):
@@ -19,6 +21,13 @@ class Publication(Base):
     year = Column(Integer, index=True)
     source = Column(String)  # GARUDA/SINTA
     url = Column(String)
+    openalex_id = Column(String, unique=True, index=True)  # e.g. https://openalex.org/W123
+    doi = Column(String, unique=True, index=True)  # normalized: lower case, no https://doi.org/
+    
+    # Title + year dedup during bulk ingestion
+    __table_args__ = (
+        Index('ix_publications_title_lower', func.lower(title)),
+    )
     
     authors = relationship("Author", secondary=publication_authors, back_populates="publications")
     topics = relationship("PublicationTopic", back_populates="publication")
@@ -29,6 +38,9 @@ class Author(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     affiliation = Column(String)
+    openalex_id = Column(String, unique=True, index=True)  # e.g. https://openalex.org/A123
+    name_key = Column(String, index=True)  # normalize_name(name)
+    block_key = Column(String, index=True)  # blocking_key(name_key), for fuzzy matching
     
     publications = relationship("Publication", secondary=publication_authors, back_populates="authors")
 
@@ -47,7 +59,69 @@ class PublicationTopic(Base):
     id = Column(Integer, primary_key=True, index=True)
     publication_id = Column(Integer, ForeignKey('publications.id'))
     topic_id = Column(Integer, ForeignKey('topics.id'))
-    probability = Column(String)  # Topic probability score
+    probability = Column(Float)  # Topic probability score
     
     publication = relationship("Publication", back_populates="topics")
-    topic = relationship("Topic", back_populates="publications")
\ No newline at end of file
+    topic = relationship("Topic", back_populates="publications")
+    
+    __table_args__ = (
+        # Ranked lookup per topic: WHERE topic_id = ? ORDER BY probability DESC
+        Index(
+            'ix_publication_topics_topic_probability',
+            'topic_id', probability.desc(), publication_id.desc()
+        ),
+    )
+
+class PublicationCount(Base):
+    """Precomputed publication counts per (year, topic); 0 means 'all'"""
+    __tablename__ = "publication_counts"
+    
+    year = Column(Integer, primary_key=True, autoincrement=False)
+    topic_id = Column(Integer, primary_key=True, autoincrement=False)
+    publication_count = Column(Integer, nullable=False, default=0)
+
+class HarvestWatermark(Base):
+    """Incremental harvesting state per OpenAlex query"""
+    __tablename__ = "harvest_watermarks"
+    
+    query_key = Column(String, primary_key=True)
+    watermark = Column(Date, nullable=False)  # next run fetches works changed on/after this date
+    last_run_at = Column(DateTime)
+    last_fetched = Column(Integer, default=0)
+
+class PublicationSignature(Base):
+    """MinHash signature of title + abstract (near-duplicate detection)"""
+    __tablename__ = "publication_signatures"
+    
+    publication_id = Column(Integer, ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+    signature = Column(LargeBinary, nullable=False)  # NUM_PERM x uint32
+
+class PublicationLSHBucket(Base):
+    """LSH band buckets; publications sharing a bucket are duplicate candidates"""
+    __tablename__ = "publication_lsh_buckets"
+    
+    bucket = Column(BigInteger, primary_key=True, autoincrement=False)
+    publication_id = Column(Integer, ForeignKey('publications.id', ondelete='CASCADE'), primary_key=True)
+
+class Job(Base):
+    """Background job (harvest / retrain / reindex), run by scripts/run_worker.py"""
+    __tablename__ = "jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)
+    status = Column(String, nullable=False, default='queued')  # queued/running/succeeded/failed/cancelled
+    params = Column(Text)  # JSON
+    result = Column(Text)  # JSON
+    error = Column(Text)
+    progress = Column(String)  # last progress message from the worker
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    worker = Column(String)  # host:pid that claimed the job
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    
+    __table_args__ = (
+        # Worker poll: oldest queued job first
+        Index('ix_jobs_status_id', 'status', 'id'),
+    )
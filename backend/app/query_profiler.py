@@ -0,0 +1,166 @@
+"""
+SQL profiling hooks on the engine
+
+Every statement is timed. Statements slower than SLOW_QUERY_MS are logged
+with their bound parameters (and, with EXPLAIN_SLOW_QUERIES=1 on PostgreSQL,
+their EXPLAIN (ANALYZE, BUFFERS) plan). Inside `track_queries()` - one per
+HTTP request, see MetricsMiddleware - statements are also counted per shape
+so a request that repeats the same query N times (lazy loads in a loop) is
+reported as a likely N+1; with N_PLUS_ONE_STRICT=1 (tests) it raises instead.
+"""
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger('app.sql')
+
+def _flag(name: str) -> bool:
+    return os.getenv(name, '').lower() in ('1', 'true', 'yes')
+
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', '250'))
+# EXPLAIN ANALYZE runs the statement a second time - opt-in only
+EXPLAIN_SLOW_QUERIES = _flag('EXPLAIN_SLOW_QUERIES')
+# Same statement shape this many times in one request = probable N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv('N_PLUS_ONE_THRESHOLD', '5'))
+N_PLUS_ONE_STRICT = _flag('N_PLUS_ONE_STRICT')
+
+MAX_LOGGED_CHARS = 2000
+
+class NPlusOneError(AssertionError):
+    """A tracked block repeated one statement shape N_PLUS_ONE_THRESHOLD+ times"""
+
+# Quoted strings and numbers, so raw SQL with inlined literals groups too
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+def statement_shape(statement: str) -> str:
+    """SQL text with literals replaced by ? and whitespace collapsed"""
+    return ' '.join(_LITERALS.sub('?', statement).split())
+
+class QueryStats:
+    """Statements executed inside one `track_queries()` block"""
+
+    __slots__ = ('label', 'seconds', 'count', 'statements')
+
+    def __init__(self, label: str = ''):
+        self.label = label
+        self.seconds = 0.0
+        self.count = 0
+        # Raw SQL text -> executions; ORM statements come from the compiled
+        # cache, so counting the string is cheap and shapes are resolved once
+        # at the end
+        self.statements = Counter()
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(shape, executions) of every shape run at least `threshold` times"""
+        threshold = threshold or N_PLUS_ONE_THRESHOLD
+        shapes = Counter()
+        for statement, n in self.statements.items():
+            shapes[statement_shape(statement)] += n
+        return [(shape, n) for shape, n in shapes.most_common() if n >= threshold]
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar('query_stats', default=None)
+
+def check_n_plus_one(stats: QueryStats, strict: Optional[bool] = None):
+    """Log (or raise NPlusOneError, in strict mode) on repeated statement shapes"""
+    repeated = stats.repeated()
+    if not repeated:
+        return
+
+    details = '\n'.join(f"  {n}x {_truncate(shape)}" for shape, n in repeated)
+    message = f"Possible N+1 in {stats.label or 'tracked block'} ({stats.count} statements):\n{details}"
+
+    if N_PLUS_ONE_STRICT if strict is None else strict:
+        raise NPlusOneError(message)
+    logger.warning(message)
+
+@contextmanager
+def track_queries(label: str = '', strict: Optional[bool] = None):
+    """
+    Count and time the statements executed in this context (and in sync
+    endpoints it dispatches to the threadpool, which copy the context)
+
+    On a clean exit the block is checked for N+1 patterns.
+    """
+    stats = QueryStats(label)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    check_n_plus_one(stats, strict)
+
+def _truncate(text) -> str:
+    text = str(text)
+    return text if len(text) <= MAX_LOGGED_CHARS else text[:MAX_LOGGED_CHARS] + '...'
+
+def _explain(conn, statement: str, parameters) -> str:
+    """EXPLAIN (ANALYZE, BUFFERS) on the raw DBAPI cursor, so no hooks fire"""
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        # A failing EXPLAIN must not abort the caller's transaction
+        cursor.execute('SAVEPOINT explain_slow_query')
+        try:
+            cursor.execute('EXPLAIN (ANALYZE, BUFFERS) ' + statement, parameters)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        except Exception as e:
+            cursor.execute('ROLLBACK TO SAVEPOINT explain_slow_query')
+            plan = f'EXPLAIN failed: {e}'
+        cursor.execute('RELEASE SAVEPOINT explain_slow_query')
+        return plan
+    finally:
+        cursor.close()
+
+def _log_slow_query(conn, statement: str, parameters, executemany: bool, elapsed: float):
+    plan = None
+    if (EXPLAIN_SLOW_QUERIES and not executemany and conn.dialect.name == 'postgresql'
+            and statement.lstrip()[:6].upper() == 'SELECT'):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as e:
+            plan = f'EXPLAIN failed: {e}'
+
+    logger.warning(
+        "Slow query (%.1f ms): %s\nParameters: %s%s",
+        elapsed * 1000, _truncate(statement), _truncate(parameters),
+        f"\n{plan}" if plan else ''
+    )
+
+def install_query_hooks(engine: Engine):
+    """Time every statement on `engine` and feed the slow-query log / N+1 detector"""
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get('query_started')
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+
+        stats = _current.get()
+        if stats is not None:
+            stats.seconds += elapsed
+            stats.count += 1
+            stats.statements[statement] += 1
+
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            _log_slow_query(conn, statement, parameters, executemany, elapsed)
+
+    @event.listens_for(engine, 'handle_error')
+    def _error(exception_context):
+        # Failed statements never reach after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('query_started'):
+            conn.info['query_started'].pop()
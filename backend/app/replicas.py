@@ -0,0 +1,153 @@
+"""
+Read/write session routing
+
+Read-only endpoints take their session from a ReplicaRouter: replicas are
+used round-robin as long as they answer and their replication lag stays
+under REPLICA_MAX_LAG_SECONDS; otherwise the read goes to the primary.
+Writers (ingestion, jobs, migrations) always use the primary.
+
+Lag and health are probed at most once per REPLICA_CHECK_INTERVAL per
+replica, so routing costs nothing per request. A replica that drops a
+connection mid-request is probed again before its next use. Connections to
+replicas give up after REPLICA_CONNECT_TIMEOUT, so an unreachable replica
+delays the request that probes it by at most that long.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from app.query_profiler import install_query_hooks
+
+logger = logging.getLogger('app.db')
+
+# Comma-separated URLs of read replicas; empty = every read uses the primary
+REPLICA_URLS = [u.strip() for u in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if u.strip()]
+# A replica further behind than this is skipped until it catches up
+REPLICA_MAX_LAG_SECONDS = float(os.getenv('REPLICA_MAX_LAG_SECONDS', '10'))
+# Seconds a replica's lag / health probe result is reused
+REPLICA_CHECK_INTERVAL = float(os.getenv('REPLICA_CHECK_INTERVAL', '5'))
+# Seconds to wait for a replica connection (libpq counts whole seconds, minimum 2)
+REPLICA_CONNECT_TIMEOUT = int(os.getenv('REPLICA_CONNECT_TIMEOUT', '2'))
+
+def replica_lag_seconds(conn: Connection) -> Optional[float]:
+    """
+    Replication delay of the database behind `conn`
+
+    0 when it is not a streaming standby (a primary, or another database
+    such as the SQLite copies used in tests) or has replayed everything it
+    received; None when it never replayed anything yet.
+    """
+    if conn.dialect.name != 'postgresql':
+        return 0.0
+    in_recovery, caught_up, delay = conn.exec_driver_sql(
+        "SELECT pg_is_in_recovery(), "
+        "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), "
+        "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+    ).one()
+    if not in_recovery or caught_up:
+        return 0.0
+    return float(delay) if delay is not None else None
+
+class Replica:
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.lag: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at = float('-inf')
+
+        @event.listens_for(engine, 'handle_error')
+        def _on_error(context):
+            if context.is_disconnect:
+                self.checked_at = float('-inf')
+
+class ReplicaRouter:
+    """Hands out read sessions: a fresh-enough replica, else the primary"""
+
+    def __init__(
+        self,
+        primary: Callable[[], Session],
+        engines: List[Engine],
+        max_lag: float = REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = REPLICA_CHECK_INTERVAL,
+        lag_probe: Callable[[Connection], Optional[float]] = replica_lag_seconds
+    ):
+        self.primary = primary
+        self.replicas = [Replica(f"replica{i}", engine) for i, engine in enumerate(engines)]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self.routed: Dict[str, int] = {r.name: 0 for r in self.replicas}
+        self.routed['primary'] = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_urls(cls, primary: Callable[[], Session], urls: List[str], **kwargs) -> 'ReplicaRouter':
+        engines = []
+        for url in urls:
+            connect_args = {}
+            if make_url(url).get_backend_name() == 'postgresql':
+                connect_args['connect_timeout'] = REPLICA_CONNECT_TIMEOUT
+            engine = create_engine(url, pool_pre_ping=True, connect_args=connect_args)
+            install_query_hooks(engine)
+            engines.append(engine)
+        return cls(primary, engines, **kwargs)
+
+    def _probe(self, replica: Replica):
+        was_usable = self._usable(replica)
+        # Requests arriving meanwhile keep using the last result instead of probing too
+        replica.checked_at = time.monotonic()
+        try:
+            with replica.engine.connect() as conn:
+                replica.lag = self.lag_probe(conn)
+            replica.error = None
+        except SQLAlchemyError as e:
+            replica.lag = None
+            replica.error = str(e).splitlines()[0]
+        replica.checked_at = time.monotonic()
+
+        if was_usable != self._usable(replica):
+            if self._usable(replica):
+                logger.info("%s in rotation (lag %.1fs)", replica.name, replica.lag)
+            else:
+                logger.warning("%s out of rotation: %s", replica.name,
+                               replica.error or f"lag {replica.lag}s > {self.max_lag}s")
+
+    def _usable(self, replica: Replica) -> bool:
+        return replica.error is None and replica.lag is not None and replica.lag <= self.max_lag
+
+    def session(self) -> Session:
+        """Session on the next usable replica, or on the primary if none is"""
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.replicas), 1)
+
+        for i in range(len(self.replicas)):
+            replica = self.replicas[(start + i) % len(self.replicas)]
+            if time.monotonic() - replica.checked_at >= self.check_interval:
+                self._probe(replica)
+            if self._usable(replica):
+                self.routed[replica.name] += 1
+                return replica.sessions()
+
+        self.routed['primary'] += 1
+        return self.primary()
+
+    def status(self) -> List[Dict]:
+        return [
+            {'name': r.name, 'usable': self._usable(r), 'lag_seconds': r.lag,
+             'error': r.error, 'sessions': self.routed[r.name]}
+            for r in self.replicas
+        ]
+
+    def dispose(self):
+        for replica in self.replicas:
+            replica.engine.dispose()
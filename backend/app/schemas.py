@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
-from datetime import date
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date, datetime
 
 class AuthorBase(BaseModel):
     name: str
@@ -29,6 +29,7 @@ class PublicationBase(BaseModel):
     year: Optional[int] = None
     source: Optional[str] = None
     url: Optional[str] = None
+    doi: Optional[str] = None
 
 class PublicationResponse(PublicationBase):
     id: int
@@ -48,8 +49,48 @@ class PaginatedPublicationResponse(BaseModel):
     """Paginated response wrapper"""
     items: List[PublicationResponse]
     total: int
+    total_is_approximate: bool = False
     page: int
     per_page: int
     total_pages: int
     has_next: bool
-    has_prev: bool
\ No newline at end of file
+    has_prev: bool
+
+class HarvestJobParams(BaseModel):
+    """Harvest job parameters (same meaning as the fetch_openalex_data.py flags)"""
+    limit: int = Field(500, ge=1, le=100000)
+    year_from: int = Field(2020, ge=1900)
+    year_to: Optional[int] = None
+    institutions: Optional[List[str]] = None
+    fields: Optional[List[str]] = None
+    incremental: bool = False
+    email: Optional[str] = None
+    retrain: bool = True  # queue a retrain job when publications changed
+    
+    class Config:
+        extra = 'forbid'
+
+class NoJobParams(BaseModel):
+    class Config:
+        extra = 'forbid'
+
+JOB_PARAMS = {'harvest': HarvestJobParams, 'retrain': NoJobParams, 'reindex': NoJobParams}
+
+class JobCreate(BaseModel):
+    kind: Literal['harvest', 'retrain', 'reindex']
+    params: Dict[str, Any] = {}
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str
+    params: Dict[str, Any] = {}
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    progress: Optional[str] = None
+    cancel_requested: bool = False
+    worker: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,415 @@
+"""
+Columnar analytics snapshot
+
+The trend and statistics aggregates scan publication_topics and
+publication_authors end to end, which is slow on the row store and competes
+with OLTP traffic. Ingestion and topic modeling therefore keep a Parquet
+snapshot of the few columns those aggregates need, and the API answers them
+with DuckDB over that snapshot (falling back to the database when there is
+no snapshot or DuckDB is not installed).
+
+Layout:
+    <dir>/parts/<table>-<ns>.parquet   immutable parts, zstd
+    <dir>/manifest-<version>.json      parts of each table + id high-water marks
+    <dir>/CURRENT                      name of the live manifest
+
+Refreshes append parts for publications / authors / author links added
+since the last one, rewrite topics and publication_topics after a retrain,
+and compact a table once it has more than MAX_PARTS parts. When the rows
+below the high-water marks no longer match the snapshot (rows committed out
+of id order, deletes, links added to older works), or the caller updated
+existing rows, every table is rewritten instead. Readers never
+see a half-written snapshot: CURRENT is switched with os.replace() after
+all parts are written.
+"""
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models import Author, Publication, PublicationTopic, Topic, publication_authors
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger('app.analytics')
+
+ANALYTICS_DIR = os.getenv("ANALYTICS_DIR", "data/analytics")
+
+# Rows fetched per server-side cursor round trip / written per row group
+BATCH_SIZE = 100000
+
+# Appended parts per table before they are compacted into one
+MAX_PARTS = 8
+
+# Manifests kept (with their parts) next to the live one, for readers
+# that are still querying the previous version
+KEEP_VERSIONS = 2
+
+# Top authors computed per version; callers ask for a prefix of this list
+MAX_TOP_AUTHORS = 100
+
+# Queries need DuckDB; writing the snapshot only needs pyarrow
+DUCKDB_AVAILABLE = importlib.util.find_spec('duckdb') is not None
+
+TABLES = ('publications', 'publication_topics', 'topics', 'publication_authors', 'authors')
+
+def _schema(table: str):
+    import pyarrow as pa
+
+    return {
+        'publications': pa.schema([('id', pa.int64()), ('year', pa.int32())]),
+        # year is denormalized so trends need no join with publications
+        'publication_topics': pa.schema([
+            ('publication_id', pa.int64()), ('topic_id', pa.int32()), ('year', pa.int32())
+        ]),
+        'topics': pa.schema([('id', pa.int32()), ('name', pa.string())]),
+        'publication_authors': pa.schema([('publication_id', pa.int64()), ('author_id', pa.int64())]),
+        'authors': pa.schema([('id', pa.int64()), ('name', pa.string()), ('affiliation', pa.string())]),
+    }[table]
+
+def _table_query(table: str, publications: Tuple[int, int], authors: Tuple[int, int]) -> Select:
+    """Rows of `table`; appendable tables only for ids in the (after, upto] ranges"""
+    if table == 'publications':
+        return select(Publication.id, Publication.year).where(
+            Publication.id > publications[0], Publication.id <= publications[1]
+        ).order_by(Publication.id)
+    if table == 'publication_authors':
+        link = publication_authors.c
+        return select(link.publication_id, link.author_id).where(
+            link.publication_id > publications[0], link.publication_id <= publications[1]
+        ).order_by(link.publication_id)
+    if table == 'authors':
+        return select(Author.id, Author.name, Author.affiliation).where(
+            Author.id > authors[0], Author.id <= authors[1]
+        ).order_by(Author.id)
+    if table == 'topics':
+        return select(Topic.id, Topic.name).order_by(Topic.id)
+    return select(
+        PublicationTopic.publication_id, PublicationTopic.topic_id, Publication.year
+    ).join(
+        Publication, Publication.id == PublicationTopic.publication_id
+    )
+
+def _write_part(db: Session, table: str, stmt: Select, parts_dir: str) -> Tuple[str, int]:
+    """Stream the rows of `stmt` into a new Parquet part"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _schema(table)
+    name = f"{table}-{time.time_ns()}.parquet"
+    tmp_path = os.path.join(parts_dir, f"{name}.tmp")
+    rows = 0
+
+    with pq.ParquetWriter(tmp_path, schema, compression='zstd') as writer:
+        result = db.execute(stmt.execution_options(yield_per=BATCH_SIZE))
+        for batch in result.partitions():
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+                schema=schema
+            ))
+            rows += len(batch)
+
+    os.replace(tmp_path, os.path.join(parts_dir, name))
+    return name, rows
+
+def _compact(table: str, parts: List[str], parts_dir: str) -> str:
+    """Merge the parts of a table into one, batch by batch"""
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    name = f"{table}-{time.time_ns()}.parquet"
+    tmp_path = os.path.join(parts_dir, f"{name}.tmp")
+    dataset = ds.dataset([os.path.join(parts_dir, p) for p in parts], schema=_schema(table), format='parquet')
+    with pq.ParquetWriter(tmp_path, dataset.schema, compression='zstd') as writer:
+        for batch in dataset.to_batches(batch_size=BATCH_SIZE):
+            writer.write_batch(batch)
+    os.replace(tmp_path, os.path.join(parts_dir, name))
+    return name
+
+def read_manifest(snapshot_dir: str = ANALYTICS_DIR) -> Optional[Dict]:
+    try:
+        with open(os.path.join(snapshot_dir, 'CURRENT')) as f:
+            current = f.read().strip()
+        with open(os.path.join(snapshot_dir, current)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _remove_old_versions(snapshot_dir: str, keep: str):
+    manifests = sorted(m for m in os.listdir(snapshot_dir) if m.startswith('manifest-') and m.endswith('.json'))
+    previous = [m for m in manifests if m != keep]
+    kept = [keep] + (previous[-(KEEP_VERSIONS - 1):] if KEEP_VERSIONS > 1 else [])
+    for manifest in previous:
+        if manifest not in kept:
+            os.remove(os.path.join(snapshot_dir, manifest))
+
+    referenced = set()
+    for manifest in kept:
+        with open(os.path.join(snapshot_dir, manifest)) as f:
+            for parts in json.load(f)['tables'].values():
+                referenced.update(parts)
+
+    parts_dir = os.path.join(snapshot_dir, 'parts')
+    for part in os.listdir(parts_dir):
+        if part not in referenced:
+            os.remove(os.path.join(parts_dir, part))
+
+def _appends_line_up(db: Session, manifest: Dict) -> bool:
+    """
+    True if the rows up to the manifest's high-water marks are still exactly
+    the ones in the snapshot, so appending what lies above them is enough
+    """
+    link = publication_authors.c
+    counts = {
+        'publications': db.query(func.count(Publication.id)).filter(
+            Publication.id <= manifest['max_publication_id']).scalar(),
+        'authors': db.query(func.count(Author.id)).filter(
+            Author.id <= manifest['max_author_id']).scalar(),
+        'publication_authors': db.query(func.count()).select_from(publication_authors).filter(
+            link.publication_id <= manifest['max_publication_id']).scalar(),
+    }
+    return all(manifest['rows'][table] == count for table, count in counts.items())
+
+@contextmanager
+def _refresh_lock(snapshot_dir: str):
+    """One refresh at a time per snapshot (a harvest and a retrain job may overlap)"""
+    with open(os.path.join(snapshot_dir, '.lock'), 'w') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+def refresh_analytics_snapshot(
+    db: Session,
+    topics: bool = False,
+    full: bool = False,
+    snapshot_dir: str = ANALYTICS_DIR
+) -> Optional[Dict]:
+    """
+    Bring the snapshot up to date with the database
+
+    Appends the publications, authors and author links added since the last
+    refresh. topics=True also rewrites topics / publication_topics (after a
+    retrain replaced them). Every table is rewritten with full=True - pass
+    it after updating existing rows, which appends do not see - when there
+    is no snapshot yet, or when rows below the high-water marks changed.
+
+    Returns:
+        The new manifest, or None when nothing changed
+    """
+    if not snapshot_dir:
+        return None
+
+    parts_dir = os.path.join(snapshot_dir, 'parts')
+    os.makedirs(parts_dir, exist_ok=True)
+
+    with _refresh_lock(snapshot_dir):
+        manifest = None if full else read_manifest(snapshot_dir)
+        if manifest is not None and not _appends_line_up(db, manifest):
+            logger.info("Rows below the snapshot's high-water marks changed, rewriting it")
+            manifest = None
+        if manifest is None:
+            tables = {table: [] for table in TABLES}
+            rows = {table: 0 for table in TABLES}
+            rewrite = set(TABLES)
+            after_publication = after_author = 0
+        else:
+            tables = {table: list(parts) for table, parts in manifest['tables'].items()}
+            rows = dict(manifest['rows'])
+            rewrite = {'topics', 'publication_topics'} if topics else set()
+            after_publication, after_author = manifest['max_publication_id'], manifest['max_author_id']
+
+        # Upper bounds first: rows inserted while we read wait for the next
+        # refresh instead of showing up in one table but not the other
+        publications = (after_publication, max(db.query(func.max(Publication.id)).scalar() or 0, after_publication))
+        authors = (after_author, max(db.query(func.max(Author.id)).scalar() or 0, after_author))
+
+        changed = False
+        for table in TABLES:
+            if table not in rewrite:
+                id_range = authors if table == 'authors' else publications
+                if table in ('topics', 'publication_topics') or id_range[1] == id_range[0]:
+                    continue
+
+            name, written = _write_part(db, table, _table_query(table, publications, authors), parts_dir)
+            if table in rewrite:
+                tables[table], rows[table] = [name], written
+            elif written:
+                tables[table].append(name)
+                rows[table] += written
+            else:
+                os.remove(os.path.join(parts_dir, name))
+                continue
+            changed = True
+
+            if len(tables[table]) > MAX_PARTS:
+                tables[table] = [_compact(table, tables[table], parts_dir)]
+
+        if not changed and manifest is not None:
+            return None
+
+        version = f"v{time.time_ns()}"
+        new_manifest = {
+            'version': version,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'max_publication_id': publications[1],
+            'max_author_id': authors[1],
+            'tables': tables,
+            'rows': rows,
+        }
+        manifest_name = f"manifest-{version}.json"
+        with open(os.path.join(snapshot_dir, manifest_name), 'w') as f:
+            json.dump(new_manifest, f, indent=2)
+
+        pointer_tmp = os.path.join(snapshot_dir, f"CURRENT.{os.getpid()}.tmp")
+        with open(pointer_tmp, 'w') as f:
+            f.write(manifest_name)
+        os.replace(pointer_tmp, os.path.join(snapshot_dir, 'CURRENT'))
+
+        _remove_old_versions(snapshot_dir, keep=manifest_name)
+        return new_manifest
+
+def _sql_list(paths: List[str]) -> str:
+    return "[" + ", ".join("'" + p.replace("'", "''") + "'" for p in paths) + "]"
+
+class AnalyticsSnapshot:
+    """
+    DuckDB views over one snapshot version
+
+    Each aggregate is computed once per version and then served from memory.
+    """
+
+    def __init__(self, snapshot_dir: str, manifest: Dict):
+        import duckdb
+
+        self.version = manifest['version']
+        self.manifest = manifest
+        self.conn = duckdb.connect(':memory:')
+        parts_dir = os.path.join(snapshot_dir, 'parts')
+        for table, parts in manifest['tables'].items():
+            files = [os.path.join(parts_dir, p) for p in parts]
+            self.conn.execute(f"CREATE VIEW {table} AS SELECT * FROM read_parquet({_sql_list(files)})")
+        self._results: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def _query(self, key: str, sql: str) -> list:
+        with self._lock:
+            if key not in self._results:
+                # One cursor per query: the shared connection is not thread-safe
+                self._results[key] = self.conn.cursor().execute(sql).fetchall()
+            return self._results[key]
+
+    def warm(self) -> 'AnalyticsSnapshot':
+        """Compute every aggregate now instead of on first request"""
+        self.topic_trends()
+        self.totals()
+        self.publications_by_year()
+        self.top_authors()
+        return self
+
+    def topic_trends(self) -> List[Tuple[int, str, int]]:
+        """(year, topic name, publication_topics rows), ordered like /api/topics/trends"""
+        return self._query('topic_trends', """
+            SELECT year, t.name AS topic, sum(n)::BIGINT AS count
+            FROM (
+                SELECT year, topic_id, count(*) AS n
+                FROM publication_topics
+                WHERE year IS NOT NULL
+                GROUP BY year, topic_id
+            ) pt
+            JOIN topics t ON t.id = pt.topic_id
+            GROUP BY year, t.name
+            ORDER BY year, t.name
+        """)
+
+    def totals(self) -> Dict[str, int]:
+        (publications, authors, topics), = self._query('totals', """
+            SELECT (SELECT count(*) FROM publications),
+                   (SELECT count(*) FROM authors),
+                   (SELECT count(*) FROM topics)
+        """)
+        return {'publications': publications, 'authors': authors, 'topics': topics}
+
+    def publications_by_year(self) -> List[Tuple[int, int]]:
+        return self._query('publications_by_year', """
+            SELECT year, count(*) FROM publications
+            WHERE year IS NOT NULL
+            GROUP BY year ORDER BY year
+        """)
+
+    def top_authors(self, limit: int = 10) -> List[Tuple[str, Optional[str], int]]:
+        """(name, affiliation, publications) of the most prolific authors, at most MAX_TOP_AUTHORS"""
+        return self._query('top_authors', f"""
+            SELECT a.name, a.affiliation, pa.n
+            FROM (
+                SELECT author_id, count(*) AS n
+                FROM publication_authors
+                GROUP BY author_id
+                ORDER BY n DESC, author_id
+                LIMIT {MAX_TOP_AUTHORS}
+            ) pa
+            JOIN authors a ON a.id = pa.author_id
+            ORDER BY pa.n DESC, pa.author_id
+        """)[:limit]
+
+_lock = threading.Lock()
+_loaded: Dict[str, AnalyticsSnapshot] = {}
+_warming: set = set()
+
+def _warm_and_swap(snapshot_dir: str, manifest: Dict):
+    try:
+        snapshot = AnalyticsSnapshot(snapshot_dir, manifest).warm()
+        with _lock:
+            _loaded[snapshot_dir] = snapshot
+    except Exception:
+        logger.exception("Loading analytics snapshot %s failed", manifest['version'])
+    finally:
+        with _lock:
+            _warming.discard(snapshot_dir)
+
+def get_analytics_snapshot(snapshot_dir: str = ANALYTICS_DIR) -> Optional[AnalyticsSnapshot]:
+    """
+    The live snapshot, or None (no snapshot yet, or DuckDB not installed)
+
+    A new version is warmed in a background thread while requests are still
+    answered from the previous one, so no request waits for a cold scan.
+    """
+    if not snapshot_dir or not DUCKDB_AVAILABLE:
+        return None
+    try:
+        with open(os.path.join(snapshot_dir, 'CURRENT')) as f:
+            current = f.read().strip()
+    except FileNotFoundError:
+        return None
+
+    with _lock:
+        snapshot = _loaded.get(snapshot_dir)
+        if snapshot is not None and f"manifest-{snapshot.version}.json" == current:
+            return snapshot
+        if snapshot is not None and snapshot_dir in _warming:
+            return snapshot
+
+        manifest = read_manifest(snapshot_dir)
+        if manifest is None:
+            return snapshot
+        if snapshot is None:
+            # First load in this process: nothing older to serve meanwhile
+            snapshot = AnalyticsSnapshot(snapshot_dir, manifest)
+            _loaded[snapshot_dir] = snapshot
+            return snapshot
+
+        _warming.add(snapshot_dir)
+        threading.Thread(
+            target=_warm_and_swap, args=(snapshot_dir, manifest), name='analytics-warm', daemon=True
+        ).start()
+        return snapshot
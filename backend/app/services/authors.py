@@ -0,0 +1,192 @@
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+from app.models import Author
+
+# Academic titles / honorifics dropped from the start of a name
+NAME_PREFIXES = {'dr', 'drs', 'dra', 'prof', 'ir', 'h', 'hj', 'mr', 'mrs', 'ms'}
+
+# Minimum similarity for two ID-less names in the same block
+FUZZY_THRESHOLD = 0.92
+
+def normalize_name(name: str) -> str:
+    """
+    Normalized matching key for an author display name
+
+    'Prof. Dr. Budi Santoso, M.T.' -> 'budi santoso'
+    'Budi  Santósó'                -> 'budi santoso'
+    """
+    if not name:
+        return ''
+
+    # Degrees usually follow the first comma in Indonesian names
+    name = name.split(',')[0]
+
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    text = re.sub(r'[^a-z\s]', ' ', text.lower())
+
+    tokens = text.split()
+    while tokens and tokens[0] in NAME_PREFIXES and len(tokens) > 1:
+        tokens.pop(0)
+
+    return ' '.join(tokens)
+
+def blocking_key(name_key: str) -> str:
+    """Coarse block for candidate lookup: last token + first initial"""
+    tokens = name_key.split()
+    if not tokens:
+        return ''
+    if len(tokens) == 1:
+        return f"{tokens[0]}|"
+    return f"{tokens[-1]}|{tokens[0][0]}"
+
+def _compatible(key_a: str, key_b: str) -> bool:
+    """Same person written differently? ('a budi santoso' ~ 'ahmad budi santoso')"""
+    if key_a == key_b:
+        return True
+
+    tokens_a, tokens_b = key_a.split(), key_b.split()
+    if len(tokens_a) == len(tokens_b) and all(
+        a == b or (len(a) == 1 and b.startswith(a)) or (len(b) == 1 and a.startswith(b))
+        for a, b in zip(tokens_a, tokens_b)
+    ):
+        return True
+
+    return SequenceMatcher(None, key_a, key_b).ratio() >= FUZZY_THRESHOLD
+
+# (display name, OpenAlex author id or None, affiliation or None)
+AuthorRef = Tuple[str, Optional[str], Optional[str]]
+
+class AuthorResolver:
+    """
+    Batch author resolution for ingestion
+
+    Authors are matched by OpenAlex author ID first. Authors without an ID
+    are matched by normalized name, then by fuzzy comparison inside their
+    blocking key. Each batch costs at most two indexed queries no matter
+    how large the authors table is, and everything resolved is remembered
+    in memory for the rest of the run.
+
+    New authors are added to the session but not flushed; the caller
+    commits them together with the publications.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.by_openalex_id: Dict[str, Author] = {}
+        self.by_name_key: Dict[str, List[Author]] = {}
+        self.by_block: Dict[str, List[Author]] = {}
+        self.loaded_ids: Set[str] = set()
+        self.loaded_blocks: Set[str] = set()
+        self.stats = {'matched_id': 0, 'matched_name': 0, 'matched_fuzzy': 0, 'created': 0}
+
+    def _remember(self, author: Author):
+        if author.openalex_id:
+            self.by_openalex_id[author.openalex_id] = author
+
+        group = self.by_name_key.setdefault(author.name_key, [])
+        if author not in group:
+            group.append(author)
+
+        block = self.by_block.setdefault(author.block_key, [])
+        if author not in block:
+            block.append(author)
+
+    def _prefetch(self, refs: List[AuthorRef]):
+        """Load every existing author this batch could match, in bulk"""
+        ids = {oid for _, oid, _ in refs if oid} - self.loaded_ids
+        blocks = {blocking_key(normalize_name(name)) for name, _, _ in refs} - self.loaded_blocks
+
+        # Name-key matches live in the same block, so two queries cover everything
+        if ids:
+            for author in self.db.query(Author).filter(Author.openalex_id.in_(ids)):
+                self._remember(author)
+            self.loaded_ids |= ids
+
+        if blocks:
+            for author in self.db.query(Author).filter(Author.block_key.in_(blocks)):
+                self._remember(author)
+            self.loaded_blocks |= blocks
+
+    @staticmethod
+    def _pick(candidates: List[Author], affiliation: Optional[str]) -> Optional[Author]:
+        """Single candidate, or the one sharing the affiliation; None if ambiguous"""
+        if len(candidates) == 1:
+            return candidates[0]
+        if affiliation:
+            same = [a for a in candidates if a.affiliation == affiliation]
+            if len(same) == 1:
+                return same[0]
+        return None
+
+    def _resolve_one(self, name: str, openalex_id: Optional[str], affiliation: Optional[str]) -> Author:
+        key = normalize_name(name)
+
+        if openalex_id:
+            author = self.by_openalex_id.get(openalex_id)
+            if author:
+                self.stats['matched_id'] += 1
+                return author
+
+            # Claim a legacy row (same name, no ID yet) instead of duplicating it
+            legacy = [a for a in self.by_name_key.get(key, []) if not a.openalex_id]
+            author = self._pick(legacy, affiliation)
+            if author:
+                author.openalex_id = openalex_id
+                self._remember(author)
+                self.stats['matched_name'] += 1
+                return author
+        else:
+            author = self._pick(self.by_name_key.get(key, []), affiliation)
+            if author:
+                self.stats['matched_name'] += 1
+                return author
+
+            candidates = [
+                a for a in self.by_block.get(blocking_key(key), [])
+                if _compatible(key, a.name_key or '')
+            ]
+            author = self._pick(candidates, affiliation)
+            if author:
+                self.stats['matched_fuzzy'] += 1
+                return author
+
+        author = Author(
+            name=name,
+            affiliation=affiliation,
+            openalex_id=openalex_id,
+            name_key=key,
+            block_key=blocking_key(key)
+        )
+        self.db.add(author)
+        self._remember(author)
+        self.stats['created'] += 1
+        return author
+
+    def resolve(self, refs: Iterable[AuthorRef]) -> List[Author]:
+        """Resolve a batch of author references to Author rows (same order)"""
+        refs = [
+            (name, oid or None, affiliation)
+            for name, oid, affiliation in refs
+        ]
+        self._prefetch(refs)
+        return [self._resolve_one(*ref) for ref in refs]
+
+def author_refs(pub_data: dict, max_authors: Optional[int] = 10) -> List[AuthorRef]:
+    """Author references of one parsed publication dict"""
+    names = pub_data.get('authors', [])
+    author_ids = pub_data.get('author_ids', [])
+    affiliations = pub_data.get('affiliations', [])
+
+    refs = []
+    for i, name in enumerate(names[:max_authors]):
+        if not name or name == 'Unknown':
+            continue
+        refs.append((
+            name,
+            author_ids[i] if i < len(author_ids) else None,
+            affiliations[i] if i < len(affiliations) else None
+        ))
+    return refs
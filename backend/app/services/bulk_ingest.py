@@ -0,0 +1,353 @@
+import io
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from .authors import AuthorResolver, normalize_name, blocking_key
+from .dedup import minhash_signature, lsh_keys
+
+# Rows per chunk: one COPY + one set-wise merge each
+CHUNK_SIZE = 50000
+
+# Multiple authors / affiliations / author IDs in one cell: "Budi Santoso; Siti Rahma"
+AUTHOR_SEPARATOR = ';'
+
+DEFAULT_SOURCE = 'GARUDA'
+
+# Explicit dtypes: no type inference pass, nullable year, no object columns
+CSV_DTYPES = {
+    'title': 'string',
+    'abstract': 'string',
+    'year': 'Int64',
+    'source': 'string',
+    'url': 'string',
+    'doi': 'string',
+    'authors': 'string',
+    'affiliations': 'string',
+    'author_ids': 'string',
+}
+
+_COPY_NULL = '\\N'
+
+_STAGING_DDL = [
+    """
+    CREATE TEMP TABLE IF NOT EXISTS staging_publications (
+        row_no BIGINT PRIMARY KEY,
+        title TEXT,
+        abstract TEXT,
+        year INTEGER,
+        source TEXT,
+        url TEXT,
+        doi TEXT,
+        publication_id INTEGER,
+        is_new BOOLEAN NOT NULL DEFAULT FALSE
+    ) ON COMMIT DELETE ROWS
+    """,
+]
+
+# Staged rows that already exist: same DOI, else same title + year
+_MATCH_EXISTING = [
+    """
+    UPDATE staging_publications s SET publication_id = p.id
+    FROM publications p
+    WHERE s.doi IS NOT NULL AND p.doi = s.doi
+    """,
+    """
+    UPDATE staging_publications s SET publication_id = p.id
+    FROM publications p
+    WHERE s.publication_id IS NULL
+      AND lower(p.title) = lower(s.title)
+      AND p.year IS NOT DISTINCT FROM s.year
+    """,
+]
+
+# Dedup keys; plain equalities so the joins can hash
+_DOI_KEY = "{t}doi"
+_TITLE_KEY = "lower({t}title) || '|' || coalesce({t}year::text, '')"
+
+def _insert_new(key: str, condition: str) -> str:
+    """One insert per dedup key; every staged row with that key points at it"""
+    return f"""
+    WITH fresh AS (
+        SELECT DISTINCT ON ({key.format(t='')})
+               title, abstract, year, source, url, doi
+        FROM staging_publications
+        WHERE publication_id IS NULL AND {condition.format(t='')}
+        ORDER BY {key.format(t='')}, row_no
+    ), inserted AS (
+        INSERT INTO publications (title, abstract, year, source, url, doi)
+        SELECT title, abstract, year, source, url, doi FROM fresh
+        ON CONFLICT DO NOTHING
+        RETURNING id, {key.format(t='')} AS dedup_key
+    )
+    UPDATE staging_publications s SET publication_id = i.id, is_new = TRUE
+    FROM inserted i
+    WHERE s.publication_id IS NULL AND {condition.format(t='s.')} AND {key.format(t='s.')} = i.dedup_key
+    """
+
+# Rows with a DOI first, so a row without one can then match them by
+# title + year like it matches existing publications
+_INSERT_WITH_DOI = _insert_new(_DOI_KEY, "{t}doi IS NOT NULL")
+_MATCH_NEW_BY_TITLE = """
+    UPDATE staging_publications s SET publication_id = n.publication_id, is_new = TRUE
+    FROM staging_publications n
+    WHERE s.publication_id IS NULL AND s.doi IS NULL
+      AND n.is_new AND n.doi IS NOT NULL
+      AND lower(n.title) = lower(s.title)
+      AND n.year IS NOT DISTINCT FROM s.year
+"""
+_INSERT_WITHOUT_DOI = _insert_new(_TITLE_KEY, "{t}doi IS NULL")
+
+_NEW_ROWS = """
+    SELECT row_no, publication_id FROM staging_publications WHERE is_new
+"""
+
+_NEW_PUBLICATIONS = """
+    SELECT DISTINCT ON (publication_id) publication_id, row_no
+    FROM staging_publications
+    WHERE is_new
+    ORDER BY publication_id, row_no
+"""
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a CSV or Parquet dump chunk by chunk (only the known columns)"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        columns = [c for c in parquet.schema_arrow.names if c in CSV_DTYPES]
+        for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+            frame = batch.to_pandas()
+            yield frame.astype({c: CSV_DTYPES[c] for c in frame.columns})
+        return
+
+    yield from pd.read_csv(
+        path,
+        dtype=CSV_DTYPES,
+        usecols=lambda c: c in CSV_DTYPES,
+        chunksize=chunk_size,
+        keep_default_na=False,
+        na_values=[''],
+    )
+
+def _normalize_dois(dois: pd.Series) -> pd.Series:
+    """Vectorized ingest.normalize_doi"""
+    dois = dois.str.strip().str.lower().str.replace(
+        r'^(https?://(dx\.)?doi\.org/|doi:)', '', regex=True
+    )
+    return dois.mask(dois == '')
+
+def _split_column(rows: pd.DataFrame, column: str) -> pd.DataFrame:
+    """'a; b' cells -> one (row_no, position, value) row per item"""
+    items = rows[['row_no', column]].assign(
+        **{column: rows[column].str.split(AUTHOR_SEPARATOR)}
+    ).explode(column)
+    items['position'] = items.groupby('row_no').cumcount()
+    items[column] = items[column].str.strip()
+    return items
+
+def prepare_chunk(chunk: pd.DataFrame, first_row: int):
+    """
+    Staging frames for one chunk
+
+    Returns:
+        (publications, authors) DataFrames in staging table column order
+    """
+    chunk = chunk.reindex(columns=list(CSV_DTYPES)).astype(CSV_DTYPES)
+    chunk['title'] = chunk['title'].str.strip()
+    chunk = chunk[chunk['title'].fillna('') != '']
+
+    pubs = pd.DataFrame({
+        'row_no': np.arange(first_row, first_row + len(chunk), dtype=np.int64),
+        'title': chunk['title'].to_numpy(),
+        'abstract': chunk['abstract'].fillna('').to_numpy(),
+        'year': chunk['year'].to_numpy(),
+        'source': chunk['source'].fillna(DEFAULT_SOURCE).to_numpy(),
+        'url': chunk['url'].fillna('').to_numpy(),
+        'doi': _normalize_dois(chunk['doi']).to_numpy(),
+    })
+
+    rows = pd.DataFrame({
+        'row_no': pubs['row_no'],
+        'authors': chunk['authors'].to_numpy(),
+        'affiliations': chunk['affiliations'].to_numpy(),
+        'author_ids': chunk['author_ids'].to_numpy(),
+    })
+    authors = _split_column(rows[rows['authors'].notna()], 'authors')
+    for column in ('affiliations', 'author_ids'):
+        authors = authors.merge(
+            _split_column(rows[rows[column].notna()], column), on=['row_no', 'position'], how='left'
+        )
+    authors = authors[~authors['authors'].fillna('').isin(['', 'Unknown'])]
+
+    # Normalize each distinct name once
+    keys = {name: normalize_name(name) for name in authors['authors'].unique()}
+    authors = authors.assign(
+        name_key=authors['authors'].map(keys),
+        affiliations=authors['affiliations'].mask(authors['affiliations'] == ''),
+        author_ids=authors['author_ids'].mask(authors['author_ids'] == '')
+    )
+    authors = authors[authors['name_key'] != '']
+    authors = authors.assign(
+        block_key=authors['name_key'].map({k: blocking_key(k) for k in authors['name_key'].unique()})
+    )
+
+    authors = authors.rename(columns={'authors': 'name', 'affiliations': 'affiliation', 'author_ids': 'openalex_id'})[
+        ['row_no', 'position', 'name', 'affiliation', 'openalex_id', 'name_key', 'block_key']
+    ]
+    return pubs, authors
+
+def _copy(conn: Connection, table: str, frame: pd.DataFrame):
+    """COPY a DataFrame into a staging table"""
+    buffer = io.StringIO()
+    frame.to_csv(buffer, index=False, header=False, na_rep=_COPY_NULL)
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(frame.columns)}) FROM STDIN "
+            f"WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+def _copy_signatures(conn: Connection, pubs: pd.DataFrame, new_rows):
+    """MinHash signatures + LSH buckets of the new publications, via COPY"""
+    docs = pubs.set_index('row_no')
+    pub_ids, hex_signatures, buckets = [], [], []
+    for pub_id, row_no in new_rows:
+        signature = minhash_signature(docs.at[row_no, 'title'], docs.at[row_no, 'abstract'])
+        pub_ids.append(pub_id)
+        hex_signatures.append('\\x' + signature.tobytes().hex())
+        buckets.extend((bucket, pub_id) for bucket in set(lsh_keys(signature)))
+
+    _copy(conn, 'publication_signatures', pd.DataFrame({
+        'publication_id': pub_ids, 'signature': hex_signatures
+    }))
+    _copy(conn, 'publication_lsh_buckets', pd.DataFrame(buckets, columns=['bucket', 'publication_id']))
+
+def _link_authors(conn: Connection, resolver: AuthorResolver, authors: pd.DataFrame, new: pd.DataFrame) -> Tuple[int, int]:
+    """
+    Resolve the authors of the new publications and link them
+
+    Same rules as API ingestion (AuthorResolver): OpenAlex author ID first,
+    then normalized name, then a compatible name in the same block, with
+    the affiliation breaking ties; new authors are created.
+
+    Returns:
+        (authors created, links inserted)
+    """
+    refs = authors.merge(new, on='row_no').sort_values(['row_no', 'position'])
+    if refs.empty:
+        return 0, 0
+
+    optional = refs[['affiliation', 'openalex_id']].astype(object)
+    optional = optional.where(optional.notna(), None)
+    created = resolver.stats['created']
+    resolved = resolver.resolve(zip(refs['name'], optional['openalex_id'], optional['affiliation']))
+    resolver.db.flush()
+
+    # The publications are new, so they have no links yet
+    links = pd.DataFrame({
+        'publication_id': refs['publication_id'].to_numpy(),
+        'author_id': [author.id for author in resolved],
+    }).drop_duplicates()
+    _copy(conn, 'publication_authors', links)
+    return resolver.stats['created'] - created, len(links)
+
+def _merge_chunk(
+    conn: Connection,
+    resolver: AuthorResolver,
+    pubs: pd.DataFrame,
+    authors: pd.DataFrame,
+    signatures: bool
+) -> Dict[str, int]:
+    _copy(conn, 'staging_publications', pubs)
+    conn.execute(text("ANALYZE staging_publications"))
+
+    for stmt in _MATCH_EXISTING + [_INSERT_WITH_DOI, _MATCH_NEW_BY_TITLE, _INSERT_WITHOUT_DOI]:
+        conn.execute(text(stmt))
+
+    new = pd.DataFrame(conn.execute(text(_NEW_ROWS)).all(), columns=['row_no', 'publication_id'])
+    authors_created, links = _link_authors(conn, resolver, authors, new)
+
+    new_rows = conn.execute(text(_NEW_PUBLICATIONS)).all()
+    if signatures and new_rows:
+        _copy_signatures(conn, pubs, new_rows)
+
+    return {
+        'inserted': len(new_rows),
+        'duplicates': len(pubs) - len(new_rows),
+        'authors_created': authors_created,
+        'links': links,
+    }
+
+def ingest_file(
+    engine: Engine,
+    path: str,
+    chunk_size: int = CHUNK_SIZE,
+    signatures: bool = True
+) -> Dict:
+    """
+    Stream a CSV/Parquet publication dump into the database
+
+    Each chunk is COPY'd into session-local staging tables and merged
+    set-wise: rows matching an existing publication (DOI, else title +
+    year) or an earlier row of the chunk (same DOI, or same title + year
+    as a row without DOI) are skipped, and new publications are inserted
+    in two statements. Their authors are resolved like in API ingestion
+    (OpenAlex ID, then name / block + affiliation; new ones created) and
+    linked. One commit per chunk, so memory is bounded by chunk_size and an
+    interrupted run keeps finished chunks.
+
+    Expected columns: title (required), abstract, year, source, url, doi,
+    authors, affiliations and author_ids (OpenAlex author IDs; the last
+    three AUTHOR_SEPARATOR-separated and aligned).
+
+    Args:
+        signatures: Also store MinHash signatures for near-duplicate checks
+
+    Returns:
+        Totals ('skipped' = rows without a title) plus 'seconds' and
+        'rows_per_second'
+    """
+    stats = {'rows': 0, 'skipped': 0, 'inserted': 0, 'duplicates': 0, 'authors_created': 0, 'links': 0}
+    started = time.perf_counter()
+
+    with engine.connect() as conn:
+        if conn.dialect.name != 'postgresql':
+            raise RuntimeError("Bulk ingestion loads through COPY and requires PostgreSQL")
+
+        for ddl in _STAGING_DDL:
+            conn.execute(text(ddl))
+        conn.commit()
+
+        # Works inside the connection's transaction and never commits it;
+        # resolved authors stay cached (unexpired) across chunks
+        session = Session(bind=conn, autoflush=False, expire_on_commit=False)
+        resolver = AuthorResolver(session)
+
+        for number, chunk in enumerate(iter_chunks(path, chunk_size), 1):
+            chunk_started = time.perf_counter()
+            pubs, authors = prepare_chunk(chunk, stats['rows'])
+            result = _merge_chunk(conn, resolver, pubs, authors, signatures)
+            session.commit()
+            conn.commit()
+
+            stats['rows'] += len(chunk)
+            stats['skipped'] += len(chunk) - len(pubs)
+            for key, value in result.items():
+                stats[key] += value
+
+            elapsed = time.perf_counter() - chunk_started
+            print(f"  chunk {number}: {len(chunk)} rows, {result['inserted']} new, "
+                  f"{result['duplicates']} duplicates ({len(chunk) / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    stats['seconds'] = round(time.perf_counter() - started, 2)
+    stats['rows_per_second'] = round(stats['rows'] / max(stats['seconds'], 1e-9), 1)
+    return stats
@@ -0,0 +1,73 @@
+import os
+import json
+import shutil
+import hashlib
+from typing import Dict, List, Optional
+
+class ShardCheckpoint:
+    """
+    Resumable state of one harvest shard
+
+    Files per shard (inside <checkpoint_dir>/<query hash>/):
+        <shard>.ndjson  publications harvested so far, one per line
+        <shard>.json    {"cursor": ..., "done": ..., "count": ...}
+
+    The publications are appended before the state file is atomically
+    replaced, so after a crash the cursor never points past data that was
+    not written. A page may be re-fetched after a crash; the merge stage
+    dedups it.
+    """
+
+    def __init__(self, directory: str, shard_name: str):
+        self.directory = directory
+        self.data_path = os.path.join(directory, f"{shard_name}.ndjson")
+        self.state_path = os.path.join(directory, f"{shard_name}.json")
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self) -> Dict:
+        """Return {'cursor', 'done', 'publications'} (fresh state if none saved)"""
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {'cursor': '*', 'done': False, 'publications': []}
+
+        publications = []
+        if os.path.exists(self.data_path):
+            with open(self.data_path, encoding='utf-8') as f:
+                for line in f:
+                    if len(publications) == state['count']:
+                        break
+                    publications.append(json.loads(line))
+
+        # Drop a page appended after the last saved state (crash mid-page)
+        # so the next append lines up with the cursor again
+        with open(self.data_path, 'w', encoding='utf-8') as f:
+            for pub in publications:
+                f.write(json.dumps(pub, ensure_ascii=False) + '\n')
+
+        return {
+            'cursor': state['cursor'],
+            'done': state['done'],
+            'publications': publications
+        }
+
+    def save_page(self, publications: List[Dict], cursor: Optional[str], total: int):
+        """Persist one harvested page and the cursor of the next one"""
+        with open(self.data_path, 'a', encoding='utf-8') as f:
+            for pub in publications:
+                f.write(json.dumps(pub, ensure_ascii=False) + '\n')
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'cursor': cursor, 'done': not cursor, 'count': total}, f)
+        os.replace(tmp_path, self.state_path)
+
+def checkpoint_directory(base_dir: str, filter_str: str) -> str:
+    """Per-query checkpoint directory (query identified by its filter string)"""
+    digest = hashlib.sha1(filter_str.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(base_dir, digest)
+
+def clear_checkpoints(directory: str):
+    """Remove a query's checkpoints after a complete harvest"""
+    shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session, Query
+from app.models import Publication, PublicationTopic, PublicationCount
+
+# Sentinel for "no filter" in the publication_counts summary table
+ALL = 0
+
+# Seconds a cached count stays valid
+CACHE_TTL = 60
+
+# Planner estimates below this are replaced by an exact count (cheap anyway)
+EXACT_COUNT_THRESHOLD = 1000
+
+# Filter signatures kept; search strings come from clients, so the cache
+# is an LRU bounded by this many entries
+CACHE_MAX_ENTRIES = 1024
+
+# {filter signature: (expires_at, total, approximate)}, least recently used first
+_count_cache: 'OrderedDict[tuple, Tuple[float, int, bool]]' = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _signature(year: Optional[int], topic_id: Optional[int], search: Optional[str]) -> tuple:
+    return (year or ALL, topic_id or ALL, (search or '').strip().lower())
+
+def clear_count_cache():
+    """Drop all cached counts (call after data changes)"""
+    with _cache_lock:
+        _count_cache.clear()
+
+def _cached_count(key: tuple) -> Optional[Tuple[int, bool]]:
+    """Unexpired (total, approximate) for `key`; expired entries are dropped here"""
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _count_cache.get(key)
+        if cached is None:
+            return None
+        if cached[0] <= now:
+            del _count_cache[key]
+            return None
+        _count_cache.move_to_end(key)
+        return cached[1], cached[2]
+
+def _cache_count(key: tuple, total: int, approximate: bool):
+    now = time.monotonic()
+    with _cache_lock:
+        _count_cache[key] = (now + CACHE_TTL, total, approximate)
+        _count_cache.move_to_end(key)
+        # Expired entries at the old end go first, then the least recently used
+        while _count_cache:
+            oldest_key, oldest = next(iter(_count_cache.items()))
+            if oldest[0] > now and len(_count_cache) <= CACHE_MAX_ENTRIES:
+                break
+            del _count_cache[oldest_key]
+
+def refresh_count_summary(db: Session):
+    """
+    Rebuild the per-(year, topic) publication count summary
+
+    Run after ingestion and topic modeling so that unfiltered, year-only,
+    topic-only and year+topic views never need a COUNT over publications.
+    """
+    rows = []
+
+    total = db.query(func.count(Publication.id)).scalar() or 0
+    rows.append((ALL, ALL, total))
+
+    by_year = db.query(
+        Publication.year, func.count(Publication.id)
+    ).filter(Publication.year != None).group_by(Publication.year).all()
+    rows.extend((year, ALL, count) for year, count in by_year)
+
+    by_topic = db.query(
+        PublicationTopic.topic_id, func.count(PublicationTopic.id)
+    ).group_by(PublicationTopic.topic_id).all()
+    rows.extend((ALL, topic_id, count) for topic_id, count in by_topic if topic_id)
+
+    by_year_topic = db.query(
+        Publication.year, PublicationTopic.topic_id, func.count(PublicationTopic.id)
+    ).join(
+        PublicationTopic, Publication.id == PublicationTopic.publication_id
+    ).filter(Publication.year != None).group_by(
+        Publication.year, PublicationTopic.topic_id
+    ).all()
+    rows.extend((year, topic_id, count) for year, topic_id, count in by_year_topic if topic_id)
+
+    db.query(PublicationCount).delete()
+    db.bulk_insert_mappings(PublicationCount, [
+        {'year': year, 'topic_id': topic_id, 'publication_count': count}
+        for year, topic_id, count in rows
+    ])
+    db.commit()
+    clear_count_cache()
+
+    print(f"✓ Refreshed publication count summary ({len(rows)} rows)")
+
+def _summary_count(db: Session, year: Optional[int], topic_id: Optional[int]) -> Optional[int]:
+    """Exact count from the summary table, or None if the summary is empty"""
+    row = db.query(PublicationCount.publication_count).filter(
+        PublicationCount.year == (year or ALL),
+        PublicationCount.topic_id == (topic_id or ALL)
+    ).first()
+
+    if row is not None:
+        return row[0]
+
+    # A missing combination means zero, unless the summary was never built
+    has_summary = db.query(PublicationCount.year).filter(
+        PublicationCount.year == ALL,
+        PublicationCount.topic_id == ALL
+    ).first()
+    return 0 if has_summary else None
+
+def _planner_estimate(db: Session, query: Query) -> Optional[int]:
+    """Row estimate from the PostgreSQL planner (None on other databases)"""
+    bind = db.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+
+    compiled = query.statement.compile(dialect=bind.dialect)
+    result = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+
+    plan = json.loads(result) if isinstance(result, str) else result
+    return int(plan[0]['Plan']['Plan Rows'])
+
+def count_publications(
+    db: Session,
+    query: Query,
+    year: Optional[int] = None,
+    topic_id: Optional[int] = None,
+    search: Optional[str] = None
+) -> Tuple[int, bool]:
+    """
+    Count publications matching the filters of `query`
+
+    Strategy:
+        - year/topic filters only: exact count from publication_counts
+        - search filter: PostgreSQL planner estimate (approximate), falling
+          back to an exact COUNT when the estimate is small
+        - results are cached per filter signature for CACHE_TTL seconds, in
+          an LRU of at most CACHE_MAX_ENTRIES signatures
+
+    Returns:
+        (total, approximate)
+    """
+    key = _signature(year, topic_id, search)
+    cached = _cached_count(key)
+    if cached is not None:
+        return cached
+
+    total = None
+    approximate = False
+
+    if not key[2]:
+        total = _summary_count(db, year, topic_id)
+    else:
+        estimate = _planner_estimate(db, query)
+        if estimate is not None and estimate >= EXACT_COUNT_THRESHOLD:
+            total = estimate
+            approximate = True
+
+    if total is None:
+        total = query.count()
+
+    _cache_count(key, total, approximate)
+    return total, approximate
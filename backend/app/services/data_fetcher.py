@@ -4,7 +4,11 @@ from app.database import SessionLocal
 from app.models import Publication, Author, Topic, PublicationTopic
 from .openalex_fetcher import OpenAlexFetcher
 from .preprocessor import preprocess_text
-from .topic_modeling import train_topic_model
+from .topic_modeling import train_topic_model, assign_topics
+from .counts import refresh_count_summary
+from .analytics import refresh_analytics_snapshot
+from .similarity import build_similarity_index
+from .ingest import upsert_publications
 import json
 
 class DataFetcher:
@@ -30,61 +34,22 @@ class DataFetcher:
         db = SessionLocal()
         
         try:
-            saved_count = 0
+            stats = upsert_publications(db, publications)
+            saved_count = stats['inserted'] + stats['updated']
             
-            for pub_data in publications:
-                # Check duplicate by title
-                exists = db.query(Publication).filter(
-                    Publication.title == pub_data['title']
-                ).first()
-                
-                if exists:
-                    print(f"  Skipping duplicate: {pub_data['title'][:50]}...")
-                    continue
-                
-                # Create publication
-                pub = Publication(
-                    title=pub_data['title'],
-                    abstract=pub_data.get('abstract', ''),
-                    year=pub_data.get('year'),
-                    source=pub_data.get('source', 'OpenAlex'),
-                    url=pub_data.get('url', '')
-                )
-                
-                # Add authors with affiliations
-                author_names = pub_data.get('authors', [])
-                affiliations = pub_data.get('affiliations', [])
-                
-                for i, author_name in enumerate(author_names):
-                    if not author_name or author_name == 'Unknown':
-                        continue
-                    
-                    # Find or create author
-                    author = db.query(Author).filter(
-                        Author.name == author_name
-                    ).first()
-                    
-                    if not author:
-                        affiliation = affiliations[i] if i < len(affiliations) else None
-                        author = Author(
-                            name=author_name,
-                            affiliation=affiliation
-                        )
-                        db.add(author)
-                    
-                    pub.authors.append(author)
-                
-                db.add(pub)
-                saved_count += 1
-            
-            db.commit()
-            print(f"✓ Saved {saved_count} new publications to database")
+            print(f"✓ Saved {stats['inserted']} new and {stats['updated']} updated publications "
+                  f"({stats['unchanged']} unchanged, {stats['skipped']} skipped)")
             
             # Run topic modeling if requested
             if run_topic_modeling and saved_count > 0:
                 print("\nRunning topic modeling...")
                 self._run_topic_modeling(db)
             
+            if saved_count > 0:
+                refresh_count_summary(db)
+                # Updated works changed rows the snapshot already holds
+                refresh_analytics_snapshot(db, full=stats['updated'] > 0)
+            
         except Exception as e:
             print(f"✗ Error saving to database: {e}")
             db.rollback()
@@ -119,29 +84,29 @@ class DataFetcher:
         model, doc_topics, topics_keywords = train_topic_model(documents, n_topics)
         
         # Save topics
+        topic_ids = []
         for topic_data in topics_keywords:
-            topic_name = f"Topic {topic_data['topic_id'] + 1}"
-            keywords = ', '.join(topic_data['keywords'][:5])
-            
             topic = Topic(
-                name=topic_name,
+                name=f"Topic {topic_data['topic_id'] + 1}",
                 keywords=json.dumps(topic_data['keywords'])
             )
             db.add(topic)
             db.flush()
-            
-            # Assign publications to topics
-            for pub_idx, topic_weight in enumerate(doc_topics[:, topic_data['topic_id']]):
-                if topic_weight > 0.1:  # Threshold
-                    pub_topic = PublicationTopic(
-                        publication_id=pub_ids[pub_idx],
-                        topic_id=topic.id,
-                        probability=f"{topic_weight:.3f}"
-                    )
-                    db.add(pub_topic)
+            topic_ids.append(topic.id)
+        
+        # Assign publications to topics
+        db.bulk_insert_mappings(
+            PublicationTopic, assign_topics(doc_topics, pub_ids, topic_ids, threshold=0.1)
+        )
         
         db.commit()
         print(f"✓ Created {n_topics} topics")
+        
+        # Rebuild related-publications index from the new doc-topic matrix
+        build_similarity_index(pub_ids, doc_topics)
+        
+        # New topics and assignments for the trend / stats aggregates
+        refresh_analytics_snapshot(db, topics=True)
     
     def get_statistics(self) -> Dict:
         """Get statistics dari fetched data"""
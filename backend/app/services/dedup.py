@@ -0,0 +1,110 @@
+import re
+import zlib
+import hashlib
+import unicodedata
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Set
+
+# MinHash / LSH parameters: 16 bands x 8 rows puts the LSH candidate
+# threshold near Jaccard 0.7; candidates are then verified at 0.8
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+DUPLICATE_THRESHOLD = 0.8
+
+# Abstract words used per document (preprints and re-uploads differ in the tail)
+MAX_ABSTRACT_WORDS = 200
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+_PERM_B = _rng.randint(0, np.iinfo(np.int64).max, size=NUM_PERM, dtype=np.int64).astype(np.uint64)
+
+def normalize_text(text: str) -> List[str]:
+    """Lower-case ASCII word tokens (accents and punctuation removed)"""
+    if not text:
+        return []
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).split()
+
+def document_tokens(title: str, abstract: Optional[str] = None) -> List[str]:
+    tokens = normalize_text(title)
+    if abstract and abstract != 'No abstract available':
+        tokens += normalize_text(abstract)[:MAX_ABSTRACT_WORDS]
+    return tokens
+
+def shingle_hashes(tokens: List[str], k: int = SHINGLE_SIZE) -> np.ndarray:
+    """crc32 of every k-word shingle (unique, uint64)"""
+    if len(tokens) < k:
+        shingles = {' '.join(tokens)}
+    else:
+        shingles = {' '.join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+    return np.fromiter(
+        (zlib.crc32(s.encode('utf-8')) for s in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+
+def minhash_signature(title: str, abstract: Optional[str] = None) -> np.ndarray:
+    """NUM_PERM-value uint32 MinHash signature of title + abstract"""
+    hashes = shingle_hashes(document_tokens(title, abstract))
+    # Universal hashing (a*x + b) mod p for all permutations at once
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+def estimate_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(sig_a == sig_b)) / len(sig_a)
+
+def lsh_keys(signature: np.ndarray) -> List[int]:
+    """One signed 63-bit bucket key per band (band index is part of the key)"""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS].tobytes()
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big') >> 1)
+    return keys
+
+class NearDuplicateIndex:
+    """
+    In-memory MinHash LSH index
+
+    Candidate lookup only touches the documents sharing a band bucket, so
+    checking n documents costs O(n) instead of comparing every pair.
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.signatures: Dict[Hashable, np.ndarray] = {}
+        self.buckets: Dict[int, List[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def add(self, key: Hashable, signature: np.ndarray):
+        self.signatures[key] = signature
+        for bucket in lsh_keys(signature):
+            self.buckets.setdefault(bucket, []).append(key)
+
+    def query(self, signature: np.ndarray) -> Optional[Hashable]:
+        """Key of the most similar indexed document above threshold, or None"""
+        candidates: Set[Hashable] = set()
+        for bucket in lsh_keys(signature):
+            candidates.update(self.buckets.get(bucket, ()))
+
+        best, best_score = None, self.threshold
+        for key in candidates:
+            score = estimate_similarity(signature, self.signatures[key])
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def check_and_add(self, key: Hashable, title: str, abstract: Optional[str] = None) -> Optional[Hashable]:
+        """Return the key this document duplicates, or index it and return None"""
+        signature = minhash_signature(title, abstract)
+        duplicate = self.query(signature)
+        if duplicate is None:
+            self.add(key, signature)
+        return duplicate
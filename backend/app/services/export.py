@@ -0,0 +1,146 @@
+import csv
+import io
+import json
+from typing import Iterator, List, Optional, Sequence
+from sqlalchemy import select, func
+from sqlalchemy.sql import Select
+from app.models import Publication, Author, publication_authors
+
+EXPORT_COLUMNS = ['id', 'title', 'abstract', 'year', 'source', 'url', 'authors']
+
+# Rows fetched per server-side cursor round trip
+BATCH_SIZE = 2000
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+def _authors_aggregate(dialect_name: str):
+    """Correlated subquery returning '; '-joined author names per publication"""
+    if dialect_name == 'postgresql':
+        names = func.string_agg(Author.name, '; ')
+    else:
+        names = func.group_concat(Author.name, '; ')
+
+    return select(names).select_from(
+        publication_authors.join(Author, Author.id == publication_authors.c.author_id)
+    ).where(
+        publication_authors.c.publication_id == Publication.id
+    ).scalar_subquery()
+
+def build_export_query(dialect_name: str) -> Select:
+    """Base select for exports; filters are applied by the caller"""
+    return select(
+        Publication.id,
+        Publication.title,
+        Publication.abstract,
+        Publication.year,
+        Publication.source,
+        Publication.url,
+        _authors_aggregate(dialect_name).label('authors')
+    )
+
+def iter_batches(db, stmt: Select, batch_size: int = BATCH_SIZE) -> Iterator[Sequence]:
+    """
+    Stream result rows in batches through a server-side cursor
+
+    yield_per() turns on stream_results, so psycopg2 uses a named cursor and
+    only `batch_size` rows are held in memory at a time.
+    """
+    result = db.execute(stmt.order_by(Publication.id).execution_options(yield_per=batch_size))
+    for batch in result.partitions():
+        yield batch
+
+def _csv_chunks(batches: Iterator[Sequence]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_COLUMNS)
+    for batch in batches:
+        writer.writerows(batch)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def _ndjson_chunks(batches: Iterator[Sequence]) -> Iterator[bytes]:
+    for batch in batches:
+        lines = [
+            json.dumps(dict(zip(EXPORT_COLUMNS, row)), ensure_ascii=False)
+            for row in batch
+        ]
+        yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+class _ChunkSink:
+    """Minimal writable file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+        self.position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def _parquet_chunks(batches: Iterator[Sequence]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ('id', pa.int64()),
+        ('title', pa.string()),
+        ('abstract', pa.string()),
+        ('year', pa.int32()),
+        ('source', pa.string()),
+        ('url', pa.string()),
+        ('authors', pa.string()),
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+
+    # One row group per batch
+    for batch in batches:
+        columns = list(zip(*batch))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+            schema=schema
+        ))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+def stream_export(db, stmt: Select, fmt: str, batch_size: Optional[int] = None) -> Iterator[bytes]:
+    """Encode the rows of `stmt` as a stream of CSV / NDJSON / Parquet bytes"""
+    batches = iter_batches(db, stmt, batch_size or BATCH_SIZE)
+
+    if fmt == 'csv':
+        return _csv_chunks(batches)
+    if fmt == 'ndjson':
+        return _ndjson_chunks(batches)
+    if fmt == 'parquet':
+        return _parquet_chunks(batches)
+
+    raise ValueError(f"Unsupported export format: {fmt}")
@@ -0,0 +1,90 @@
+from typing import Dict, List
+from sqlalchemy import select, func, literal, null, union_all, Integer, String
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from app.models import Author, Topic, PublicationTopic, publication_authors
+
+def _facet_rows(db: Session, matches) -> List:
+    """
+    Every facet in one round trip (UNION ALL), each counted from its own
+    distinct (publication, value) pairs
+
+    Joining topics and authors into one source would multiply the rows of
+    every publication by topics x authors before counting; here each facet
+    only ever joins the matches with its own table.
+    """
+    none_int = null().cast(Integer)
+    none_str = null().cast(String)
+
+    year_counts = select(
+        literal('year').label('facet'), matches.c.year.label('year'),
+        none_int.label('topic_id'), none_str.label('topic_name'), none_str.label('affiliation'),
+        func.count().label('count')
+    ).group_by(matches.c.year)
+
+    total = select(
+        literal('total'), none_int, none_int, none_str, none_str, func.count()
+    ).select_from(matches)
+
+    topic_pairs = select(
+        PublicationTopic.publication_id, PublicationTopic.topic_id
+    ).join(
+        matches, matches.c.id == PublicationTopic.publication_id
+    ).distinct().subquery('topic_pairs')
+    topic_counts = select(
+        topic_pairs.c.topic_id, func.count().label('n')
+    ).group_by(topic_pairs.c.topic_id).subquery('topic_counts')
+    topics = select(
+        literal('topic'), none_int, topic_counts.c.topic_id, Topic.name, none_str, topic_counts.c.n
+    ).join(Topic, Topic.id == topic_counts.c.topic_id)
+
+    affiliation_pairs = select(
+        publication_authors.c.publication_id, Author.affiliation
+    ).join(
+        matches, matches.c.id == publication_authors.c.publication_id
+    ).join(
+        Author, Author.id == publication_authors.c.author_id
+    ).where(Author.affiliation != None).distinct().subquery('affiliation_pairs')
+    institutions = select(
+        literal('institution'), none_int, none_int, none_str, affiliation_pairs.c.affiliation, func.count()
+    ).group_by(affiliation_pairs.c.affiliation)
+
+    return [tuple(r) for r in db.execute(union_all(year_counts, total, topics, institutions))]
+
+def compute_facets(db: Session, filtered: Select, limit: int = 20) -> Dict:
+    """
+    Year, topic and institution counts for the publications in `filtered`
+
+    Args:
+        filtered: select() of Publication.id and Publication.year with the
+            active filters applied
+        limit: Max values returned per facet (highest counts first)
+    """
+    # Evaluated once (a CTE referenced several times is materialized by PostgreSQL)
+    matches = filtered.distinct().cte('matches')
+    rows = _facet_rows(db, matches)
+
+    total = 0
+    years, topics, institutions = [], [], []
+
+    for facet, year, topic_id, topic_name, affiliation, count in rows:
+        if facet == 'total':
+            total = count
+        elif facet == 'year' and year is not None:
+            years.append({'value': year, 'count': count})
+        elif facet == 'topic' and topic_id is not None:
+            topics.append({'id': topic_id, 'name': topic_name, 'count': count})
+        elif facet == 'institution' and affiliation:
+            institutions.append({'value': affiliation, 'count': count})
+
+    def top(values):
+        return sorted(values, key=lambda v: v['count'], reverse=True)[:limit]
+
+    return {
+        'total': total,
+        'facets': {
+            'year': sorted(years, key=lambda v: v['value'], reverse=True),
+            'topic': top(topics),
+            'institution': top(institutions),
+        }
+    }
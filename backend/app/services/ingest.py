@@ -0,0 +1,283 @@
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.models import Publication, PublicationSignature, PublicationLSHBucket, publication_authors
+from .authors import AuthorResolver, author_refs
+from .dedup import DUPLICATE_THRESHOLD, NearDuplicateIndex, minhash_signature, estimate_similarity, lsh_keys
+
+# Publications per INSERT ... ON CONFLICT statement
+UPSERT_BATCH_SIZE = 500
+
+# Columns refreshed when a harvested work changes
+UPSERT_COLUMNS = ['title', 'abstract', 'year', 'source', 'url', 'doi']
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """'https://doi.org/10.1234/ABC' -> '10.1234/abc'"""
+    if not doi:
+        return None
+    doi = doi.strip().lower()
+    for prefix in ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/', 'doi:'):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi or None
+
+def _insert(db: Session):
+    """Dialect-specific INSERT supporting ON CONFLICT (PostgreSQL / SQLite)"""
+    if db.get_bind().dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+def _publication_row(pub_data: dict) -> Dict:
+    return {
+        'openalex_id': pub_data['openalex_id'],
+        'doi': normalize_doi(pub_data.get('doi')),
+        'title': pub_data['title'],
+        'abstract': pub_data.get('abstract', ''),
+        'year': pub_data.get('year'),
+        'source': pub_data.get('source', 'OpenAlex'),
+        'url': pub_data.get('url', ''),
+    }
+
+def _resolve_doi_owners(db: Session, rows: List[Dict]) -> List[Dict]:
+    """
+    Reconcile incoming works with rows that already hold their DOI
+
+    A row with the DOI but no openalex_id (e.g. from CSV ingestion) is
+    claimed by the incoming work, so the upsert updates it instead of
+    failing on the DOI unique index. Works whose DOI already belongs to a
+    different OpenAlex work are dropped.
+    """
+    dois = {r['doi'] for r in rows if r['doi']}
+    if not dois:
+        return rows
+
+    owners = {
+        e.doi: e for e in db.query(
+            Publication.id, Publication.openalex_id, Publication.doi
+        ).filter(Publication.doi.in_(dois))
+    }
+
+    kept = []
+    claims = []
+    for row in rows:
+        owner = owners.get(row['doi'])
+        if owner is not None:
+            if owner.openalex_id and owner.openalex_id != row['openalex_id']:
+                continue
+            if not owner.openalex_id:
+                claims.append({'id': owner.id, 'openalex_id': row['openalex_id']})
+        kept.append(row)
+
+    if claims:
+        db.bulk_update_mappings(Publication, claims)
+        db.flush()
+
+    return kept
+
+def find_corpus_duplicates(
+    db: Session,
+    signatures: Dict[Hashable, np.ndarray],
+    threshold: float = DUPLICATE_THRESHOLD
+) -> Dict[Hashable, int]:
+    """
+    Match a batch of signatures against the stored corpus
+
+    Two indexed queries per batch: bucket lookup for candidates, then
+    their signatures for verification.
+
+    Returns:
+        {batch key: id of the existing publication it duplicates}
+    """
+    keys_by_bucket: Dict[int, List[Hashable]] = {}
+    for key, signature in signatures.items():
+        for bucket in lsh_keys(signature):
+            keys_by_bucket.setdefault(bucket, []).append(key)
+
+    if not keys_by_bucket:
+        return {}
+
+    candidates: Dict[Hashable, Set[int]] = {}
+    for bucket, pub_id in db.query(
+        PublicationLSHBucket.bucket, PublicationLSHBucket.publication_id
+    ).filter(PublicationLSHBucket.bucket.in_(list(keys_by_bucket))):
+        for key in keys_by_bucket[bucket]:
+            candidates.setdefault(key, set()).add(pub_id)
+
+    if not candidates:
+        return {}
+
+    pub_ids = set().union(*candidates.values())
+    stored = {
+        pub_id: np.frombuffer(signature, dtype=np.uint32)
+        for pub_id, signature in db.query(
+            PublicationSignature.publication_id, PublicationSignature.signature
+        ).filter(PublicationSignature.publication_id.in_(pub_ids))
+    }
+
+    duplicates = {}
+    for key, pub_ids in candidates.items():
+        best, best_score = None, threshold
+        for pub_id in pub_ids:
+            if pub_id in stored:
+                score = estimate_similarity(signatures[key], stored[pub_id])
+                if score >= best_score:
+                    best, best_score = pub_id, score
+        if best is not None:
+            duplicates[key] = best
+    return duplicates
+
+def store_signatures(db: Session, signatures: Dict[int, np.ndarray]):
+    """Persist signatures and LSH buckets for newly inserted publications"""
+    if not signatures:
+        return
+
+    db.bulk_insert_mappings(PublicationSignature, [
+        {'publication_id': pub_id, 'signature': signature.astype(np.uint32).tobytes()}
+        for pub_id, signature in signatures.items()
+    ])
+    db.bulk_insert_mappings(PublicationLSHBucket, [
+        {'bucket': bucket, 'publication_id': pub_id}
+        for pub_id, signature in signatures.items()
+        for bucket in set(lsh_keys(signature))
+    ])
+
+def _drop_near_duplicates(
+    db: Session,
+    rows: List[Dict],
+    existing_ids: Set[str]
+) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+    """
+    Drop new works that near-duplicate the corpus or an earlier work of the batch
+
+    Works already stored under their openalex_id are always kept so they can
+    be updated. Returns the kept rows and the signatures of the new ones.
+    """
+    signatures = {
+        row['openalex_id']: minhash_signature(row['title'], row['abstract'])
+        for row in rows if row['openalex_id'] not in existing_ids
+    }
+    in_corpus = find_corpus_duplicates(db, signatures)
+
+    batch_index = NearDuplicateIndex()
+    kept = []
+    for row in rows:
+        oid = row['openalex_id']
+        if oid in signatures:
+            if oid in in_corpus or batch_index.query(signatures[oid]) is not None:
+                del signatures[oid]
+                continue
+            batch_index.add(oid, signatures[oid])
+        kept.append(row)
+
+    return kept, signatures
+
+def upsert_publications(
+    db: Session,
+    publications: List[Dict],
+    batch_size: int = UPSERT_BATCH_SIZE,
+    resolver: Optional[AuthorResolver] = None
+) -> Dict[str, int]:
+    """
+    Idempotent set-based ingestion of parsed OpenAlex works
+
+    Each batch is one INSERT ... ON CONFLICT (openalex_id) DO UPDATE that
+    only touches rows whose metadata actually changed, followed by one
+    INSERT ... ON CONFLICT DO NOTHING for the author links. Re-ingesting an
+    overlapping range therefore inserts new works, updates changed ones and
+    leaves unchanged ones alone. New works that near-duplicate an existing
+    one (preprint vs. journal version, re-cased or translated title) are
+    skipped via their MinHash signature.
+
+    Returns:
+        {'inserted', 'updated', 'unchanged', 'skipped', 'near_duplicates'} counts
+    """
+    insert = _insert(db)
+    table = Publication.__table__
+    resolver = resolver or AuthorResolver(db)
+    stats = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'near_duplicates': 0}
+
+    for start in range(0, len(publications), batch_size):
+        chunk = publications[start:start + batch_size]
+
+        # One row per openalex_id / DOI (ON CONFLICT cannot hit a row twice)
+        by_id = {}
+        seen_dois = set()
+        for pub_data in chunk:
+            if not pub_data.get('openalex_id'):
+                stats['skipped'] += 1
+                continue
+            row = _publication_row(pub_data)
+            if row['doi'] and row['doi'] in seen_dois and row['openalex_id'] not in by_id:
+                stats['skipped'] += 1
+                continue
+            if row['doi']:
+                seen_dois.add(row['doi'])
+            by_id[row['openalex_id']] = (row, pub_data)
+
+        rows = _resolve_doi_owners(db, [row for row, _ in by_id.values()])
+        stats['skipped'] += len(by_id) - len(rows)
+        if not rows:
+            continue
+
+        existing_ids = {
+            oid for (oid,) in db.query(Publication.openalex_id).filter(
+                Publication.openalex_id.in_([r['openalex_id'] for r in rows])
+            )
+        }
+
+        kept, signatures = _drop_near_duplicates(db, rows, existing_ids)
+        stats['near_duplicates'] += len(rows) - len(kept)
+        rows = kept
+        if not rows:
+            db.commit()
+            continue
+
+        stmt = insert(table).values(rows)
+        changed = or_(*[
+            table.c[col].is_distinct_from(stmt.excluded[col]) for col in UPSERT_COLUMNS
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.openalex_id],
+            set_={col: stmt.excluded[col] for col in UPSERT_COLUMNS},
+            where=changed
+        ).returning(table.c.id, table.c.openalex_id)
+
+        written = {oid: pub_id for pub_id, oid in db.execute(stmt)}
+
+        inserted = set(written) - existing_ids
+        stats['inserted'] += len(inserted)
+        stats['updated'] += len(set(written) & existing_ids)
+        stats['unchanged'] += len(existing_ids - set(written))
+
+        store_signatures(db, {written[oid]: signatures[oid] for oid in inserted})
+
+        # Author links for new works only; updated works keep their links
+        new_works = [by_id[oid][1] for oid in inserted]
+        refs = [author_refs(pub_data) for pub_data in new_works]
+        authors = resolver.resolve(ref for pub_refs in refs for ref in pub_refs)
+        db.flush()
+
+        links = set()
+        offset = 0
+        for pub_data, pub_refs in zip(new_works, refs):
+            pub_id = written[pub_data['openalex_id']]
+            for author in authors[offset:offset + len(pub_refs)]:
+                links.add((pub_id, author.id))
+            offset += len(pub_refs)
+
+        if links:
+            db.execute(
+                insert(publication_authors).values([
+                    {'publication_id': pub_id, 'author_id': author_id}
+                    for pub_id, author_id in links
+                ]).on_conflict_do_nothing()
+            )
+
+        db.commit()
+        print(f"  Progress: {stats['inserted']} new, {stats['updated']} updated, "
+              f"{stats['unchanged']} unchanged, {stats['near_duplicates']} near-duplicates")
+
+    return stats
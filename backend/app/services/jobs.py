@@ -0,0 +1,374 @@
+"""
+Background jobs: harvest, retrain and reindex
+
+The API only inserts and reads rows of the jobs table. scripts/run_worker.py
+claims queued jobs and runs each one in a process pool, so multi-minute
+harvests and LDA fits never occupy an API worker. Jobs of one kind run one
+at a time, and at most one more can wait in the queue. retrain and reindex
+both rewrite the topic weights' derived tables, so they never run together.
+
+Cancellation is cooperative: a job checks `cancel_requested` at every
+progress point (each loaded batch of a harvest, each training stage).
+"""
+import json
+import multiprocessing
+import os
+import socket
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models import Job
+from .analytics import refresh_analytics_snapshot
+from .counts import refresh_count_summary
+
+JOB_KINDS = ('harvest', 'retrain', 'reindex')
+ACTIVE_STATUSES = ('queued', 'running')
+# A job is not claimed while a job of any of these kinds is running
+CONFLICTING_KINDS = {
+    'harvest': ('harvest',),
+    'retrain': ('retrain', 'reindex'),
+    'reindex': ('retrain', 'reindex'),
+}
+# pg_advisory_xact_lock key serializing claims across workers
+CLAIM_LOCK_KEY = 0x6A6F6273
+
+# Seconds between queue polls while idle
+POLL_INTERVAL = 2.0
+# The worker process stamps heartbeat_at of its running jobs this often...
+HEARTBEAT_INTERVAL = 5.0
+# ...so a running job without one for this long lost its worker
+STALE_AFTER = 120.0
+# Progress writes from a job are throttled to one per this many seconds
+PROGRESS_INTERVAL = 1.0
+
+DEFAULT_EMAIL = 'research@example.com'
+
+class JobConflict(Exception):
+    """The request does not fit the job's current state"""
+
+class JobCancelled(Exception):
+    """Raised at a progress point once cancellation was requested"""
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def submit_job(db: Session, kind: str, params: Optional[Dict] = None) -> Job:
+    """Queue a job; a second queued job of the same kind is refused"""
+    if kind not in JOB_KINDS:
+        raise ValueError(f"unknown job kind: {kind}")
+
+    queued = db.query(Job).filter(Job.kind == kind, Job.status == 'queued').first()
+    if queued:
+        raise JobConflict(f"{kind} job {queued.id} is already queued")
+
+    job = Job(kind=kind, params=json.dumps(params or {}), status='queued',
+              cancel_requested=False, created_at=_now())
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+def cancel_job(db: Session, job: Job) -> Job:
+    """Queued jobs are cancelled at once, running ones at their next progress point"""
+    if job.status not in ACTIVE_STATUSES:
+        raise JobConflict(f"job {job.id} already {job.status}")
+
+    # Conditional update: the worker may claim the job concurrently
+    cancelled = db.query(Job).filter(Job.id == job.id, Job.status == 'queued').update(
+        {'status': 'cancelled', 'cancel_requested': True, 'finished_at': _now()},
+        synchronize_session=False
+    )
+    if not cancelled:
+        db.query(Job).filter(Job.id == job.id).update(
+            {'cancel_requested': True}, synchronize_session=False
+        )
+    db.commit()
+    db.refresh(job)
+    return job
+
+def claim_next_job(db: Session, worker: str) -> Optional[Job]:
+    """Mark the oldest queued job that conflicts with no running job as ours"""
+    postgres = db.get_bind().dialect.name == 'postgresql'
+    if postgres:
+        # Two workers must not both see "nothing running" and claim a retrain
+        # and a reindex at once; the lock is released at commit
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': CLAIM_LOCK_KEY})
+
+    running = set(db.scalars(select(Job.kind).where(Job.status == 'running')))
+    blocked = [kind for kind, conflicts in CONFLICTING_KINDS.items() if running.intersection(conflicts)]
+    query = db.query(Job).filter(
+        Job.status == 'queued', Job.kind.notin_(blocked)
+    ).order_by(Job.id)
+    if postgres:
+        query = query.with_for_update(skip_locked=True)
+
+    job = query.first()
+    if job is None:
+        db.commit()
+        return None
+
+    now = _now()
+    claimed = db.query(Job).filter(Job.id == job.id, Job.status == 'queued').update(
+        {'status': 'running', 'worker': worker, 'started_at': now, 'heartbeat_at': now},
+        synchronize_session=False
+    )
+    db.commit()
+    if not claimed:
+        return None
+    db.refresh(job)
+    return job
+
+def heartbeat(db: Session, job_ids: List[int]):
+    db.query(Job).filter(Job.id.in_(job_ids), Job.status == 'running').update(
+        {'heartbeat_at': _now()}, synchronize_session=False
+    )
+    db.commit()
+
+def fail_stale_jobs(db: Session, stale_after: float = STALE_AFTER) -> int:
+    """Fail running jobs whose worker stopped sending heartbeats"""
+    failed = db.query(Job).filter(
+        Job.status == 'running',
+        Job.heartbeat_at < _now() - timedelta(seconds=stale_after)
+    ).update(
+        {'status': 'failed', 'error': 'Worker lost (no heartbeat)', 'finished_at': _now()},
+        synchronize_session=False
+    )
+    db.commit()
+    return failed
+
+def finish_job(job_id: int, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+    """Store the outcome of a running job; a job already finished elsewhere is left alone"""
+    db = SessionLocal()
+    try:
+        db.query(Job).filter(Job.id == job_id, Job.status == 'running').update({
+            'status': status,
+            'result': json.dumps(result, default=str) if result is not None else None,
+            'error': error,
+            'finished_at': _now(),
+        }, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+class JobContext:
+    """Progress reporting and cancellation point for the job being executed"""
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._last_progress = 0.0
+
+    def progress(self, message: str, force: bool = False):
+        """Store the message and raise JobCancelled if cancellation was requested"""
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+
+        db = SessionLocal()
+        try:
+            db.query(Job).filter(Job.id == self.job_id).update(
+                {'progress': message[:200]}, synchronize_session=False
+            )
+            db.commit()
+            cancel = db.query(Job.cancel_requested).filter(Job.id == self.job_id).scalar()
+        finally:
+            db.close()
+
+        if cancel:
+            raise JobCancelled()
+
+def run_harvest(ctx: JobContext, params: Dict) -> Dict:
+    """Streaming OpenAlex harvest; queues a retrain when publications changed"""
+    # The handlers import their dependencies (httpx, numpy, scipy, sklearn)
+    # themselves: the API imports this module only to submit and cancel jobs
+    from .openalex_fetcher import OpenAlexFetcher
+    from .pipeline import run_ingest_pipeline
+    from .watermarks import harvest_query_key, harvest_complete, get_watermark, set_watermark
+
+    limit = params.get('limit', 500)
+    year_from = params.get('year_from', 2020)
+    year_to = params.get('year_to')
+    institutions = params.get('institutions')
+    fields = params.get('fields')
+
+    db = SessionLocal()
+    fetcher = OpenAlexFetcher(email=params.get('email') or DEFAULT_EMAIL)
+    try:
+        query_key = harvest_query_key(year_from, year_to, institutions, fields)
+        since = None
+        if params.get('incremental'):
+            watermark = get_watermark(db, query_key)
+            since = watermark.isoformat() if watermark else None
+        run_started = datetime.now(timezone.utc).date()
+
+        ctx.progress(f"harvesting since {since}" if since else "harvesting", force=True)
+        result = run_ingest_pipeline(
+            fetcher, db, limit=limit, year_from=year_from, year_to=year_to,
+            institutions=institutions, fields=fields, since=since,
+            on_batch=lambda totals: ctx.progress(f"loaded {totals['loaded']} publications")
+        )
+
+        written = result['written']
+        saved = written['inserted'] + written['updated']
+        complete = harvest_complete(fetcher.stats, result['errors'])
+        if params.get('incremental') and complete and result['verified'] < limit:
+            set_watermark(db, query_key, run_started, result['verified'])
+        if saved:
+            refresh_count_summary(db)
+            # Updated works changed rows the snapshot already holds
+            refresh_analytics_snapshot(db, full=written['updated'] > 0)
+
+        retrain_job_id = None
+        if saved and params.get('retrain', True):
+            try:
+                retrain_job_id = submit_job(db, 'retrain').id
+            except JobConflict:
+                pass  # the queued retrain will see these publications too
+
+        return {
+            'verified': result['verified'],
+            'written': written,
+            'errors': result['errors'],
+            'elapsed_seconds': result['elapsed_seconds'],
+            'requests': fetcher.request_summary(),
+            'retrain_job_id': retrain_job_id,
+        }
+    finally:
+        fetcher.close()
+        db.close()
+
+def run_retrain(ctx: JobContext, params: Dict) -> Dict:
+    """LDA retrain + similarity index, with the per-stage profile as result"""
+    from .retrain import retrain_topics
+    from .run_profiler import RunProfiler
+
+    db = SessionLocal()
+    try:
+        profiler = RunProfiler('topic_modeling', on_stage=lambda name: ctx.progress(name, force=True))
+        summary = retrain_topics(db, profiler)
+        if summary:
+            refresh_count_summary(db)
+        return {'summary': summary, 'profile': profiler.report()}
+    finally:
+        db.close()
+
+def run_reindex(ctx: JobContext, params: Dict) -> Dict:
+    """Count summary + similarity index from the stored topic weights"""
+    from .retrain import rebuild_indexes
+    from .run_profiler import RunProfiler
+
+    db = SessionLocal()
+    try:
+        profiler = RunProfiler('reindex', on_stage=lambda name: ctx.progress(name, force=True))
+        summary = rebuild_indexes(db, profiler)
+        return {'summary': summary, 'profile': profiler.report()}
+    finally:
+        db.close()
+
+JOB_HANDLERS: Dict[str, Callable[[JobContext, Dict], Dict]] = {
+    'harvest': run_harvest,
+    'retrain': run_retrain,
+    'reindex': run_reindex,
+}
+
+def execute_job(job_id: int):
+    """Run one claimed job to completion and store its outcome (pool process)"""
+    db = SessionLocal()
+    try:
+        job = db.get(Job, job_id)
+        kind, params = job.kind, json.loads(job.params or '{}')
+    finally:
+        db.close()
+
+    try:
+        result = JOB_HANDLERS[kind](JobContext(job_id), params)
+    except JobCancelled:
+        finish_job(job_id, 'cancelled')
+    except Exception:
+        finish_job(job_id, 'failed', error=traceback.format_exc())
+    else:
+        finish_job(job_id, 'succeeded', result=result)
+
+def _new_pool(processes: int) -> ProcessPoolExecutor:
+    # spawn: no inherited DB connections or BLAS threads; one job per
+    # process, so the memory of a large fit goes back to the OS afterwards
+    return ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context('spawn'),
+        max_tasks_per_child=1
+    )
+
+def run_worker(processes: int = 2, poll_interval: float = POLL_INTERVAL, exit_when_idle: bool = False):
+    """
+    Claim queued jobs and run up to `processes` of them at a time
+
+    Args:
+        exit_when_idle: Return once nothing is queued or running (cron / tests)
+    """
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    db = SessionLocal()
+    pool = _new_pool(processes)
+    running: Dict[Future, int] = {}
+    last_heartbeat = last_stale_check = 0.0
+
+    print(f"👷 Worker {worker}: {processes} process(es), polling every {poll_interval:g}s")
+    try:
+        while True:
+            now = time.monotonic()
+            if now - last_stale_check >= STALE_AFTER:
+                stale = fail_stale_jobs(db)
+                if stale:
+                    print(f"⚠️  Marked {stale} job(s) of lost workers as failed")
+                last_stale_check = now
+
+            for future in [f for f in running if f.done()]:
+                job_id = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    # The pool process died (e.g. killed for memory); its job never finished
+                    finish_job(job_id, 'failed', error=f"Worker process died: {error!r}")
+                    print(f"❌ Job {job_id}: worker process died")
+                    if isinstance(error, BrokenProcessPool):
+                        pool.shutdown(wait=False)
+                        pool = _new_pool(processes)
+                else:
+                    status = db.query(Job.status).filter(Job.id == job_id).scalar()
+                    db.commit()
+                    print(f"🏁 Job {job_id}: {status}")
+
+            while len(running) < processes:
+                job = claim_next_job(db, worker)
+                if job is None:
+                    break
+                print(f"▶️  Job {job.id}: {job.kind} {job.params}")
+                running[pool.submit(execute_job, job.id)] = job.id
+
+            if running and now - last_heartbeat >= HEARTBEAT_INTERVAL:
+                heartbeat(db, list(running.values()))
+                last_heartbeat = now
+
+            if not running:
+                if exit_when_idle:
+                    break
+                time.sleep(poll_interval)
+            else:
+                wait(list(running), timeout=poll_interval, return_when=FIRST_COMPLETED)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping worker")
+        # shutdown() does not stop jobs already executing: end their processes
+        # so they neither keep working nor report an outcome afterwards
+        pool.shutdown(wait=False, cancel_futures=True)
+        for child in multiprocessing.active_children():
+            child.terminate()
+            child.join()
+        for job_id in running.values():
+            finish_job(job_id, 'failed', error='Worker stopped')
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        db.close()
@@ -1,7 +1,16 @@
 import httpx
 import time
-from typing import List, Dict, Optional
+import random
+import calendar
+import threading
+import numpy as np
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Optional, Tuple
 import json
+from .checkpoints import ShardCheckpoint, checkpoint_directory, clear_checkpoints
+from .dedup import NearDuplicateIndex, minhash_signature
 
 class OpenAlexFetcher:
     """
@@ -33,50 +42,266 @@ class OpenAlexFetcher:
         'TELKOM_U': 'https://ror.org/03bg2mb49',
     }
     
-    def __init__(self, email: str = "research@example.com"):
+    # Top-level work fields read by _parse_work and the affiliation checks;
+    # everything else (locations, referenced_works, concepts, ...) is skipped
+    WORK_FIELDS = [
+        'id', 'doi', 'title', 'publication_year', 'abstract_inverted_index',
+        'authorships', 'primary_location', 'topics'
+    ]
+    
+    # OpenAlex maximum page size
+    PER_PAGE = 200
+    
+    # Adaptive pacing (AIMD): +RATE_STEP req/s after every success, rate
+    # x RATE_BACKOFF on a 429/503 (at most once per RATE_CUT_COOLDOWN, so a
+    # burst of throttled threads counts as one signal)
+    RATE_STEP = 0.25
+    RATE_BACKOFF = 0.5
+    MIN_RATE = 0.5
+    RATE_CUT_COOLDOWN = 1.0
+    
+    # Retries: full-jitter exponential backoff, uniform(0, min(cap, base * 2^n));
+    # a Retry-After header replaces the backoff and pauses every thread
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    BACKOFF_BASE = 1.0
+    BACKOFF_CAP = 60.0
+    MAX_RETRY_AFTER = 300.0
+    
+    def __init__(self, email: str = "research@example.com", requests_per_second: float = 8.0):
         self.email = email
-        self.session = httpx.Client(timeout=60.0)
+        self.session = httpx.Client(timeout=60.0, headers={'Accept-Encoding': 'gzip'})
+        self._lock = threading.Lock()
+        
+        # Shared by all worker threads (OpenAlex allows 10 requests/second)
+        self._max_rate = requests_per_second
+        self._rate = requests_per_second
+        self._rate_cut_until = 0.0
+        self._next_request_at = 0.0
+        
+        # One entry per logical request (all attempts), see _record_request
+        self.request_log: List[Dict] = []
         self.stats = {
             'total_fetched': 0,
             'by_institution': {},
             'by_year': {},
             'errors': [],
-            'indonesian_verified': 0
+            'incomplete_shards': [],  # shards stopped before their last page
+            'indonesian_verified': 0,
+            'transfer': {
+                'requests': 0,
+                'bytes_downloaded': 0,
+                'bytes_decoded': 0,
+                'decode_seconds': 0.0
+            },
+            'requests': {
+                'ok': 0,
+                'failed': 0,
+                'attempts': 0,
+                'retries': 0,
+                'throttled': 0,
+                'by_status': {},
+                'backoff_seconds': 0.0,
+                'rate_decreases': 0,
+                'min_rate': requests_per_second
+            }
         }
     
-    def _make_request(self, endpoint: str, params: dict, retry: int = 3) -> dict:
-        """Make HTTP request with retry logic"""
+    def _make_request(self, endpoint: str, params: dict, retry: int = 5, metrics: Optional[dict] = None) -> dict:
+        """
+        Make HTTP request with adaptive pacing and jittered exponential backoff
+        
+        429 / 5xx responses and transport errors are retried up to `retry`
+        attempts; other HTTP errors raise immediately.
+        
+        Args:
+            metrics: Optional dict filled with the transfer size of this
+                response ('bytes_downloaded' on the wire, 'bytes_decoded'
+                after decompression) and its JSON 'decode_seconds'
+        """
         params['mailto'] = self.email
         url = f"{self.BASE_URL}/{endpoint}"
+        started = time.perf_counter()
+        throttled = 0
+        status = None
         
         for attempt in range(retry):
+            last_attempt = attempt == retry - 1
             try:
+                self._throttle()
                 response = self.session.get(url, params=params)
-                
-                if response.status_code == 429:
-                    wait_time = 60
-                    print(f"  ⚠️  Rate limited, waiting {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                
-                if response.status_code != 200:
-                    if attempt < retry - 1:
-                        time.sleep(2)
-                        continue
-                    print(f"  ❌ Error {response.status_code}")
-                    response.raise_for_status()
-                
-                return response.json()
-                
-            except Exception as e:
-                if attempt < retry - 1:
-                    time.sleep(2)
-                    continue
-                print(f"  ❌ Request failed: {e}")
-                raise
+            except httpx.TransportError as e:
+                status = type(e).__name__
+                if last_attempt:
+                    self._record_request(endpoint, status, started, attempt + 1, throttled, error=str(e))
+                    print(f"  ❌ Request failed: {e}")
+                    raise
+                self._backoff(attempt)
+                continue
+            
+            status = response.status_code
+            if status == 200:
+                try:
+                    data = self._decode(response, metrics)
+                except ValueError as e:
+                    self._record_request(endpoint, status, started, attempt + 1, throttled, error=str(e))
+                    raise
+                self._speed_up()
+                self._record_request(endpoint, status, started, attempt + 1, throttled,
+                                     bytes_downloaded=response.num_bytes_downloaded)
+                return data
+            
+            if status not in self.RETRY_STATUSES or last_attempt:
+                self._record_request(endpoint, status, started, attempt + 1, throttled,
+                                     error=response.text[:200])
+                print(f"  ❌ Error {status}")
+                response.raise_for_status()
+            
+            # Retry-After is honoured on every retryable status; without it, back off
+            retry_after = self._retry_after(response)
+            if status in (429, 503):
+                throttled += 1
+                self._slow_down(retry_after)
+                print(f"  ⚠️  Throttled ({status}), {self._rate:.2f} req/s"
+                      + (f", server asks to wait {retry_after:.0f}s" if retry_after else ""))
+            elif retry_after is not None:
+                self._pause(retry_after)
+            if retry_after is None:
+                self._backoff(attempt)
         
         return {}
     
+    def _retry_after(self, response: httpx.Response) -> Optional[float]:
+        """Retry-After in seconds (delta-seconds or HTTP-date), capped"""
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(max(seconds, 0.0), self.MAX_RETRY_AFTER)
+    
+    def _backoff(self, attempt: int):
+        """Sleep uniform(0, min(cap, base * 2^attempt)) before the next attempt"""
+        delay = random.uniform(0, min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt))
+        with self._lock:
+            self.stats['requests']['retries'] += 1
+            self.stats['requests']['backoff_seconds'] += delay
+        time.sleep(delay)
+    
+    def _slow_down(self, pause: Optional[float] = None):
+        """Multiplicative decrease; `pause` (Retry-After) holds back every thread"""
+        with self._lock:
+            now = time.monotonic()
+            requests = self.stats['requests']
+            requests['throttled'] += 1
+            if now >= self._rate_cut_until:
+                self._rate = max(self.MIN_RATE, self._rate * self.RATE_BACKOFF)
+                self._rate_cut_until = now + self.RATE_CUT_COOLDOWN
+                requests['rate_decreases'] += 1
+                requests['min_rate'] = min(requests['min_rate'], self._rate)
+        if pause is not None:
+            self._pause(pause)
+    
+    def _pause(self, seconds: float):
+        """Hold back every thread for `seconds` (Retry-After) before the next attempt"""
+        with self._lock:
+            requests = self.stats['requests']
+            requests['retries'] += 1
+            requests['backoff_seconds'] += seconds
+            self._next_request_at = max(self._next_request_at, time.monotonic() + seconds)
+    
+    def _speed_up(self):
+        """Additive increase back towards requests_per_second"""
+        with self._lock:
+            self._rate = min(self._max_rate, self._rate + self.RATE_STEP)
+    
+    def _record_request(self, endpoint: str, status, started: float, attempts: int, throttled: int,
+                        bytes_downloaded: int = 0, error: Optional[str] = None):
+        """Per-request telemetry (all attempts of one call) and failure log"""
+        entry = {
+            'endpoint': endpoint,
+            'status': status,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'bytes': bytes_downloaded,
+            'attempts': attempts,
+            'throttled': throttled,
+        }
+        with self._lock:
+            requests = self.stats['requests']
+            requests['ok' if error is None else 'failed'] += 1
+            requests['attempts'] += attempts
+            requests['by_status'][str(status)] = requests['by_status'].get(str(status), 0) + 1
+            self.request_log.append(entry)
+            if error is not None:
+                self.stats['errors'].append({**entry, 'error': error})
+    
+    def request_summary(self) -> Dict:
+        """Totals plus latency / size percentiles of all logged requests"""
+        with self._lock:
+            summary = dict(self.stats['requests'], by_status=dict(self.stats['requests']['by_status']))
+            latencies = np.array([r['latency_ms'] for r in self.request_log])
+            sizes = np.array([r['bytes'] for r in self.request_log])
+        summary['current_rate'] = round(self._rate, 2)
+        summary['backoff_seconds'] = round(summary['backoff_seconds'], 2)
+        if len(latencies):
+            summary.update({
+                'latency_p50_ms': round(float(np.percentile(latencies, 50)), 1),
+                'latency_p95_ms': round(float(np.percentile(latencies, 95)), 1),
+                'latency_max_ms': round(float(latencies.max()), 1),
+                'bytes_p50': int(np.percentile(sizes, 50)),
+                'bytes_total': int(sizes.sum()),
+            })
+        return summary
+    
+    def run_report(self) -> Dict:
+        """JSON-serialisable report of the harvest: counts, transfer, request telemetry"""
+        return {
+            'total_fetched': self.stats['total_fetched'],
+            'indonesian_verified': self.stats['indonesian_verified'],
+            'by_year': {str(k): v for k, v in self.stats['by_year'].items()},
+            'by_institution': self.stats['by_institution'],
+            'transfer': self.stats['transfer'],
+            'requests': self.request_summary(),
+            'errors': self.stats['errors'],
+            'incomplete_shards': self.stats['incomplete_shards'],
+            'request_log': self.request_log,
+        }
+    
+    def _decode(self, response: httpx.Response, metrics: Optional[dict]) -> dict:
+        """Parse the JSON body and account for transfer size and decode time"""
+        body = response.content
+        started = time.perf_counter()
+        data = json.loads(body)
+        page = {
+            'bytes_downloaded': response.num_bytes_downloaded,
+            'bytes_decoded': len(body),
+            'decode_seconds': time.perf_counter() - started
+        }
+        
+        with self._lock:
+            transfer = self.stats['transfer']
+            transfer['requests'] += 1
+            for key, value in page.items():
+                transfer[key] += value
+        
+        if metrics is not None:
+            metrics.update(page)
+        return data
+    
+    def _throttle(self):
+        """Space requests from all threads at least 1 / current rate apart"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + 1.0 / self._rate
+        
+        if wait > 0:
+            time.sleep(wait)
+    
     def fetch_indonesian_publications(
         self, 
         limit: int = 1000,
@@ -84,11 +309,23 @@ class OpenAlexFetcher:
         year_to: Optional[int] = None,
         institutions: Optional[List[str]] = None,
         fields: Optional[List[str]] = None,
-        use_country_fallback: bool = True
+        use_country_fallback: bool = True,
+        since: Optional[str] = None,
+        since_field: str = 'updated',
+        workers: int = 1,
+        shard_by: str = 'year',
+        checkpoint_dir: Optional[str] = None
     ) -> List[Dict]:
         """
         Fetch publikasi riset Indonesia
         IMPROVED: Uses country filter as primary + institution verification
+        
+        Incremental mode: pass `since` (YYYY-MM-DD) to fetch only works
+        updated (since_field='updated') or created (since_field='created')
+        on or after that date.
+        
+        Parallel mode: `workers` threads harvest year/month shards
+        (`shard_by`), optionally checkpointed under `checkpoint_dir`.
         """
         print("=" * 70)
         print("🇮🇩 INDONESIAN NATIONAL RESEARCH PUBLICATIONS FETCHER")
@@ -106,25 +343,34 @@ class OpenAlexFetcher:
         if fields:
             print(f"  • Research fields: {', '.join(fields)}")
         
+        if since:
+            print(f"  • Incremental: works {since_field} since {since}")
+        
         # Fetch using country filter (more reliable)
         all_publications = self._fetch_by_country_with_verification(
             limit=limit,
             year_from=year_from,
             year_to=year_to,
             fields=fields,
-            target_institutions=institutions
+            target_institutions=institutions,
+            since=since,
+            since_field=since_field,
+            workers=workers,
+            shard_by=shard_by,
+            checkpoint_dir=checkpoint_dir
         )
         
         # If not enough, try per-institution
         if len(all_publications) < limit * 0.3 and use_country_fallback:
             print(f"\n🔄 Country filter returned only {len(all_publications)}, trying per-institution...")
             
-            selected_institutions = self.INDONESIAN_INSTITUTIONS
-            if institutions:
-                selected_institutions = {
-                    k: v for k, v in self.INDONESIAN_INSTITUTIONS.items() 
-                    if k in institutions
-                }
+            # Index what we already have; each new work is then checked
+            # against its LSH buckets instead of the whole list
+            seen = NearDuplicateIndex()
+            for i, pub in enumerate(all_publications):
+                seen.add(i, minhash_signature(pub['title'], pub.get('abstract')))
+            
+            selected_institutions = self._select_institutions(institutions)
             
             for inst_name, ror_id in selected_institutions.items():
                 if len(all_publications) >= limit:
@@ -136,111 +382,333 @@ class OpenAlexFetcher:
                     institution_name=inst_name,
                     limit=50,
                     year_from=year_from,
-                    year_to=year_to
+                    year_to=year_to,
+                    since=since,
+                    since_field=since_field
                 )
                 
-                # Merge with deduplication
+                # Merge with near-duplicate detection
                 for pub in pubs:
-                    if pub['title'] not in [p['title'] for p in all_publications]:
+                    if seen.check_and_add(len(all_publications), pub['title'], pub.get('abstract')) is None:
                         all_publications.append(pub)
                 
                 time.sleep(0.5)
         
         # Final stats
-        self.stats['total_fetched'] = len(all_publications)
-        for pub in all_publications:
+        self.record_publications(all_publications)
+        
+        self._print_summary()
+        
+        return all_publications[:limit]
+    
+    def record_publications(self, publications: List[Dict]):
+        """Add publications to the by-year / by-institution summary stats"""
+        self.stats['total_fetched'] += len(publications)
+        for pub in publications:
             year = pub.get('year')
             if year:
                 self.stats['by_year'][year] = self.stats['by_year'].get(year, 0) + 1
             
             inst = pub.get('primary_institution', 'Unknown')
             self.stats['by_institution'][inst] = self.stats['by_institution'].get(inst, 0) + 1
-        
-        self._print_summary()
-        
-        return all_publications[:limit]
     
-    def _fetch_by_country_with_verification(
+    def iter_work_pages(
         self,
         limit: int,
         year_from: int,
-        year_to: int,
+        year_to: Optional[int] = None,
+        institutions: Optional[List[str]] = None,
         fields: Optional[List[str]] = None,
+        use_country_fallback: bool = True,
+        since: Optional[str] = None,
+        since_field: str = 'updated',
+        verified: Callable[[], int] = lambda: 0
+    ) -> Iterator[Tuple[List[dict], Optional[str]]]:
+        """
+        Stream raw work pages (fetch stage of the ingest pipeline)
+        
+        Yields (works, institution): institution is None for country-wide
+        pages, whose affiliation still has to be verified by parse_page, or
+        the institution name for per-institution fallback pages. Stops
+        requesting once `verified()` reaches `limit`.
+        """
+        if year_to is None:
+            from datetime import datetime
+            year_to = datetime.now().year
+        
+        filter_str = ','.join(self._country_filters(fields, since, since_field) + [
+            f'from_publication_date:{year_from}-01-01',
+            f'to_publication_date:{year_to}-12-31'
+        ])
+        
+        cursor = "*"
+        while cursor and verified() < limit:
+            page = {}
+            data = self._make_request('works', {
+                'filter': filter_str,
+                'per-page': self.PER_PAGE,
+                'cursor': cursor,
+                'select': ','.join(self.WORK_FIELDS),
+            }, metrics=page)
+            results = data.get('results', [])
+            cursor = data.get('meta', {}).get('next_cursor') if results else None
+            
+            print(f"  🌏 page: {len(results)} works, "
+                  f"{page['bytes_downloaded'] / 1024:.0f} KiB, "
+                  f"decode {page['decode_seconds'] * 1000:.0f} ms")
+            if results:
+                yield results, None
+        
+        if not use_country_fallback or verified() >= limit * 0.3:
+            return
+        
+        print(f"\n🔄 Country filter returned only {verified()}, trying per-institution...")
+        for inst_name, ror_id in self._select_institutions(institutions).items():
+            if verified() >= limit:
+                break
+            
+            print(f"\n📚 Trying {inst_name} directly...")
+            try:
+                data = self._make_request('works', {
+                    'filter': self._ror_filter(ror_id, year_from, year_to, since, since_field),
+                    'per-page': 50,
+                    'select': ','.join(self.WORK_FIELDS)
+                })
+            except Exception as e:
+                print(f"  Error: {e}")
+                continue
+            
+            yield data.get('results', []), inst_name
+    
+    def parse_page(
+        self,
+        works: List[dict],
+        institution: Optional[str] = None,
         target_institutions: Optional[List[str]] = None
     ) -> List[Dict]:
         """
-        Fetch by country code (ID) and verify Indonesian affiliation
-        This is more reliable than per-institution ROR
-        """
-        print(f"\n🌏 Fetching Indonesian publications (country-wide)...")
+        Verify, parse and quality-filter one page of raw works
         
+        Args:
+            institution: Known source institution (per-institution fetch);
+                None to verify the Indonesian affiliation and identify it
+            target_institutions: Keep only these institutions (verified pages)
+        """
         publications = []
-        per_page = 50
-        cursor = "*"
-        max_pages = (limit // per_page) + 5  # Add buffer
-        page_count = 0
+        for work in works:
+            inst = institution
+            if inst is None:
+                if not self._has_indonesian_affiliation(work):
+                    continue
+                inst = self._identify_primary_institution(work)
+                if target_institutions and inst not in target_institutions:
+                    continue
+            
+            pub = self._parse_work(work, inst)
+            if pub and self._is_quality_publication(pub):
+                publications.append(pub)
         
-        # Build filter - Use country code as primary filter
+        return publications
+    
+    def _select_institutions(self, institutions: Optional[List[str]]) -> Dict[str, str]:
+        if not institutions:
+            return self.INDONESIAN_INSTITUTIONS
+        return {
+            k: v for k, v in self.INDONESIAN_INSTITUTIONS.items()
+            if k in institutions
+        }
+    
+    def _country_filters(self, fields: Optional[List[str]], since: Optional[str], since_field: str) -> List[str]:
+        """Country-wide filter terms (without the publication date range)"""
         filters = [
             'institutions.country_code:ID',
-            f'from_publication_date:{year_from}-01-01',
-            f'to_publication_date:{year_to}-12-31',
             'has_abstract:true'  # Only with abstract for better quality
         ]
         
+        if since:
+            filters.append(self._since_filter(since, since_field))
+        
         # Add field filter if specified
         if fields:
             field_ids = self._map_fields_to_ids(fields)
             if field_ids:
                 filters.append(f'primary_topic.field.id:{"|".join(field_ids)}')
         
-        filter_str = ','.join(filters)
+        return filters
+    
+    def _ror_filter(
+        self,
+        ror_id: str,
+        year_from: int,
+        year_to: int,
+        since: Optional[str],
+        since_field: str
+    ) -> str:
+        filters = [
+            f'authorships.institutions.ror:{ror_id}',
+            f'from_publication_date:{year_from}-01-01',
+            f'to_publication_date:{year_to}-12-31',
+            'has_abstract:true'
+        ]
+        
+        if since:
+            filters.append(self._since_filter(since, since_field))
+        
+        return ','.join(filters)
+    
+    def _date_shards(self, year_from: int, year_to: int, shard_by: str = 'year') -> List[Tuple[str, str]]:
+        """Split the publication date range into (from, to) shards"""
+        if shard_by not in ('year', 'month'):
+            raise ValueError(f"shard_by must be 'year' or 'month', got {shard_by!r}")
+        
+        shards = []
+        for year in range(year_from, year_to + 1):
+            if shard_by == 'year':
+                shards.append((f'{year}-01-01', f'{year}-12-31'))
+                continue
+            for month in range(1, 13):
+                last_day = calendar.monthrange(year, month)[1]
+                shards.append((f'{year}-{month:02d}-01', f'{year}-{month:02d}-{last_day:02d}'))
+        
+        return shards
+    
+    def _fetch_by_country_with_verification(
+        self,
+        limit: int,
+        year_from: int,
+        year_to: int,
+        fields: Optional[List[str]] = None,
+        target_institutions: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        since_field: str = 'updated',
+        workers: int = 1,
+        shard_by: str = 'year',
+        checkpoint_dir: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Fetch by country code (ID) and verify Indonesian affiliation
+        This is more reliable than per-institution ROR
+        
+        The date range is split into year (or month) shards, each walked by
+        its own cursor. Shards run in `workers` parallel threads sharing
+        the request rate limit, and are merged through a dedup stage.
+        With `checkpoint_dir`, every shard saves its cursor and results
+        after each page so an interrupted harvest resumes where it stopped.
+        """
+        print(f"\n🌏 Fetching Indonesian publications (country-wide)...")
+        
+        # Build filter - Use country code as primary filter
+        filters = self._country_filters(fields, since, since_field)
+        
+        shards = self._date_shards(year_from, year_to, shard_by)
+        
+        checkpoint_root = None
+        if checkpoint_dir:
+            query_id = f"{','.join(filters)}|{year_from}-{year_to}|{shard_by}|{target_institutions}"
+            checkpoint_root = checkpoint_directory(checkpoint_dir, query_id)
+        
+        print(f"  • {len(shards)} {shard_by} shards, {workers} worker(s)")
+        
+        progress = {'verified': 0}
+        
+        def run(shard):
+            return self._fetch_shard(
+                shard, filters, limit, target_institutions, checkpoint_root, progress
+            )
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            shard_results = list(pool.map(run, shards))
+        
+        # Dedup stage: the same work can surface in two shards after a resume
+        publications = []
+        seen = set()
+        for shard_pubs, _ in shard_results:
+            for pub in shard_pubs:
+                key = pub.get('openalex_id') or pub['title'].lower()
+                if key not in seen:
+                    seen.add(key)
+                    publications.append(pub)
+        
+        incomplete = [
+            f'{date_from}..{date_to}'
+            for (date_from, date_to), (_, done) in zip(shards, shard_results) if not done
+        ]
+        self.stats['incomplete_shards'].extend(incomplete)
+        if checkpoint_root and not incomplete:
+            clear_checkpoints(checkpoint_root)
+        
+        print(f"\n✅ Verified Indonesian publications: {len(publications)}")
+        return publications
+    
+    def _fetch_shard(
+        self,
+        shard: Tuple[str, str],
+        filters: List[str],
+        limit: int,
+        target_institutions: Optional[List[str]],
+        checkpoint_root: Optional[str],
+        progress: Dict
+    ) -> Tuple[List[Dict], bool]:
+        """
+        Walk one date shard with its own cursor
+        
+        Returns:
+            (publications, done) - done is False if the shard stopped early
+        """
+        date_from, date_to = shard
+        filter_str = ','.join(filters + [
+            f'from_publication_date:{date_from}',
+            f'to_publication_date:{date_to}'
+        ])
+        
+        checkpoint = None
+        cursor = "*"
+        publications = []
+        if checkpoint_root:
+            checkpoint = ShardCheckpoint(checkpoint_root, f"{date_from}_{date_to}")
+            state = checkpoint.load()
+            cursor, publications = state['cursor'], state['publications']
+            if state['done']:
+                return publications, True
+            with self._lock:
+                progress['verified'] += len(publications)
         
         try:
-            while len(publications) < limit and cursor and page_count < max_pages:
+            while cursor and progress['verified'] < limit:
                 params = {
                     'filter': filter_str,
-                    'per-page': per_page,
+                    'per-page': self.PER_PAGE,
                     'cursor': cursor,
+                    'select': ','.join(self.WORK_FIELDS),
                 }
                 
-                print(f"  Page {page_count + 1}: Fetching... (total: {len(publications)})")
-                
-                data = self._make_request('works', params)
+                page = {}
+                data = self._make_request('works', params, metrics=page)
                 results = data.get('results', [])
+                cursor = data.get('meta', {}).get('next_cursor') if results else None
                 
-                if not results:
-                    print("  No more results")
-                    break
-                
-                for work in results:
-                    # Verify Indonesian affiliation
-                    if self._has_indonesian_affiliation(work):
-                        # Identify primary institution
-                        inst = self._identify_primary_institution(work)
-                        
-                        # Filter by target institutions if specified
-                        if target_institutions and inst not in target_institutions:
-                            continue
-                        
-                        pub = self._parse_work(work, inst)
-                        if pub and self._is_quality_publication(pub):
-                            publications.append(pub)
-                            self.stats['indonesian_verified'] += 1
+                page_pubs = self.parse_page(results, target_institutions=target_institutions)
                 
-                cursor = data.get('meta', {}).get('next_cursor')
-                page_count += 1
+                publications.extend(page_pubs)
+                with self._lock:
+                    progress['verified'] += len(page_pubs)
+                    self.stats['indonesian_verified'] += len(page_pubs)
                 
-                if not cursor:
-                    break
+                if checkpoint:
+                    checkpoint.save_page(page_pubs, cursor, len(publications))
                 
-                time.sleep(0.3)  # Be polite
+                print(f"  [{date_from}..{date_to}] +{len(page_pubs)} "
+                      f"(shard: {len(publications)}, total: {progress['verified']}) "
+                      f"{page['bytes_downloaded'] / 1024:.0f} KiB, "
+                      f"decode {page['decode_seconds'] * 1000:.0f} ms")
                 
         except Exception as e:
-            print(f"❌ Fetch error: {e}")
+            print(f"❌ Fetch error in shard {date_from}..{date_to}: {e}")
+            with self._lock:
+                self.stats['errors'].append({'shard': f'{date_from}..{date_to}', 'error': str(e)})
+            return publications, False
         
-        print(f"\n✅ Verified Indonesian publications: {len(publications)}")
-        return publications
+        return publications, not cursor
     
     def _fetch_by_ror_direct(
         self,
@@ -248,24 +716,18 @@ class OpenAlexFetcher:
         institution_name: str,
         limit: int,
         year_from: int,
-        year_to: int
+        year_to: int,
+        since: Optional[str] = None,
+        since_field: str = 'updated'
     ) -> List[Dict]:
         """Direct fetch by ROR ID"""
         publications = []
         
-        filters = [
-            f'authorships.institutions.ror:{ror_id}',
-            f'from_publication_date:{year_from}-01-01',
-            f'to_publication_date:{year_to}-12-31',
-            'has_abstract:true'
-        ]
-        
-        filter_str = ','.join(filters)
-        
         try:
             params = {
-                'filter': filter_str,
-                'per-page': min(limit, 50)
+                'filter': self._ror_filter(ror_id, year_from, year_to, since, since_field),
+                'per-page': min(limit, self.PER_PAGE),
+                'select': ','.join(self.WORK_FIELDS)
             }
             
             data = self._make_request('works', params)
@@ -273,16 +735,19 @@ class OpenAlexFetcher:
             
             print(f"  Found {len(results)} publications")
             
-            for work in results:
-                pub = self._parse_work(work, institution_name)
-                if pub and self._is_quality_publication(pub):
-                    publications.append(pub)
-                    
+            publications = self.parse_page(results, institution=institution_name)
+            
         except Exception as e:
             print(f"  Error: {e}")
         
         return publications
     
+    def _since_filter(self, since: str, since_field: str) -> str:
+        """OpenAlex from_updated_date / from_created_date filter"""
+        if since_field not in ('updated', 'created'):
+            raise ValueError(f"since_field must be 'updated' or 'created', got {since_field!r}")
+        return f'from_{since_field}_date:{since}'
+    
     def _has_indonesian_affiliation(self, work: dict) -> bool:
         """Check if work has Indonesian affiliation"""
         indonesian_keywords = [
@@ -320,8 +785,9 @@ class OpenAlexFetcher:
         # Try to match with known institutions
         for authorship in work.get('authorships', []):
             for institution in authorship.get('institutions', []):
-                ror = institution.get('ror', '')
-                name = institution.get('display_name', '')
+                # OpenAlex sends null for institutions without ROR
+                ror = institution.get('ror') or ''
+                name = institution.get('display_name') or ''
                 
                 # Match by ROR
                 for inst_name, inst_ror in self.INDONESIAN_INSTITUTIONS.items():
@@ -390,6 +856,7 @@ class OpenAlexFetcher:
             
             # Authors - Only keep Indonesian authors or first 10
             authors = []
+            author_ids = []
             affiliations = []
             
             for authorship in work.get('authorships', [])[:10]:
@@ -398,6 +865,7 @@ class OpenAlexFetcher:
                 
                 if author_name:
                     authors.append(author_name)
+                    author_ids.append(author_info.get('id') or None)
                     
                     # Get first Indonesian institution or first institution
                     institutions = authorship.get('institutions', [])
@@ -432,6 +900,7 @@ class OpenAlexFetcher:
                 'abstract': abstract or 'No abstract available',
                 'year': year,
                 'authors': authors,
+                'author_ids': author_ids,
                 'affiliations': affiliations,
                 'doi': work.get('doi', ''),
                 'url': work.get('id', ''),
@@ -505,8 +974,33 @@ class OpenAlexFetcher:
                 bar = "█" * (count // 10) if count > 0 else ""
                 print(f"  {year}: {count:4} {bar}")
         
+        transfer = self.stats['transfer']
+        if transfer['requests']:
+            downloaded = transfer['bytes_downloaded']
+            decoded = transfer['bytes_decoded']
+            print(f"\n📦 Transfer: {transfer['requests']} requests, "
+                  f"{downloaded / 1048576:.1f} MiB downloaded "
+                  f"({decoded / 1048576:.1f} MiB JSON, "
+                  f"{decoded / max(downloaded, 1):.1f}x compression), "
+                  f"decode {transfer['decode_seconds']:.2f}s")
+        
+        requests = self.request_summary()
+        if requests['ok'] or requests['failed']:
+            print(f"\n🚦 Requests: {requests['ok']} ok, {requests['failed']} failed, "
+                  f"{requests['retries']} retries ({requests['throttled']} throttled), "
+                  f"{requests['backoff_seconds']:.1f}s backing off")
+            if 'latency_p50_ms' in requests:
+                print(f"  Latency p50 {requests['latency_p50_ms']:.0f} ms, "
+                      f"p95 {requests['latency_p95_ms']:.0f} ms, max {requests['latency_max_ms']:.0f} ms")
+            if requests['rate_decreases']:
+                print(f"  Rate: {self._max_rate:g} req/s, lowest {requests['min_rate']:.2f}, "
+                      f"now {requests['current_rate']:.2f} ({requests['rate_decreases']} slowdowns)")
+        
         if self.stats['errors']:
             print(f"\n⚠️  Errors: {len(self.stats['errors'])}")
+            for error in self.stats['errors'][:5]:
+                where = error.get('shard') or error.get('endpoint')
+                print(f"  • {where} {error.get('status', '')}: {error['error'][:100]}")
     
     def test_connection(self) -> bool:
         """Test OpenAlex API connection"""
@@ -515,7 +1009,8 @@ class OpenAlexFetcher:
         try:
             params = {
                 'filter': 'institutions.country_code:ID',
-                'per-page': 1
+                'per-page': 1,
+                'select': ','.join(self.WORK_FIELDS)
             }
             
             data = self._make_request('works', params)
@@ -0,0 +1,236 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from .authors import AuthorResolver
+from .ingest import upsert_publications, UPSERT_BATCH_SIZE
+from .openalex_fetcher import OpenAlexFetcher
+
+# Raw pages buffered between fetch and parse, parsed pages between parse and load
+QUEUE_SIZE = 8
+
+# Parse/verify threads (JSON decoding happens in the fetch stage)
+PARSE_WORKERS = 2
+
+_DONE = object()
+
+class StageStats:
+    """Item count, busy time and input queue depth of one pipeline stage"""
+
+    def __init__(self, name: str, inbox: Optional[queue.Queue] = None):
+        self.name = name
+        self.inbox = inbox
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def sample_depth(self):
+        if self.inbox is None:
+            return
+        depth = self.inbox.qsize()
+        with self._lock:
+            self.depth_samples += 1
+            self.depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+
+    def record(self, items: int, seconds: float):
+        with self._lock:
+            self.items += items
+            self.busy_seconds += seconds
+
+    def as_dict(self, elapsed: float) -> Dict:
+        return {
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'items_per_second': round(self.items / elapsed, 1) if elapsed else 0.0,
+            'avg_queue_depth': round(self.depth_total / self.depth_samples, 2) if self.depth_samples else 0.0,
+            'max_queue_depth': self.max_depth,
+        }
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Blocking put (backpressure) that gives up once the pipeline stops"""
+    while True:
+        try:
+            q.put(item, timeout=0.2)
+            return True
+        except queue.Full:
+            if stop.is_set():
+                return False
+
+def _get(q: queue.Queue, stats: StageStats):
+    stats.sample_depth()
+    return q.get()
+
+def run_ingest_pipeline(
+    fetcher: OpenAlexFetcher,
+    db: Session,
+    limit: int,
+    year_from: int,
+    year_to: Optional[int] = None,
+    institutions: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    since_field: str = 'updated',
+    parse_workers: int = PARSE_WORKERS,
+    queue_size: int = QUEUE_SIZE,
+    batch_size: int = UPSERT_BATCH_SIZE,
+    resolver: Optional[AuthorResolver] = None,
+    on_batch: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Harvest and store publications as a streaming pipeline
+
+        fetch (1 thread) -> pages queue -> parse/verify (parse_workers
+        threads) -> parsed queue -> load (caller's thread, batched upserts)
+
+    Queues are bounded, so a slow stage blocks the ones before it: at most
+    `queue_size` pages per queue plus one upsert batch are held in memory,
+    whatever the limit, and throughput is set by the slowest stage.
+
+    Returns:
+        {'verified', 'written' (upsert counts), 'errors', 'elapsed_seconds',
+         'stages': per-stage items, throughput and queue depth}
+    """
+    resolver = resolver or AuthorResolver(db)
+    pages: queue.Queue = queue.Queue(maxsize=queue_size)
+    parsed: queue.Queue = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    lock = threading.Lock()
+    counters = {'verified': 0, 'parsers_left': parse_workers}
+    errors = []
+
+    fetch_stats = StageStats('fetch')
+    parse_stats = StageStats('parse', pages)
+    load_stats = StageStats('load', parsed)
+
+    def fetch():
+        try:
+            started = time.perf_counter()
+            for works, institution in fetcher.iter_work_pages(
+                limit=limit,
+                year_from=year_from,
+                year_to=year_to,
+                institutions=institutions,
+                fields=fields,
+                since=since,
+                since_field=since_field,
+                verified=lambda: counters['verified']
+            ):
+                fetch_stats.record(len(works), time.perf_counter() - started)
+                if stop.is_set() or not _put(pages, (works, institution), stop):
+                    break
+                started = time.perf_counter()
+        except Exception as e:
+            print(f"❌ Fetch stage failed: {e}")
+            errors.append({'stage': 'fetch', 'error': str(e)})
+        finally:
+            # Parsers drain the pages queue until they see this, so it always fits
+            for _ in range(parse_workers):
+                pages.put(_DONE)
+
+    def parse():
+        try:
+            while True:
+                item = _get(pages, parse_stats)
+                if item is _DONE:
+                    break
+                if stop.is_set():
+                    continue  # drain so the fetch stage can finish
+                started = time.perf_counter()
+                works, institution = item
+                try:
+                    pubs = fetcher.parse_page(works, institution, target_institutions=institutions)
+                except Exception as e:
+                    errors.append({'stage': 'parse', 'error': str(e)})
+                    continue
+                with lock:
+                    counters['verified'] += len(pubs)
+                parse_stats.record(len(works), time.perf_counter() - started)
+                if pubs:
+                    _put(parsed, pubs, stop)
+        finally:
+            with lock:
+                counters['parsers_left'] -= 1
+                last = counters['parsers_left'] == 0
+            if last:
+                parsed.put(_DONE)
+
+    threads = [threading.Thread(target=fetch, name='pipeline-fetch', daemon=True)]
+    threads += [
+        threading.Thread(target=parse, name=f'pipeline-parse-{i}', daemon=True)
+        for i in range(parse_workers)
+    ]
+
+    written = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'skipped': 0, 'near_duplicates': 0}
+    accepted = 0
+    buffer = []
+
+    def load(batch):
+        started = time.perf_counter()
+        result = upsert_publications(db, batch, batch_size=batch_size, resolver=resolver)
+        for key, value in result.items():
+            written[key] = written.get(key, 0) + value
+        fetcher.record_publications(batch)
+        load_stats.record(len(batch), time.perf_counter() - started)
+        print(f"  ⏩ loaded {load_stats.items} | queue depth: "
+              f"pages {pages.qsize()}/{queue_size}, parsed {parsed.qsize()}/{queue_size}")
+        if on_batch:
+            # May raise to abort the harvest (job cancellation)
+            on_batch({'loaded': load_stats.items, **written})
+
+    pipeline_started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = _get(parsed, load_stats)
+            if item is _DONE:
+                break
+            if accepted >= limit:
+                continue  # drain in-flight pages so the other stages can exit
+            item = item[:limit - accepted]
+            accepted += len(item)
+            buffer.extend(item)
+            if accepted >= limit:
+                stop.set()
+            if len(buffer) >= batch_size:
+                load(buffer)
+                buffer = []
+        if buffer:
+            load(buffer)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        # After a load failure keep draining so blocked stages can exit
+        while any(thread.is_alive() for thread in threads):
+            try:
+                parsed.get(timeout=0.2)
+            except queue.Empty:
+                pass
+
+    elapsed = time.perf_counter() - pipeline_started
+    fetcher.stats['indonesian_verified'] += counters['verified']
+
+    return {
+        'verified': accepted,
+        'written': written,
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 2),
+        'stages': {
+            s.name: s.as_dict(elapsed) for s in (fetch_stats, parse_stats, load_stats)
+        }
+    }
+
+def print_pipeline_report(result: Dict):
+    """Per-stage throughput and queue depth table"""
+    print(f"\n⏱️  Pipeline: {result['verified']} publications in {result['elapsed_seconds']}s")
+    print(f"  {'stage':8} {'items':>8} {'items/s':>9} {'busy s':>8} {'avg q':>6} {'max q':>6}")
+    for name, s in result['stages'].items():
+        print(f"  {name:8} {s['items']:8} {s['items_per_second']:9} {s['busy_seconds']:8} "
+              f"{s['avg_queue_depth']:6} {s['max_queue_depth']:6}")
@@ -0,0 +1,205 @@
+import json
+import numpy as np
+from typing import Dict, Optional
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import LatentDirichletAllocation
+from sqlalchemy.orm import Session
+from app.models import Publication, Topic, PublicationTopic
+from .analytics import refresh_analytics_snapshot
+from .counts import refresh_count_summary
+from .preprocessor import preprocess_text
+from .run_profiler import RunProfiler, describe_matrix
+from .similarity import build_similarity_index
+from .topic_modeling import assign_topics
+
+def retrain_topics(db: Session, profiler: Optional[RunProfiler] = None) -> Optional[Dict]:
+    """
+    Fit LDA on all publications with a substantial abstract, replace the
+    topics and publication_topics, and rebuild the similarity index
+    
+    Returns:
+        {'documents', 'topics', 'assignments'}, or None if there was not
+        enough text to train on
+    """
+    profiler = profiler or RunProfiler('topic_modeling')
+    
+    with profiler.stage('load') as stage:
+        # Get all publications with good abstracts
+        publications = db.query(Publication).filter(
+            Publication.abstract != None,
+            Publication.abstract != '',
+            Publication.abstract != 'No abstract available'
+        ).all()
+        
+        # Filter only publications with substantial abstracts
+        publications = [p for p in publications if len(p.abstract) > 100]
+        stage['publications'] = len(publications)
+    
+    if len(publications) < 10:
+        print("❌ Not enough publications for topic modeling (need at least 10 with good abstracts)")
+        return None
+    
+    print(f"  Processing {len(publications)} publications...")
+    
+    # Prepare documents - combine title and abstract
+    documents = []
+    pub_ids = []
+    
+    for pub in publications:
+        # Combine title (weighted more) and abstract
+        text = f"{pub.title} {pub.title} {pub.abstract}"
+        documents.append(text)
+        pub_ids.append(pub.id)
+    
+    # Preprocess
+    print("  Preprocessing texts...")
+    with profiler.stage('preprocess', documents=len(documents)) as stage:
+        cleaned_docs = [preprocess_text(doc) for doc in documents]
+        
+        # Remove empty docs
+        valid_docs = []
+        valid_pub_ids = []
+        for i, doc in enumerate(cleaned_docs):
+            if len(doc.split()) >= 10:  # At least 10 words
+                valid_docs.append(doc)
+                valid_pub_ids.append(pub_ids[i])
+        stage['valid_documents'] = len(valid_docs)
+    
+    if len(valid_docs) < 10:
+        print(f"❌ Not enough valid documents after preprocessing ({len(valid_docs)})")
+        return None
+    
+    print(f"  Valid documents: {len(valid_docs)}")
+    
+    # Vectorize with better parameters
+    print("  Vectorizing...")
+    vectorizer = TfidfVectorizer(
+        max_features=500,
+        min_df=2,
+        max_df=0.7,
+        ngram_range=(1, 2),
+        stop_words='english'
+    )
+    
+    try:
+        with profiler.stage('vectorize') as stage:
+            tfidf = vectorizer.fit_transform(valid_docs)
+            stage['tfidf'] = describe_matrix(tfidf)
+    except ValueError as e:
+        print(f"❌ Vectorization error: {e}")
+        return None
+    
+    # Dynamic topic count
+    n_topics = min(12, max(5, len(valid_docs) // 15))
+    
+    print(f"  Training LDA with {n_topics} topics...")
+    
+    # Use LDA instead of NMF for better results
+    lda = LatentDirichletAllocation(
+        n_components=n_topics,
+        max_iter=50,
+        learning_method='online',
+        random_state=42,
+        n_jobs=-1
+    )
+    
+    with profiler.stage('fit_lda', n_topics=n_topics) as stage:
+        doc_topics = lda.fit_transform(tfidf)
+        stage['iterations'] = lda.n_iter_
+        stage['doc_topics'] = describe_matrix(doc_topics)
+    
+    with profiler.stage('write_topics') as stage:
+        # Clear old topics
+        db.query(PublicationTopic).delete()
+        db.query(Topic).delete()
+        db.commit()
+        
+        # Extract and save topics
+        feature_names = vectorizer.get_feature_names_out()
+        
+        print(f"\n  📋 Discovered Topics:")
+        
+        topic_ids = []
+        for topic_idx, topic in enumerate(lda.components_):
+            # Get top keywords
+            top_indices = topic.argsort()[-10:][::-1]
+            top_keywords = [feature_names[i] for i in top_indices]
+            top_weights = topic[top_indices]
+            
+            # Filter out common/generic words
+            filtered_keywords = []
+            for kw in top_keywords:
+                if len(kw) > 3 and kw not in ['data', 'study', 'research', 'analysis', 'results']:
+                    filtered_keywords.append(kw)
+            
+            if len(filtered_keywords) < 3:
+                filtered_keywords = top_keywords[:5]
+            
+            # Create descriptive name
+            descriptive_name = ' / '.join(filtered_keywords[:3]).title()
+            
+            print(f"    Topic {topic_idx + 1}: {', '.join(filtered_keywords[:5])}")
+            
+            topic_obj = Topic(
+                name=descriptive_name[:100],  # Limit length
+                keywords=json.dumps(filtered_keywords[:10])
+            )
+            db.add(topic_obj)
+            db.flush()
+            topic_ids.append(topic_obj.id)
+        
+        # Assign publications to topics
+        assignments = assign_topics(doc_topics, valid_pub_ids, topic_ids, threshold=0.05)
+        db.bulk_insert_mappings(PublicationTopic, assignments)
+        
+        db.commit()
+        stage['assignments'] = len(assignments)
+    print(f"\n✅ Created {n_topics} topics with LDA")
+    
+    # Rebuild related-publications index (topic mix + reduced TF-IDF)
+    with profiler.stage('similarity_index'):
+        build_similarity_index(valid_pub_ids, doc_topics, tfidf=tfidf)
+    
+    # New topics and assignments for the trend / stats aggregates
+    with profiler.stage('analytics_snapshot'):
+        refresh_analytics_snapshot(db, topics=True)
+    
+    return {'documents': len(valid_docs), 'topics': n_topics, 'assignments': len(assignments)}
+
+def rebuild_indexes(db: Session, profiler: Optional[RunProfiler] = None) -> Dict:
+    """
+    Refresh the count summary and analytics snapshot and rebuild the
+    similarity index from the stored topic weights, without retraining
+    
+    The index is built from publication_topics alone (no TF-IDF part), so
+    it is a cheaper, coarser index than the one retrain_topics writes.
+    """
+    profiler = profiler or RunProfiler('reindex')
+    
+    with profiler.stage('count_summary'):
+        refresh_count_summary(db)
+    
+    # Full rewrite: also picks up edited and merged rows, which appends miss
+    with profiler.stage('analytics_snapshot'):
+        refresh_analytics_snapshot(db, full=True)
+    
+    with profiler.stage('load_topic_weights') as stage:
+        rows = db.query(
+            PublicationTopic.publication_id, PublicationTopic.topic_id, PublicationTopic.probability
+        ).filter(PublicationTopic.probability != None).all()
+        stage['rows'] = len(rows)
+    
+    if not rows:
+        print("❌ No topic assignments yet, similarity index not rebuilt")
+        return {'documents': 0}
+    
+    pub_ids, rows_of = np.unique([r[0] for r in rows], return_inverse=True)
+    topic_ids, cols_of = np.unique([r[1] for r in rows], return_inverse=True)
+    doc_topics = np.zeros((len(pub_ids), len(topic_ids)))
+    doc_topics[rows_of, cols_of] = [r[2] for r in rows]
+    
+    with profiler.stage('similarity_index') as stage:
+        stage['doc_topics'] = describe_matrix(doc_topics)
+        build_similarity_index(pub_ids.tolist(), doc_topics)
+    
+    return {'documents': len(pub_ids), 'topics': len(topic_ids)}
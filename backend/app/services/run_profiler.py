@@ -0,0 +1,185 @@
+"""
+Per-stage profiling of batch runs (topic modeling)
+
+Each stage records wall time, CPU time (all threads of this process), RSS
+before/after, the process peak RSS and how much the stage raised it, plus
+whatever the caller attaches - typically matrix shapes and density. The run
+report is written as JSON and summarised into an append-only history so
+nightly runs can be compared.
+"""
+import json
+import os
+import platform
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import scipy.sparse as sp
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+HISTORY_FILE = "history.jsonl"
+
+def _mib(n_bytes: float) -> float:
+    return round(n_bytes / 2**20, 1)
+
+def current_rss_mib() -> Optional[float]:
+    """Resident set size right now (Linux /proc), None elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            return _mib(int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE'))
+    except (OSError, ValueError, IndexError):
+        return None
+
+def peak_rss_mib() -> Optional[float]:
+    """High-water RSS of the process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return _mib(peak if platform.system() == 'Darwin' else peak * 1024)
+
+def describe_matrix(matrix) -> Dict:
+    """Shape, stored values, density and memory of a dense or sparse matrix"""
+    rows, cols = matrix.shape
+    if sp.issparse(matrix):
+        nnz = matrix.nnz
+        n_bytes = sum(getattr(matrix, a).nbytes for a in ('data', 'indices', 'indptr') if hasattr(matrix, a))
+    else:
+        nnz = int(np.count_nonzero(matrix))
+        n_bytes = matrix.nbytes
+    return {
+        'shape': [rows, cols],
+        'nnz': nnz,
+        'density': round(nnz / (rows * cols), 6) if rows and cols else 0.0,
+        'dtype': str(matrix.dtype),
+        'mib': _mib(n_bytes),
+    }
+
+class RunProfiler:
+    """
+    Collects one record per stage of a run
+
+        profiler = RunProfiler('topic_modeling')
+        with profiler.stage('vectorize') as stage:
+            tfidf = vectorizer.fit_transform(docs)
+            stage['tfidf'] = describe_matrix(tfidf)
+
+    `on_stage(name)` is called before each stage starts (job heartbeat and
+    cancellation point, see app/services/jobs.py).
+    """
+
+    def __init__(self, run: str, on_stage: Optional[Callable[[str], None]] = None, **meta):
+        self.run = run
+        self.on_stage = on_stage
+        self.meta = dict(meta)
+        self.stages: List[Dict] = []
+        self.started_at = datetime.now(timezone.utc)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str, **info):
+        """Time the block; keys set on the yielded dict are stored with it"""
+        if self.on_stage:
+            self.on_stage(name)
+        record = {'stage': name, **info}
+        rss_before = current_rss_mib()
+        peak_before = peak_rss_mib()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            peak_after = peak_rss_mib()
+            record.update({
+                'wall_seconds': round(time.perf_counter() - wall, 3),
+                'cpu_seconds': round(time.process_time() - cpu, 3),
+                'rss_before_mib': rss_before,
+                'rss_after_mib': current_rss_mib(),
+                'peak_rss_mib': peak_after,
+                # Only non-zero when this stage set a new process high-water mark
+                'peak_rss_growth_mib': round(peak_after - peak_before, 1) if peak_after is not None else None,
+            })
+            self.stages.append(record)
+
+    def report(self) -> Dict:
+        return {
+            'run': self.run,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'wall_seconds': round(time.perf_counter() - self._wall, 3),
+            'cpu_seconds': round(time.process_time() - self._cpu, 3),
+            'peak_rss_mib': peak_rss_mib(),
+            'machine': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+            },
+            'meta': self.meta,
+            'stages': self.stages,
+        }
+
+def _summary(report: Dict) -> Dict:
+    """One history line: totals plus wall/CPU/peak per stage"""
+    return {
+        'run': report['run'],
+        'started_at': report['started_at'],
+        'wall_seconds': report['wall_seconds'],
+        'cpu_seconds': report['cpu_seconds'],
+        'peak_rss_mib': report['peak_rss_mib'],
+        'meta': report['meta'],
+        'stages': {
+            s['stage']: {k: s[k] for k in ('wall_seconds', 'cpu_seconds', 'peak_rss_mib')}
+            for s in report['stages']
+        },
+    }
+
+def load_history(run: str, profile_dir: str = PROFILE_DIR) -> List[Dict]:
+    """Summaries of earlier runs named `run`, oldest first"""
+    path = os.path.join(profile_dir, HISTORY_FILE)
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return [e for e in entries if e['run'] == run]
+
+def save_report(report: Dict, profile_dir: str = PROFILE_DIR) -> str:
+    """Write the full JSON report and append its summary to the history"""
+    os.makedirs(profile_dir, exist_ok=True)
+    stamp = report['started_at'].replace(':', '').replace('-', '')[:15]
+    path = os.path.join(profile_dir, f"{report['run']}-{stamp}.json")
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    with open(os.path.join(profile_dir, HISTORY_FILE), 'a') as f:
+        f.write(json.dumps(_summary(report)) + '\n')
+    return path
+
+def _change(now: float, before: Optional[float]) -> str:
+    if not before:
+        return ''
+    return f"{(now - before) / before:+.0%}"
+
+def print_profile_report(report: Dict, previous: Optional[Dict] = None):
+    """Per-stage table, with wall-time change against the previous run"""
+    print(f"\n⏱️  {report['run']}: {report['wall_seconds']}s wall, {report['cpu_seconds']}s CPU, "
+          f"peak RSS {report['peak_rss_mib']} MiB")
+    earlier = previous['stages'] if previous else {}
+    print(f"  {'stage':18} {'wall s':>8} {'cpu s':>8} {'peak MiB':>9} {'+peak':>6} {'vs last':>8}")
+    for s in report['stages']:
+        before = earlier.get(s['stage'], {}).get('wall_seconds')
+        print(f"  {s['stage']:18} {s['wall_seconds']:8} {s['cpu_seconds']:8} "
+              f"{s['peak_rss_mib'] or '-':>9} {s['peak_rss_growth_mib'] or 0:6} "
+              f"{_change(s['wall_seconds'], before):>8}")
+        for key, value in s.items():
+            if isinstance(value, dict) and 'shape' in value:
+                print(f"    {key}: {value['shape'][0]}x{value['shape'][1]}, "
+                      f"density {value['density']}, {value['mib']} MiB")
+    if previous:
+        print(f"  previous run {previous['started_at']}: {previous['wall_seconds']}s "
+              f"({_change(report['wall_seconds'], previous['wall_seconds'])})")
@@ -0,0 +1,188 @@
+import os
+import json
+import shutil
+import time
+import threading
+import numpy as np
+from typing import List, Optional, Tuple
+
+# Where the memory-mapped vector index lives
+INDEX_DIR = os.getenv("SIMILARITY_INDEX_DIR", "data/similarity")
+
+# Share of the cosine score coming from the topic distribution when a
+# TF-IDF embedding is concatenated (the rest comes from the embedding)
+TOPIC_WEIGHT = 0.7
+
+# Reduced TF-IDF embedding size
+EMBEDDING_DIM = 64
+
+# Rows scored per chunk; bounds scratch memory on very large indexes
+CHUNK_SIZE = 262144
+
+# Old index versions kept on disk next to the current one
+KEEP_VERSIONS = 2
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+def _reduce_tfidf(tfidf, dim: int) -> Optional[np.ndarray]:
+    """Project a sparse TF-IDF matrix to `dim` dense components (LSA)"""
+    from sklearn.decomposition import TruncatedSVD
+
+    n_components = min(dim, tfidf.shape[1] - 1, tfidf.shape[0] - 1)
+    if n_components < 2:
+        return None
+
+    svd = TruncatedSVD(n_components=n_components, random_state=42)
+    return svd.fit_transform(tfidf)
+
+def build_vectors(doc_topics: np.ndarray, tfidf=None, embedding_dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Build unit-length float32 vectors for cosine similarity
+
+    The topic distribution and the optional reduced TF-IDF embedding are
+    normalized separately and scaled by sqrt(weight), so the dot product of
+    two vectors is TOPIC_WEIGHT * cos(topics) + (1 - TOPIC_WEIGHT) * cos(embedding).
+    """
+    vectors = _normalize_rows(np.asarray(doc_topics, dtype=np.float64))
+
+    embedding = _reduce_tfidf(tfidf, embedding_dim) if tfidf is not None else None
+    if embedding is not None:
+        vectors = np.hstack([
+            vectors * np.sqrt(TOPIC_WEIGHT),
+            _normalize_rows(embedding) * np.sqrt(1 - TOPIC_WEIGHT)
+        ])
+        vectors = _normalize_rows(vectors)
+
+    return vectors.astype(np.float32)
+
+def build_similarity_index(
+    pub_ids: List[int],
+    doc_topics: np.ndarray,
+    tfidf=None,
+    index_dir: str = INDEX_DIR
+) -> str:
+    """
+    Write a new index version and atomically switch CURRENT to it
+
+    Layout:
+        <index_dir>/<version>/vectors.npy  float32 (n_docs, dim), memory-mapped on load
+        <index_dir>/<version>/row_ids.npy  int64 publication id of each row
+        <index_dir>/<version>/ids.npy      int64 publication ids, sorted
+        <index_dir>/<version>/rows.npy     int64 row in vectors.npy for each sorted id
+        <index_dir>/CURRENT                name of the live version
+
+    Readers never see a partially written index: the version directory is
+    complete before CURRENT is replaced with os.replace().
+    """
+    if len(pub_ids) != len(doc_topics):
+        raise ValueError("pub_ids and doc_topics must have the same length")
+
+    vectors = build_vectors(doc_topics, tfidf)
+    ids = np.asarray(pub_ids, dtype=np.int64)
+    order = np.argsort(ids, kind='stable')
+
+    version = f"v{time.time_ns()}"
+    version_dir = os.path.join(index_dir, version)
+    os.makedirs(version_dir)
+
+    np.save(os.path.join(version_dir, 'vectors.npy'), vectors)
+    np.save(os.path.join(version_dir, 'row_ids.npy'), ids)
+    np.save(os.path.join(version_dir, 'ids.npy'), ids[order])
+    np.save(os.path.join(version_dir, 'rows.npy'), order.astype(np.int64))
+    with open(os.path.join(version_dir, 'meta.json'), 'w') as f:
+        json.dump({'n_docs': int(vectors.shape[0]), 'dim': int(vectors.shape[1])}, f)
+
+    pointer_tmp = os.path.join(index_dir, f"CURRENT.{os.getpid()}.tmp")
+    with open(pointer_tmp, 'w') as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(index_dir, 'CURRENT'))
+
+    _remove_old_versions(index_dir, keep=version)
+
+    print(f"✓ Similarity index built: {vectors.shape[0]} docs x {vectors.shape[1]} dims")
+    return version
+
+def _remove_old_versions(index_dir: str, keep: str):
+    versions = sorted(
+        d for d in os.listdir(index_dir)
+        if d.startswith('v') and os.path.isdir(os.path.join(index_dir, d))
+    )
+    previous = [v for v in versions if v != keep]
+    for version in previous[:max(0, len(previous) - (KEEP_VERSIONS - 1))]:
+        shutil.rmtree(os.path.join(index_dir, version), ignore_errors=True)
+
+class SimilarityIndex:
+    """Read-only, memory-mapped view of one index version"""
+
+    def __init__(self, version_dir: str):
+        self.version_dir = version_dir
+        self.vectors = np.load(os.path.join(version_dir, 'vectors.npy'), mmap_mode='r')
+        self.row_ids = np.load(os.path.join(version_dir, 'row_ids.npy'), mmap_mode='r')
+        self.ids = np.load(os.path.join(version_dir, 'ids.npy'), mmap_mode='r')
+        self.rows = np.load(os.path.join(version_dir, 'rows.npy'), mmap_mode='r')
+
+    def __len__(self) -> int:
+        return self.vectors.shape[0]
+
+    def row_of(self, pub_id: int) -> Optional[int]:
+        pos = int(np.searchsorted(self.ids, pub_id))
+        if pos < len(self.ids) and self.ids[pos] == pub_id:
+            return int(self.rows[pos])
+        return None
+
+    def related(self, pub_id: int, k: int = 10) -> Optional[List[Tuple[int, float]]]:
+        """
+        Top-k most similar publications by cosine similarity
+
+        Returns None if `pub_id` is not in the index.
+        """
+        row = self.row_of(pub_id)
+        if row is None:
+            return None
+
+        query = np.asarray(self.vectors[row])
+
+        # Score in chunks, keeping only k+1 candidates per chunk
+        best_rows = []
+        best_scores = []
+        for start in range(0, len(self), CHUNK_SIZE):
+            scores = self.vectors[start:start + CHUNK_SIZE] @ query
+            take = min(k + 1, len(scores))
+            top = np.argpartition(scores, -take)[-take:]
+            best_rows.append(top + start)
+            best_scores.append(scores[top])
+
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+
+        keep = rows != row
+        rows, scores = rows[keep], scores[keep]
+
+        take = min(k, len(scores))
+        if take == 0:
+            return []
+        top = np.argpartition(scores, -take)[-take:]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        return [(int(self.row_ids[rows[i]]), float(scores[i])) for i in top]
+
+_lock = threading.Lock()
+_loaded: dict = {}
+
+def get_similarity_index(index_dir: str = INDEX_DIR) -> Optional[SimilarityIndex]:
+    """Return the live index, reloading when CURRENT points to a new version"""
+    try:
+        with open(os.path.join(index_dir, 'CURRENT')) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        return None
+
+    with _lock:
+        index = _loaded.get(index_dir)
+        if index is None or os.path.basename(index.version_dir) != version:
+            index = SimilarityIndex(os.path.join(index_dir, version))
+            _loaded[index_dir] = index
+        return index
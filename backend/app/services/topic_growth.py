@@ -0,0 +1,154 @@
+"""
+Topic growth and emerging-topic ranking
+
+The (year, topic, count) trend rows are pivoted into a topics x years
+matrix and every figure is computed for all topics at once:
+
+    share           count / all topic assignments of that year
+    growth          year-over-year change of the count
+    moving_average  mean count over the last `window` years
+    share_change    mean share of the last `window` years minus the mean
+                    share of the `window` years before (percentage points)
+
+Topics are ranked by share_change: a topic that grows only as fast as the
+whole corpus is not emerging, and shares are not distorted by a partially
+harvested current year the way raw counts are.
+
+Results are cached per data version (analytics snapshot version, or the id
+high-water marks of the database), so the matrix is rebuilt only after
+ingestion or a retrain.
+"""
+import threading
+import warnings
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import numpy as np
+
+# Entries kept for the current data version (window / limit combinations)
+CACHE_SIZE = 64
+
+_lock = threading.Lock()
+_cache_version: Optional[str] = None
+_cache: Dict[tuple, Dict] = {}
+
+def trend_matrix(rows: Iterable[Tuple[int, str, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pivot trend rows into counts[topic, year] over a contiguous year range
+
+    Returns:
+        (topic names, years, counts) - years without rows are zero columns
+    """
+    rows = list(rows)
+    if not rows:
+        return np.array([], dtype=object), np.array([], dtype=np.int64), np.zeros((0, 0))
+
+    years = np.array([r[0] for r in rows], dtype=np.int64)
+    topics, topic_rows = np.unique(np.array([r[1] for r in rows], dtype=object), return_inverse=True)
+    span = np.arange(years.min(), years.max() + 1)
+
+    counts = np.zeros((len(topics), len(span)))
+    np.add.at(counts, (topic_rows, years - span[0]), np.array([r[2] for r in rows], dtype=np.float64))
+    return topics, span, counts
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """numerator / denominator, NaN where the denominator is 0"""
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+def _round(value: float, digits: int = 4) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), digits)
+
+def compute_growth(
+    rows: Iterable[Tuple[int, str, int]],
+    window: int = 3,
+    limit: int = 10,
+    min_publications: int = 5
+) -> Dict:
+    """
+    Rank topics by the change of their share of output between the last
+    `window` years and the `window` years before
+
+    Args:
+        min_publications: Topics with fewer assignments in the recent window
+            are left out (a jump from 1 to 3 is noise, not a trend)
+    """
+    topics, years, counts = trend_matrix(rows)
+    result = {'years': [], 'recent_years': [], 'previous_years': [], 'window': window, 'topics': []}
+    if not len(years):
+        return result
+
+    window = min(window, len(years))
+    recent = slice(len(years) - window, len(years))
+    previous = slice(max(len(years) - 2 * window, 0), len(years) - window)
+
+    share = _ratio(counts, counts.sum(axis=0))
+    share = np.nan_to_num(share)  # years without any assignment
+    growth = _ratio(counts[:, 1:] - counts[:, :-1], counts[:, :-1])
+
+    cumulative = np.cumsum(np.pad(counts, ((0, 0), (1, 0))), axis=1)
+    moving_average = (cumulative[:, window:] - cumulative[:, :-window]) / window
+
+    recent_share = share[:, recent].mean(axis=1)
+    previous_share = share[:, previous].mean(axis=1) if previous.stop > previous.start else np.full(len(topics), np.nan)
+    share_change = recent_share - np.nan_to_num(previous_share)
+    recent_publications = counts[:, recent].sum(axis=1)
+
+    # Mean YoY growth into each year of the recent window (years after a zero
+    # count have no growth and are skipped; all-NaN rows stay NaN)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        average_growth = np.nanmean(growth[:, max(recent.start - 1, 0):], axis=1)
+
+    eligible = np.flatnonzero(recent_publications >= min_publications)
+    # Largest share gain first; ties by recent output
+    order = eligible[np.lexsort((-recent_publications[eligible], -share_change[eligible]))][:limit]
+
+    shown = slice(previous.start, recent.stop)
+    result.update({
+        'years': [int(years[0]), int(years[-1])],
+        'recent_years': [int(years[recent.start]), int(years[-1])],
+        'previous_years': [int(years[previous.start]), int(years[previous.stop - 1])] if previous.stop > previous.start else [],
+        'window': window,
+        'topics': [
+            {
+                'rank': rank,
+                'topic': str(topics[i]),
+                'share_change': _round(share_change[i] * 100, 2),
+                'recent_share': _round(recent_share[i] * 100, 2),
+                'previous_share': _round(previous_share[i] * 100, 2),
+                'publications': int(recent_publications[i]),
+                'growth': _round(growth[i, -1]) if growth.shape[1] else None,
+                'average_growth': _round(average_growth[i]),
+                'moving_average': _round(moving_average[i, -1], 2),
+                'counts': {int(y): int(c) for y, c in zip(years[shown], counts[i, shown])},
+            }
+            for rank, i in enumerate(order, 1)
+        ],
+    })
+    return result
+
+def emerging_topics(
+    version: str,
+    load_rows: Callable[[], Iterable[Tuple[int, str, int]]],
+    window: int = 3,
+    limit: int = 10,
+    min_publications: int = 5
+) -> Dict:
+    """compute_growth() over `load_rows()`, cached until the data version changes"""
+    global _cache_version
+    key = (window, limit, min_publications)
+    with _lock:
+        if _cache_version == version and key in _cache:
+            return _cache[key]
+
+    result = compute_growth(load_rows(), window, limit, min_publications)
+    result['version'] = version
+
+    with _lock:
+        if _cache_version != version:
+            _cache_version = version
+            _cache.clear()
+        if len(_cache) >= CACHE_SIZE:
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = result
+    return result
@@ -1,24 +1,29 @@
 from sklearn.decomposition import NMF
 from sklearn.feature_extraction.text import TfidfVectorizer
 from .preprocessor import preprocess_text
+from .run_profiler import RunProfiler, describe_matrix
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
-def train_topic_model(documents: List[str], n_topics: int = 10) -> Tuple:
+def train_topic_model(documents: List[str], n_topics: int = 10,
+                      profiler: Optional[RunProfiler] = None) -> Tuple:
     """
     Train NMF topic model
     
     Args:
         documents: List of text documents
         n_topics: Number of topics to extract
+        profiler: Records per-stage time, memory and matrix sizes
     
     Returns:
         (model, doc_topics, topics_keywords)
     """
     print(f"Training topic model with {n_topics} topics on {len(documents)} documents...")
+    profiler = profiler or RunProfiler('train_topic_model')
     
     # Preprocess documents
-    cleaned_docs = [preprocess_text(doc) for doc in documents]
+    with profiler.stage('preprocess', documents=len(documents)):
+        cleaned_docs = [preprocess_text(doc) for doc in documents]
     
     # Vectorize with TF-IDF
     vectorizer = TfidfVectorizer(
@@ -28,7 +33,9 @@ def train_topic_model(documents: List[str], n_topics: int = 10) -> Tuple:
         ngram_range=(1, 2)
     )
     
-    tfidf = vectorizer.fit_transform(cleaned_docs)
+    with profiler.stage('vectorize') as stage:
+        tfidf = vectorizer.fit_transform(cleaned_docs)
+        stage['tfidf'] = describe_matrix(tfidf)
     
     # Train NMF
     nmf = NMF(
@@ -40,7 +47,10 @@ def train_topic_model(documents: List[str], n_topics: int = 10) -> Tuple:
         l1_ratio=0.5
     )
     
-    doc_topics = nmf.fit_transform(tfidf)
+    with profiler.stage('fit_nmf', n_topics=n_topics) as stage:
+        doc_topics = nmf.fit_transform(tfidf)
+        stage['iterations'] = nmf.n_iter_
+        stage['doc_topics'] = describe_matrix(doc_topics)
     
     # Extract keywords per topic
     feature_names = vectorizer.get_feature_names_out()
@@ -58,4 +68,26 @@ def train_topic_model(documents: List[str], n_topics: int = 10) -> Tuple:
         
         print(f"  Topic {topic_idx + 1}: {', '.join(keywords[:5])}")
     
-    return nmf, doc_topics, topics_keywords
\ No newline at end of file
+    return nmf, doc_topics, topics_keywords
+
+def assign_topics(doc_topics: np.ndarray, pub_ids: List[int], topic_ids: List[int],
+                  threshold: float) -> List[Dict]:
+    """
+    Publication-topic rows for every weight above threshold
+
+    Args:
+        doc_topics: (n_documents, n_topics) matrix from the topic model
+        pub_ids: Publication id of each row
+        topic_ids: Topic id of each column
+
+    Returns:
+        PublicationTopic mappings, ready for bulk_insert_mappings
+    """
+    rows, cols = np.nonzero(doc_topics > threshold)
+    probabilities = doc_topics[rows, cols].tolist()
+    pub_ids = np.asarray(pub_ids)[rows].tolist()
+    topic_ids = np.asarray(topic_ids)[cols].tolist()
+    return [
+        {'publication_id': p, 'topic_id': t, 'probability': round(prob, 4)}
+        for p, t, prob in zip(pub_ids, topic_ids, probabilities)
+    ]
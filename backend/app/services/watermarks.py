@@ -0,0 +1,51 @@
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Sequence
+from sqlalchemy.orm import Session
+from app.models import HarvestWatermark
+
+def harvest_query_key(
+    year_from: int,
+    year_to: Optional[int] = None,
+    institutions: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None
+) -> str:
+    """Stable identifier of a harvest query (everything except the date window)"""
+    parts = [
+        'country:ID',
+        f"years:{year_from}-{year_to or 'now'}",
+        f"inst:{','.join(sorted(institutions or []))}",
+        f"fields:{','.join(sorted(fields or []))}",
+    ]
+    return '|'.join(parts)
+
+def harvest_complete(stats: Dict, errors: Sequence = ()) -> bool:
+    """
+    Whether a harvest fetched its whole window, i.e. may advance the watermark
+
+    Failed requests (fetcher `stats['errors']`, pipeline `errors`) and shards
+    stopped early leave works of the window unfetched; an incremental run
+    starting after the window would skip them for good.
+    """
+    return not errors and not stats['errors'] and not stats.get('incomplete_shards')
+
+def get_watermark(db: Session, query_key: str) -> Optional[date]:
+    """Date from which the next incremental run should fetch, or None"""
+    row = db.query(HarvestWatermark).filter(
+        HarvestWatermark.query_key == query_key
+    ).first()
+    return row.watermark if row else None
+
+def set_watermark(db: Session, query_key: str, watermark: date, fetched: int = 0):
+    """Store the watermark after a successful run"""
+    row = db.query(HarvestWatermark).filter(
+        HarvestWatermark.query_key == query_key
+    ).first()
+
+    if not row:
+        row = HarvestWatermark(query_key=query_key)
+        db.add(row)
+
+    row.watermark = watermark
+    row.last_run_at = datetime.now(timezone.utc).replace(tzinfo=None)
+    row.last_fetched = fetched
+    db.commit()
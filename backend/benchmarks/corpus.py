@@ -0,0 +1,271 @@
+"""
+Deterministic synthetic corpus of Indonesian research publications
+
+Shared by the benchmark suite and scripts/generate_synthetic_data.py.
+Documents are generated in vectorized blocks, so millions of documents
+take seconds to minutes rather than hours.
+"""
+import numpy as np
+from typing import Dict, Iterator, List
+
+# (domain, relative popularity): bias towards health / agriculture like SINTA
+DOMAINS = [
+    ('health', 0.22), ('agriculture', 0.18), ('computing', 0.16), ('education', 0.12),
+    ('energy', 0.08), ('disaster', 0.07), ('marine', 0.06), ('economics', 0.06),
+    ('environment', 0.05),
+]
+
+DOMAIN_TERMS = {
+    'health': {
+        'en': ['patient', 'hospital', 'stunting', 'tuberculosis', 'dengue', 'vaccine', 'malaria',
+               'maternal', 'nutrition', 'diabetes', 'hypertension', 'clinical', 'infection',
+               'immunization', 'puskesmas', 'mortality', 'anemia', 'covid', 'therapy', 'diagnosis'],
+        'id': ['pasien', 'rumah', 'sakit', 'stunting', 'tuberkulosis', 'demam', 'berdarah', 'vaksin',
+               'ibu', 'hamil', 'gizi', 'balita', 'diabetes', 'hipertensi', 'klinis', 'infeksi',
+               'imunisasi', 'puskesmas', 'kematian', 'anemia', 'pengobatan', 'diagnosis'],
+    },
+    'agriculture': {
+        'en': ['rice', 'paddy', 'yield', 'irrigation', 'fertilizer', 'palm', 'oil', 'cocoa',
+               'coffee', 'soil', 'crop', 'harvest', 'farmer', 'pest', 'seed', 'cassava', 'maize',
+               'plantation', 'drought', 'productivity'],
+        'id': ['padi', 'sawah', 'hasil', 'panen', 'irigasi', 'pupuk', 'kelapa', 'sawit', 'kakao',
+               'kopi', 'tanah', 'tanaman', 'petani', 'hama', 'benih', 'singkong', 'jagung',
+               'perkebunan', 'kekeringan', 'produktivitas'],
+    },
+    'computing': {
+        'en': ['deep', 'learning', 'neural', 'network', 'classification', 'sentiment', 'image',
+               'detection', 'algorithm', 'dataset', 'accuracy', 'model', 'prediction', 'system',
+               'information', 'mobile', 'application', 'clustering', 'optimization', 'transformer'],
+        'id': ['pembelajaran', 'mesin', 'jaringan', 'saraf', 'klasifikasi', 'sentimen', 'citra',
+               'deteksi', 'algoritma', 'data', 'akurasi', 'model', 'prediksi', 'sistem',
+               'informasi', 'aplikasi', 'berbasis', 'android', 'klasterisasi', 'optimasi'],
+    },
+    'education': {
+        'en': ['students', 'learning', 'teacher', 'curriculum', 'school', 'online', 'literacy',
+               'mathematics', 'motivation', 'assessment', 'university', 'pedagogy', 'achievement',
+               'classroom', 'elementary', 'vocational'],
+        'id': ['siswa', 'pembelajaran', 'guru', 'kurikulum', 'sekolah', 'daring', 'literasi',
+               'matematika', 'motivasi', 'penilaian', 'mahasiswa', 'pendidikan', 'prestasi',
+               'kelas', 'dasar', 'kejuruan', 'merdeka', 'belajar'],
+    },
+    'energy': {
+        'en': ['solar', 'photovoltaic', 'biomass', 'geothermal', 'electricity', 'grid', 'battery',
+               'renewable', 'biodiesel', 'efficiency', 'turbine', 'hydropower', 'emission'],
+        'id': ['surya', 'panel', 'biomassa', 'panas', 'bumi', 'listrik', 'baterai', 'terbarukan',
+               'biodiesel', 'efisiensi', 'turbin', 'pembangkit', 'emisi', 'energi'],
+    },
+    'disaster': {
+        'en': ['earthquake', 'tsunami', 'volcano', 'eruption', 'flood', 'landslide', 'risk',
+               'mitigation', 'vulnerability', 'seismic', 'evacuation', 'hazard'],
+        'id': ['gempa', 'bumi', 'tsunami', 'gunung', 'api', 'erupsi', 'banjir', 'longsor', 'risiko',
+               'mitigasi', 'kerentanan', 'seismik', 'evakuasi', 'bencana'],
+    },
+    'marine': {
+        'en': ['coral', 'reef', 'fisheries', 'mangrove', 'seaweed', 'coastal', 'aquaculture',
+               'shrimp', 'tuna', 'ocean', 'seagrass', 'plankton'],
+        'id': ['terumbu', 'karang', 'perikanan', 'mangrove', 'rumput', 'laut', 'pesisir',
+               'budidaya', 'udang', 'tuna', 'lamun', 'plankton', 'nelayan'],
+    },
+    'economics': {
+        'en': ['msme', 'tourism', 'village', 'fund', 'poverty', 'inflation', 'export', 'fiscal',
+               'banking', 'islamic', 'finance', 'market', 'growth', 'investment'],
+        'id': ['umkm', 'pariwisata', 'desa', 'dana', 'kemiskinan', 'inflasi', 'ekspor', 'fiskal',
+               'perbankan', 'syariah', 'keuangan', 'pasar', 'pertumbuhan', 'investasi'],
+    },
+    'environment': {
+        'en': ['peatland', 'deforestation', 'forest', 'fire', 'biodiversity', 'waste', 'plastic',
+               'water', 'quality', 'river', 'pollution', 'carbon', 'climate'],
+        'id': ['gambut', 'deforestasi', 'hutan', 'kebakaran', 'keanekaragaman', 'hayati', 'sampah',
+               'plastik', 'air', 'kualitas', 'sungai', 'pencemaran', 'karbon', 'iklim'],
+    },
+}
+
+REGIONS = ['Java', 'Sumatra', 'Kalimantan', 'Sulawesi', 'Papua', 'Bali', 'Aceh', 'Lombok',
+           'Yogyakarta', 'Bandung', 'Surabaya', 'Jakarta', 'Makassar', 'Riau', 'Maluku']
+
+ACADEMIC = {
+    'en': ['analysis', 'study', 'effect', 'impact', 'approach', 'method', 'results', 'factors',
+           'evaluation', 'case', 'based', 'using', 'model', 'implementation', 'assessment',
+           'relationship', 'development', 'performance', 'indonesia', 'indonesian', 'regency',
+           'province', 'significant', 'data', 'survey', 'sample', 'respondents', 'research'],
+    'id': ['analisis', 'studi', 'pengaruh', 'dampak', 'pendekatan', 'metode', 'hasil', 'faktor',
+           'evaluasi', 'kasus', 'berbasis', 'menggunakan', 'model', 'implementasi', 'penilaian',
+           'hubungan', 'pengembangan', 'kinerja', 'indonesia', 'kabupaten', 'provinsi',
+           'signifikan', 'data', 'survei', 'sampel', 'responden', 'penelitian'],
+}
+
+FUNCTION_WORDS = {
+    'en': ['the', 'of', 'and', 'in', 'to', 'a', 'for', 'with', 'on', 'was', 'is', 'this', 'that',
+           'by', 'were', 'from', 'as', 'are', 'an', 'at'],
+    'id': ['yang', 'dan', 'di', 'dari', 'untuk', 'pada', 'dengan', 'ini', 'dalam', 'ke', 'adalah',
+           'oleh', 'sebagai', 'tersebut', 'juga', 'serta', 'akan', 'atau'],
+}
+
+TITLE_TEMPLATES = {
+    'en': ['{a} of {t1} {t2} in {r}', '{t1} {t2} {a} using {t3} {t4}',
+           'The {a} of {t1} on {t2} {t3}: a case study in {r}', '{t1} and {t2} {a} in {r}, Indonesia'],
+    'id': ['{a} {t1} {t2} di {r}', '{a} {t1} {t2} menggunakan {t3} {t4}',
+           '{a} {t1} terhadap {t2} {t3} di {r}', '{t1} dan {t2}: {a} di {r}'],
+}
+
+# Share of abstract words drawn from each pool
+WORD_MIX = {'domain': 0.4, 'rare': 0.08, 'academic': 0.2, 'function': 0.32}
+
+# Long-tail vocabulary: pseudo-words built from these syllables
+SYLLABLES = ['ba', 'ka', 'ra', 'si', 'tu', 'ma', 'na', 'li', 'pe', 'ko', 'di', 'ga', 'ja',
+             'wa', 'se', 'lo', 'mu', 'ri', 'te', 'ngan', 'kan', 'tan', 'lan', 'rum', 'pin']
+RARE_VOCABULARY = 20000
+
+def _zipf_weights(n: int, s: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return weights / weights.sum()
+
+def _rare_words(seed: int, n: int) -> np.ndarray:
+    """n distinct pseudo-words of 2-4 syllables"""
+    rng = np.random.default_rng([seed, 0x7A7E])
+    syllables = np.array(SYLLABLES)
+    words: Dict[str, None] = {}
+    while len(words) < n:
+        count = rng.integers(2, 5, size=n)
+        picks = syllables[rng.integers(len(syllables), size=(n, 4))]
+        for row, k in zip(picks, count):
+            words.setdefault(''.join(row[:k]))
+    return np.array(list(words)[:n], dtype=object)
+
+class CorpusGenerator:
+    """
+    Block-vectorized generator of publication-like documents
+
+    Same seed, same documents. Years skew towards recent ones, domains
+    follow DOMAINS popularity and words inside each pool are Zipfian.
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        indonesian_share: float = 0.45,
+        abstract_words: tuple = (80, 220),
+        year_range: tuple = (2010, 2024),
+        block_size: int = 10000
+    ):
+        self.seed = seed
+        self.indonesian_share = indonesian_share
+        self.abstract_words = abstract_words
+        self.years = np.arange(year_range[0], year_range[1] + 1)
+        self.block_size = block_size
+
+        self.domains = [name for name, _ in DOMAINS]
+        self.domain_p = np.array([p for _, p in DOMAINS]) / sum(p for _, p in DOMAINS)
+
+        # Output volume roughly doubles every five years
+        growth = 2 ** ((self.years - self.years[0]) / 5)
+        self.year_p = growth / growth.sum()
+
+        self.mix_p = np.array(list(WORD_MIX.values()))
+        rare = _rare_words(seed, RARE_VOCABULARY)
+        self.pools = {}
+        for lang in ('en', 'id'):
+            for domain in self.domains:
+                self.pools[(domain, lang)] = np.array(DOMAIN_TERMS[domain][lang], dtype=object)
+            self.pools[('academic', lang)] = np.array(ACADEMIC[lang], dtype=object)
+            self.pools[('function', lang)] = np.array(FUNCTION_WORDS[lang], dtype=object)
+        self.rare = rare
+        self.weights = {size: _zipf_weights(size) for size in {len(p) for p in self.pools.values()}}
+        self.weights[len(rare)] = _zipf_weights(len(rare))
+        self.cdf = {size: np.cumsum(w) for size, w in self.weights.items()}
+
+        # Abstract pools of each (domain, language) in WORD_MIX order, concatenated
+        self.vocabularies = {}
+        for lang in ('en', 'id'):
+            for domain in self.domains:
+                pools = [self.pools[(domain, lang)], rare,
+                         self.pools[('academic', lang)], self.pools[('function', lang)]]
+                offsets = np.cumsum([0] + [len(p) for p in pools])
+                self.vocabularies[(domain, lang)] = (np.concatenate(pools), offsets)
+
+    def _lookup(self, size: int, u):
+        return np.minimum(np.searchsorted(self.cdf[size], u, side='right'), size - 1)
+
+    def _abstracts(self, rng: np.random.Generator, domains: np.ndarray,
+                   langs: np.ndarray, lengths: np.ndarray) -> List[str]:
+        """
+        Abstracts of a whole block: the words of every (domain, language)
+        group are drawn in one call and then cut at the document lengths
+        """
+        abstracts: List[str] = [''] * len(domains)
+        for d, domain in enumerate(self.domains):
+            for lang in ('en', 'id'):
+                members = np.flatnonzero((domains == d) & (langs == lang))
+                if not len(members):
+                    continue
+                total = int(lengths[members].sum())
+                kinds = rng.choice(len(self.mix_p), size=total, p=self.mix_p)
+                vocabulary, offsets = self.vocabularies[(domain, lang)]
+                index = np.empty(total, dtype=np.int64)
+                for kind, size in enumerate(np.diff(offsets)):
+                    mask = kinds == kind
+                    index[mask] = offsets[kind] + self._lookup(size, rng.random(int(mask.sum())))
+                words = vocabulary[index]
+                words = words.tolist()
+                ends = np.cumsum(lengths[members]).tolist()
+                for i, begin, end in zip(members.tolist(), [0] + ends[:-1], ends):
+                    text = ' '.join(words[begin:end])
+                    abstracts[i] = text[0].upper() + text[1:] + '.'
+        return abstracts
+
+    def _titles(self, rng: np.random.Generator, domains: np.ndarray, langs: np.ndarray) -> List[str]:
+        n = len(domains)
+        templates = rng.integers(len(TITLE_TEMPLATES['en']), size=n)
+        regions = rng.integers(len(REGIONS), size=n)
+        picks = rng.random((n, 5))
+        titles: List[str] = [''] * n
+        for d, domain in enumerate(self.domains):
+            for lang in ('en', 'id'):
+                members = np.flatnonzero((domains == d) & (langs == lang))
+                if not len(members):
+                    continue
+                terms = self.pools[(domain, lang)]
+                academic = self.pools[('academic', lang)]
+                # Inverse-CDF lookups against the Zipf weights, one per slot
+                t = terms[self._lookup(len(terms), picks[members, :4])]
+                a = academic[self._lookup(len(academic), picks[members, 4])]
+                for j, i in enumerate(members):
+                    title = TITLE_TEMPLATES[lang][templates[i]].format(
+                        a=a[j], t1=t[j, 0], t2=t[j, 1], t3=t[j, 2], t4=t[j, 3], r=REGIONS[regions[i]]
+                    )
+                    titles[i] = title[0].upper() + title[1:]
+        return titles
+
+    def documents(self, n: int, start: int = 0) -> Iterator[Dict]:
+        """
+        Yield n documents: {'index', 'title', 'abstract', 'language',
+        'year', 'domain'}
+
+        `start` (a multiple of block_size) continues an earlier sequence.
+        """
+        index = start
+        while index < start + n:
+            block = min(self.block_size, start + n - index)
+            # One stream per block keeps any block reproducible on its own
+            rng = np.random.default_rng([self.seed, index // self.block_size])
+            domains = rng.choice(len(self.domains), size=block, p=self.domain_p)
+            langs = np.where(rng.random(block) < self.indonesian_share, 'id', 'en')
+            years = rng.choice(self.years, size=block, p=self.year_p)
+            lengths = rng.integers(self.abstract_words[0], self.abstract_words[1], size=block)
+            titles = self._titles(rng, domains, langs)
+            abstracts = self._abstracts(rng, domains, langs, lengths)
+
+            for i in range(block):
+                yield {
+                    'index': index + i,
+                    'title': titles[i],
+                    'abstract': abstracts[i],
+                    'language': str(langs[i]),
+                    'year': int(years[i]),
+                    'domain': self.domains[domains[i]],
+                }
+            index += block
+
+    def texts(self, n: int) -> List[str]:
+        """Title + abstract strings, the input of the topic modeling path"""
+        return [f"{d['title']} {d['abstract']}" for d in self.documents(n)]
@@ -0,0 +1,417 @@
+"""
+HTTP load test replaying the frontend's API call mix
+
+    python benchmarks/load_test.py --serve                        # start app, 16 concurrent clients, 30s
+    python benchmarks/load_test.py --url http://localhost:8000 --rate 50 --duration 60
+    python benchmarks/load_test.py --serve --server-workers 4 --concurrency 64
+    python benchmarks/load_test.py --serve --update-baseline
+
+The mix mirrors frontend/src/services/api.js: dashboard loads (stats,
+topics, trends, first page), filtered/paged listing, autocomplete search
+and the detail modal. Ids, years, topics and search terms are sampled from
+the running API, so any database works (seed_data.py for a smoke test,
+generate_synthetic_data.py for a realistic ceiling).
+
+Two modes:
+  --concurrency N   closed loop: N clients, each sends its next request as
+                    soon as the previous one returns (finds the ceiling)
+  --rate R          open loop: R requests/s on a fixed schedule, latency
+                    measured from the scheduled time, so a stalled server
+                    shows up as latency instead of fewer requests
+
+Exits 1 when throughput, p95 latency or error rate regress against
+load_baseline.json for the same scenario.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+from benchmarks.run_benchmarks import machine_info
+
+LOAD_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'load_baseline.json')
+
+# Relative weights, roughly one dashboard visit: every visit loads stats,
+# topics, trends and page 1; users then type in the search box (one call
+# per keystroke), change filters / pages and open a few publications
+MIX = {
+    'list': 25,
+    'list_filtered': 20,
+    'search': 25,
+    'detail': 15,
+    'stats': 5,
+    'topics': 5,
+    'trends': 5,
+}
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Allowed relative drop in throughput / growth in p95
+TOLERANCE = 0.3
+# p95 changes smaller than this are noise on a local run
+MIN_LATENCY_DELTA_MS = 5.0
+# Allowed absolute growth in error rate
+MAX_ERROR_RATE_DELTA = 0.01
+
+class Targets:
+    """Ids, years, topics and search terms sampled from the API under test"""
+
+    def __init__(self, publication_ids: List[int], years: List[int], topic_ids: List[int],
+                 terms: List[str], total_publications: int = 0):
+        self.publication_ids = publication_ids
+        self.years = years
+        self.topic_ids = topic_ids
+        self.terms = terms or ['data']
+        self.total_publications = total_publications
+
+async def discover_targets(client: httpx.AsyncClient) -> Targets:
+    stats = (await client.get('/api/publications/stats')).json()
+    topics = (await client.get('/api/topics/')).json()
+    page = (await client.get('/api/publications/', params={'per_page': 100})).json()
+
+    terms = set()
+    for topic in topics:
+        try:
+            keywords = json.loads(topic['keywords'] or '[]')
+        except ValueError:
+            keywords = []
+        terms.update(k for k in keywords if len(k) > 3)
+    for item in page['items']:
+        terms.update(w.lower() for w in item['title'].split()[:3] if len(w) > 3 and w.isalpha())
+
+    return Targets(
+        publication_ids=[item['id'] for item in page['items']],
+        years=sorted(int(y) for y in stats['publications_by_year']),
+        topic_ids=[t['id'] for t in topics],
+        terms=sorted(terms),
+        total_publications=stats['total_publications'],
+    )
+
+def build_request(name: str, rng: random.Random, targets: Targets) -> Tuple[str, Dict]:
+    """(path, query params) of one call, as the frontend would send it"""
+    if name == 'list':
+        return '/api/publications/', {'page': 1, 'per_page': 20}
+
+    if name == 'list_filtered':
+        params = {'page': rng.randint(1, 5), 'per_page': 20}
+        choice = rng.random()
+        if choice < 0.4 and targets.years:
+            params['year'] = rng.choice(targets.years)
+        elif choice < 0.7 and targets.topic_ids:
+            params['topic_id'] = rng.choice(targets.topic_ids)
+        else:
+            params['search'] = rng.choice(targets.terms)
+        return '/api/publications/', params
+
+    if name == 'search':
+        # Autocomplete: a prefix of what the user is typing, 5 suggestions
+        term = rng.choice(targets.terms)
+        return '/api/publications/search', {'q': term[:rng.randint(2, max(2, len(term)))], 'limit': 5}
+
+    if name == 'detail':
+        if not targets.publication_ids:
+            return '/api/publications/', {'page': 1, 'per_page': 20}
+        return f'/api/publications/{rng.choice(targets.publication_ids)}', {}
+
+    if name == 'stats':
+        return '/api/publications/stats', {}
+    if name == 'topics':
+        return '/api/topics/', {}
+    if name == 'trends':
+        return '/api/topics/trends', {}
+
+    raise ValueError(f"unknown request type: {name}")
+
+class Recorder:
+    """Latency and outcome per request type, ignoring the warmup period"""
+
+    def __init__(self, record_after: float):
+        self.record_after = record_after
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(Counter)
+        self.first = None
+        self.last = None
+
+    def add(self, name: str, started: float, error: Optional[str]):
+        finished = time.perf_counter()
+        if finished < self.record_after:
+            return
+        self.first = finished if self.first is None else self.first
+        self.last = finished
+        self.latencies[name].append(finished - started)
+        if error:
+            self.errors[name][error] += 1
+
+async def _send(client: httpx.AsyncClient, recorder: Recorder, name: str, path: str,
+                params: Dict, started: float):
+    try:
+        response = await client.get(path, params=params)
+        await response.aread()
+        error = None if response.status_code < 400 else str(response.status_code)
+    except httpx.HTTPError as e:
+        error = type(e).__name__
+    recorder.add(name, started, error)
+
+async def run_load(client: httpx.AsyncClient, targets: Targets, duration: float,
+                   concurrency: int = 16, rate: Optional[float] = None,
+                   warmup: float = 0.0, seed: int = 42, mix: Dict[str, int] = MIX) -> Dict:
+    """
+    Drive the mix for warmup + duration seconds and summarise what finished
+    after the warmup
+
+    With `rate` the schedule is open loop and `concurrency` only caps the
+    requests in flight; calls that would exceed it are counted as dropped.
+    """
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    start = time.perf_counter()
+    recorder = Recorder(record_after=start + warmup)
+    deadline = start + warmup + duration
+    dropped = 0
+
+    async def closed_worker(worker: int):
+        rng = random.Random(seed * 1000 + worker)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            path, params = build_request(name, rng, targets)
+            await _send(client, recorder, name, path, params, time.perf_counter())
+
+    cpu = time.process_time()
+    if rate is None:
+        await asyncio.gather(*(closed_worker(i) for i in range(concurrency)))
+    else:
+        rng = random.Random(seed)
+        in_flight = set()
+        i = 0
+        while True:
+            scheduled = start + i / rate
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            i += 1
+            if len(in_flight) >= concurrency:
+                dropped += scheduled >= recorder.record_after
+                continue
+            name = rng.choices(names, weights)[0]
+            path, params = build_request(name, rng, targets)
+            task = asyncio.ensure_future(_send(client, recorder, name, path, params, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    elapsed = time.perf_counter() - start
+    result = summarize(recorder, (recorder.last or 0) - (recorder.first or 0) or duration)
+    result.update({
+        'mode': 'rate' if rate is not None else 'concurrency',
+        'concurrency': concurrency,
+        'rate': rate,
+        'duration_seconds': duration,
+        'dropped': dropped,
+        # A saturated load generator measures itself, not the API
+        'client_cpu': round((time.process_time() - cpu) / elapsed, 2),
+        'total_publications': targets.total_publications,
+    })
+    return result
+
+def _stats(latencies: List[float], errors: Counter, seconds: float) -> Dict:
+    ms = np.asarray(latencies) * 1000
+    n = len(ms)
+    stats = {
+        'requests': n,
+        'errors': sum(errors.values()),
+        'error_rate': round(sum(errors.values()) / n, 4) if n else 0.0,
+        'throughput': round(n / seconds, 1) if seconds > 0 else 0.0,
+    }
+    for p in PERCENTILES:
+        stats[f'p{p}_ms'] = round(float(np.percentile(ms, p)), 2) if n else None
+    stats['max_ms'] = round(float(ms.max()), 2) if n else None
+    if errors:
+        stats['error_kinds'] = dict(errors)
+    return stats
+
+def summarize(recorder: Recorder, seconds: float) -> Dict:
+    """Overall and per-request-type throughput, latency percentiles, errors"""
+    every_latency = [l for values in recorder.latencies.values() for l in values]
+    every_error = sum(recorder.errors.values(), Counter())
+    result = _stats(every_latency, every_error, seconds)
+    result['endpoints'] = {
+        name: _stats(recorder.latencies[name], recorder.errors[name], seconds)
+        for name in sorted(recorder.latencies)
+    }
+    return result
+
+def scenario_key(result: Dict) -> str:
+    if result['mode'] == 'rate':
+        return f"rate={result['rate']:g},max_in_flight={result['concurrency']}"
+    return f"concurrency={result['concurrency']}"
+
+def compare(result: Dict, baseline: Dict, tolerance: float = TOLERANCE) -> List[str]:
+    """Regressions of one run against the baseline of the same scenario"""
+    key = scenario_key(result)
+    expected = baseline.get('scenarios', {}).get(key)
+    if not expected:
+        return []
+
+    regressions = []
+    # Open loop throughput is fixed by the schedule; latency is what moves
+    if result['mode'] == 'concurrency' and result['throughput'] < expected['throughput'] * (1 - tolerance):
+        regressions.append(
+            f"{key}: {result['throughput']:,.1f} req/s, baseline {expected['throughput']:,.1f} "
+            f"(-{1 - result['throughput'] / expected['throughput']:.0%})"
+        )
+    p95, expected_p95 = result['p95_ms'], expected['p95_ms']
+    if p95 is not None and expected_p95 is not None and \
+            p95 > max(expected_p95 * (1 + tolerance), expected_p95 + MIN_LATENCY_DELTA_MS):
+        regressions.append(f"{key}: p95 {p95:,.1f} ms, baseline {expected_p95:,.1f} ms")
+    if result['error_rate'] > expected['error_rate'] + MAX_ERROR_RATE_DELTA:
+        regressions.append(
+            f"{key}: error rate {result['error_rate']:.1%}, baseline {expected['error_rate']:.1%}"
+        )
+    return regressions
+
+def load_baseline(path: str = LOAD_BASELINE_PATH) -> Dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'machine': None, 'scenarios': {}}
+
+def save_baseline(result: Dict, path: str = LOAD_BASELINE_PATH):
+    """Store this run as the baseline of its scenario (other scenarios are kept)"""
+    baseline = load_baseline(path)
+    baseline['machine'] = machine_info()
+    baseline['scenarios'][scenario_key(result)] = {
+        k: result[k] for k in ('throughput', 'error_rate', 'p50_ms', 'p95_ms', 'p99_ms', 'total_publications')
+    }
+    baseline['scenarios'] = dict(sorted(baseline['scenarios'].items()))
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+def print_report(result: Dict, baseline: Dict):
+    expected = baseline.get('scenarios', {}).get(scenario_key(result), {})
+    print(f"\n📈 {scenario_key(result)}, {result['duration_seconds']:g}s, "
+          f"{result['total_publications']:,} publications in the database")
+    print(f"  {'request':14} {'reqs':>7} {'req/s':>8} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    rows = list(result['endpoints'].items()) + [('TOTAL', result)]
+    for name, s in rows:
+        print(f"  {name:14} {s['requests']:7} {s['throughput']:8} {s['p50_ms']:8} {s['p90_ms']:8} "
+              f"{s['p95_ms']:8} {s['p99_ms']:8} {s['max_ms']:8} {s['error_rate']:7.1%}")
+    for name, s in result['endpoints'].items():
+        if s.get('error_kinds'):
+            print(f"  ⚠️  {name} errors: {s['error_kinds']}")
+    if result['dropped']:
+        print(f"  ⚠️  {result['dropped']} scheduled requests dropped (max {result['concurrency']} in flight)")
+    if result['client_cpu'] > 0.8:
+        print(f"  ⚠️  Load generator used {result['client_cpu']:.0%} of a CPU; results may be client-bound")
+    if expected:
+        print(f"  baseline: {expected['throughput']} req/s, p95 {expected['p95_ms']} ms, "
+              f"errors {expected['error_rate']:.1%}")
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """uvicorn serving app.main in a child process, once /health answers"""
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'app.main:app', '--host', '127.0.0.1', '--port', str(port),
+         '--workers', str(workers), '--log-level', 'warning', '--no-access-log'],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/health', timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 60s")
+
+async def _main(args) -> Dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=args.timeout) as client:
+        targets = await discover_targets(client)
+        print(f"🎯 {len(targets.publication_ids)} publication ids, {len(targets.years)} years, "
+              f"{len(targets.topic_ids)} topics, {len(targets.terms)} search terms")
+        return await run_load(
+            client, targets, args.duration, concurrency=args.concurrency, rate=args.rate,
+            warmup=args.warmup, seed=args.seed
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the API with the frontend request mix')
+    parser.add_argument('--url', type=str, default='http://127.0.0.1:8000', help='API base URL')
+    parser.add_argument('--serve', action='store_true', help='Start uvicorn for the duration of the test')
+    parser.add_argument('--port', type=int, default=8765, help='Port for --serve (overrides --url)')
+    parser.add_argument('--server-workers', type=int, default=1, help='uvicorn worker processes for --serve')
+    parser.add_argument('--concurrency', type=int, default=16,
+                        help='Closed-loop clients, or max requests in flight with --rate (default: 16)')
+    parser.add_argument('--rate', type=float, default=None, help='Open loop: requests per second')
+    parser.add_argument('--duration', type=float, default=30, help='Measured seconds (default: 30)')
+    parser.add_argument('--warmup', type=float, default=5, help='Unmeasured seconds first (default: 5)')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=42, help='Request sequence seed')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='Allowed relative regression')
+    parser.add_argument('--baseline', type=str, default=LOAD_BASELINE_PATH, help='Baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the baseline')
+    parser.add_argument('--output', type=str, default=None, help='Also write the result to this JSON file')
+    args = parser.parse_args()
+
+    server = None
+    if args.serve:
+        args.url = f'http://127.0.0.1:{args.port}'
+        print(f"🚀 Starting uvicorn ({args.server_workers} worker(s)) on {args.url}")
+        server = start_server(args.port, args.server_workers)
+
+    try:
+        result = asyncio.run(_main(args))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    baseline = load_baseline(args.baseline)
+    if baseline.get('machine') and baseline['machine'] != machine_info():
+        print(f"⚠️  Baseline was recorded on another machine: {baseline['machine']}")
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'machine': machine_info(), 'result': result}, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(result, args.baseline)
+        print(f"\n✅ Baseline updated: {args.baseline}")
+        return
+
+    expected = baseline.get('scenarios', {}).get(scenario_key(result))
+    if expected and expected.get('total_publications') != result['total_publications']:
+        print(f"⚠️  Baseline was recorded on {expected['total_publications']:,} publications")
+
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print("\n" + "!" * 72)
+        print(f"❌ LOAD TEST REGRESSION ({len(regressions)}), tolerance {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"   - {line}")
+        print("!" * 72)
+        sys.exit(1)
+
+    print(f"\n✅ No regressions (tolerance {args.tolerance:.0%})")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Record OpenAlex works pages for the benchmark suite
+
+    python benchmarks/record_fixtures.py --pages 2 --email you@example.com
+    python benchmarks/record_fixtures.py --synthetic
+
+Live mode saves real /works pages (same filter, select and page size as
+the harvester) to fixtures/openalex_works.json.gz. --synthetic builds
+pages in the same shape from the synthetic corpus, for machines without
+network access, and saves them to fixtures/openalex_works.synthetic.json.gz.
+The committed fixture (and baseline.json) is the synthetic one.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import zlib
+import json
+import argparse
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, List
+from app.services.openalex_fetcher import OpenAlexFetcher
+from benchmarks.corpus import CorpusGenerator
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LIVE_FIXTURE_PATH = os.path.join(FIXTURES_DIR, 'openalex_works.json.gz')
+SYNTHETIC_FIXTURE_PATH = os.path.join(FIXTURES_DIR, 'openalex_works.synthetic.json.gz')
+
+# (display_name, ror, country_code) of the institutions on synthetic authorships
+FOREIGN_INSTITUTIONS = [
+    ('National University of Singapore', 'https://ror.org/01tgyzw49', 'SG'),
+    ('Universiti Malaya', 'https://ror.org/00rzspn62', 'MY'),
+    ('Kyoto University', 'https://ror.org/02kpeqv85', 'JP'),
+    ('Wageningen University & Research', 'https://ror.org/04qw24q55', 'NL'),
+    ('The University of Melbourne', 'https://ror.org/01ej9dk98', 'AU'),
+    ('Chulalongkorn University', 'https://ror.org/028wp3y58', 'TH'),
+]
+UNLISTED_INDONESIAN = [
+    ('Universitas Brawijaya', 'https://ror.org/01wk3d929', 'ID'),
+    ('Universitas Sumatera Utara', 'https://ror.org/01kknrc90', 'ID'),
+    ('Politeknik Negeri Jakarta', None, None),  # missing country code happens
+    ('Universitas Islam Negeri Sunan Kalijaga Yogyakarta', None, 'ID'),
+]
+INDONESIAN_NAMES = {
+    'BRIN': 'National Research and Innovation Agency', 'UI': 'Universitas Indonesia',
+    'ITB': 'Institut Teknologi Bandung', 'UGM': 'Universitas Gadjah Mada',
+    'IPB': 'IPB University', 'ITS': 'Institut Teknologi Sepuluh Nopember',
+    'UNAIR': 'Universitas Airlangga', 'UNDIP': 'Universitas Diponegoro',
+    'UNPAD': 'Universitas Padjadjaran', 'UNS': 'Universitas Sebelas Maret',
+    'UNHAS': 'Universitas Hasanuddin', 'USU': 'Universitas Sumatera Utara',
+    'UNAND': 'Universitas Andalas', 'UB': 'Universitas Brawijaya',
+    'BINUS': 'Bina Nusantara University', 'TELKOM_U': 'Telkom University',
+}
+GIVEN = ['Budi', 'Siti', 'Agus', 'Dewi', 'Rizki', 'Putri', 'Andi', 'Nur', 'Hendra', 'Ayu',
+         'Kenji', 'Wei', 'Anna', 'David', 'Ahmad', 'Fitri']
+FAMILY = ['Santoso', 'Rahmawati', 'Wijaya', 'Hidayat', 'Saputra', 'Lestari', 'Pratama',
+          'Kurniawan', 'Suryani', 'Nugroho', 'Tanaka', 'Chen', 'Smith', 'Halim']
+TOPIC_NAMES = {
+    'health': 'Public Health and Epidemiology', 'agriculture': 'Crop Yield and Soil Management',
+    'computing': 'Machine Learning Applications', 'education': 'Education and Learning Outcomes',
+    'energy': 'Renewable Energy Systems', 'disaster': 'Natural Hazards and Risk',
+    'marine': 'Coastal and Marine Ecology', 'economics': 'Regional Economic Development',
+    'environment': 'Environmental Pollution and Forests',
+}
+
+def _inverted_index(text: str) -> Dict[str, List[int]]:
+    index: Dict[str, List[int]] = {}
+    for position, word in enumerate(text.split()):
+        index.setdefault(word, []).append(position)
+    return index
+
+def _institution(name, ror, country_code) -> Dict:
+    return {
+        'id': f"https://openalex.org/I{zlib.crc32(name.encode()) % 10**9}",
+        'display_name': name, 'ror': ror, 'country_code': country_code, 'type': 'education',
+    }
+
+def synthetic_pages(pages: int, per_page: int, seed: int = 42) -> List[List[Dict]]:
+    """Works pages shaped like the OpenAlex responses the harvester selects"""
+    rng = np.random.default_rng([seed, 0x0A1E])
+    known = [(INDONESIAN_NAMES[k], ror, 'ID') for k, ror in OpenAlexFetcher.INDONESIAN_INSTITUTIONS.items()]
+    works = []
+    for doc in CorpusGenerator(seed=seed).documents(pages * per_page):
+        authorships = []
+        for position in range(int(rng.integers(1, 9))):
+            roll = rng.random()
+            pool = known if roll < 0.6 else UNLISTED_INDONESIAN if roll < 0.8 else FOREIGN_INSTITUTIONS
+            institutions = [] if rng.random() < 0.05 else [_institution(*pool[rng.integers(len(pool))])]
+            authorships.append({
+                'author_position': 'first' if position == 0 else 'middle',
+                'author': {
+                    'id': f"https://openalex.org/A{5000000000 + int(rng.integers(10**8))}",
+                    'display_name': f"{GIVEN[rng.integers(len(GIVEN))]} {FAMILY[rng.integers(len(FAMILY))]}",
+                    'orcid': None,
+                },
+                'institutions': institutions,
+                'countries': [i['country_code'] for i in institutions if i['country_code']],
+                'is_corresponding': position == 0,
+                'raw_affiliation_strings': [i['display_name'] for i in institutions],
+            })
+
+        index = doc['index']
+        has_abstract = rng.random() > 0.1
+        works.append({
+            'id': f"https://openalex.org/W{4000000000 + index}",
+            'doi': f"https://doi.org/10.{31000 + index % 900}/jrn.v{index % 12}i{index}" if rng.random() > 0.2 else None,
+            'title': doc['title'],
+            'publication_year': doc['year'],
+            'abstract_inverted_index': _inverted_index(doc['abstract']) if has_abstract else None,
+            'authorships': authorships,
+            'primary_location': {
+                'is_oa': bool(rng.random() > 0.4),
+                'landing_page_url': None,
+                'source': {'id': 'https://openalex.org/S0', 'display_name': f"Jurnal {doc['domain'].title()} Indonesia",
+                           'type': 'journal'},
+            },
+            'topics': [{
+                'id': f"https://openalex.org/T{10000 + zlib.crc32(doc['domain'].encode()) % 1000}",
+                'display_name': TOPIC_NAMES[doc['domain']],
+                'score': round(float(rng.uniform(0.5, 1.0)), 4),
+            }],
+        })
+    return [works[i:i + per_page] for i in range(0, len(works), per_page)]
+
+def live_pages(pages: int, email: str) -> List[List[Dict]]:
+    """First pages of the country-wide harvest query"""
+    fetcher = OpenAlexFetcher(email=email)
+    cursor, recorded = '*', []
+    try:
+        while cursor and len(recorded) < pages:
+            data = fetcher._make_request('works', {
+                'filter': 'institutions.country_code:ID',
+                'per-page': fetcher.PER_PAGE,
+                'cursor': cursor,
+                'select': ','.join(fetcher.WORK_FIELDS),
+            })
+            if not data.get('results'):
+                break
+            recorded.append(data['results'])
+            cursor = data.get('meta', {}).get('next_cursor')
+            print(f"  📄 page {len(recorded)}: {len(data['results'])} works")
+    finally:
+        fetcher.close()
+    return recorded
+
+def main():
+    parser = argparse.ArgumentParser(description='Record OpenAlex fixture pages for the benchmarks')
+    parser.add_argument('--pages', type=int, default=1, help='Pages to record')
+    parser.add_argument('--email', type=str, default='research@example.com', help='Email for the polite pool')
+    parser.add_argument('--synthetic', action='store_true', help='Build pages from the synthetic corpus (offline)')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Fixture file (.json.gz, default: by --synthetic)')
+    args = parser.parse_args()
+    output = args.output or (SYNTHETIC_FIXTURE_PATH if args.synthetic else LIVE_FIXTURE_PATH)
+
+    if args.synthetic:
+        pages = synthetic_pages(args.pages, OpenAlexFetcher.PER_PAGE)
+        source = 'synthetic'
+    else:
+        pages = live_pages(args.pages, args.email)
+        source = OpenAlexFetcher.BASE_URL
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with gzip.open(output, 'wt', encoding='utf-8') as f:
+        json.dump({
+            'source': source,
+            'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'pages': pages,
+        }, f, ensure_ascii=False)
+
+    print(f"✅ Saved {sum(len(p) for p in pages)} works ({len(pages)} pages, {source}) to {output}")
+
+if __name__ == '__main__':
+    main()
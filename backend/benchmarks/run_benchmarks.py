@@ -0,0 +1,331 @@
+"""
+Microbenchmarks for the ingestion and topic modeling hot paths
+
+    python benchmarks/run_benchmarks.py                       # 1k, compare to baseline
+    python benchmarks/run_benchmarks.py --sizes 1k,100k --repeat 1
+    python benchmarks/run_benchmarks.py --cases parse_work,preprocess_text
+    python benchmarks/run_benchmarks.py --update-baseline
+
+Inputs are OpenAlex-shaped works pages from fixtures/ (cycled to the
+requested size) and the synthetic corpus, so nothing touches the network
+or the database. The committed pages and baseline.json are synthetic
+(record_fixtures.py --synthetic); pass --fixture to run on recorded live
+pages, which need their own baseline. Exits 1 when a case is slower or needs more memory than
+baseline.json allows.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import gc
+import gzip
+import json
+import time
+import argparse
+import platform
+import itertools
+import contextlib
+import tracemalloc
+import numpy as np
+from typing import Callable, Dict, Iterator, List, Optional
+from app.services.preprocessor import preprocess_text, extract_keywords
+from app.services.openalex_fetcher import OpenAlexFetcher
+from app.services.topic_modeling import train_topic_model, assign_topics
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.record_fixtures import SYNTHETIC_FIXTURE_PATH
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+# Inputs are produced (untimed) in chunks so 1M documents never sit in memory
+CHUNK_SIZE = 10_000
+
+# NMF on more documents than this takes too long to be a microbenchmark
+MAX_TRAIN_DOCUMENTS = 100_000
+
+N_TOPICS = 10
+
+# Each timed repeat loops over its inputs for at least this long, so
+# microsecond functions are not measured on a few milliseconds of work
+MIN_REPEAT_SECONDS = 0.5
+
+# Relative change allowed before a case counts as a regression
+TOLERANCE = 0.3
+
+# Memory growth below this is noise (allocator, interned strings)
+MIN_MEMORY_DELTA_MIB = 1.0
+
+def load_fixture_works(path: str = SYNTHETIC_FIXTURE_PATH) -> List[Dict]:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return [work for page in json.load(f)['pages'] for work in page]
+
+def _chunks(items: Iterator, n: int) -> Iterator[List]:
+    items = itertools.islice(items, n)
+    while True:
+        chunk = list(itertools.islice(items, CHUNK_SIZE))
+        if not chunk:
+            return
+        yield chunk
+
+class Case:
+    """
+    One benchmark
+
+    Per-item cases call `fn` once per input (latency is per call); batch
+    cases call it once on the whole input (latency is per run).
+    """
+
+    def __init__(self, name: str, fn: Callable, inputs: Callable[[int], Iterator[List]],
+                 batch: bool = False, max_items: Optional[int] = None):
+        self.name = name
+        self.fn = fn
+        self.inputs = inputs
+        self.batch = batch
+        self.max_items = max_items
+
+def build_cases(seed: int = 42, fixture_path: str = SYNTHETIC_FIXTURE_PATH) -> List[Case]:
+    fetcher = OpenAlexFetcher()
+    works = load_fixture_works(fixture_path)
+    corpus = CorpusGenerator(seed=seed)
+
+    def texts(n):
+        return _chunks((f"{d['title']} {d['abstract']}" for d in corpus.documents(n)), n)
+
+    def fixture(n, field=None):
+        cycled = itertools.cycle(works if field is None else [w.get(field) for w in works])
+        return _chunks(cycled, n)
+
+    def train(documents):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return train_topic_model(documents, N_TOPICS)
+
+    def doc_topics(n):
+        rng = np.random.default_rng(seed)
+        yield [rng.dirichlet(np.full(N_TOPICS, 0.3), size=n), list(range(1, n + 1))]
+
+    return [
+        Case('preprocess_text', preprocess_text, texts),
+        Case('extract_keywords', extract_keywords, texts),
+        Case('reconstruct_abstract', fetcher._reconstruct_abstract,
+             lambda n: fixture(n, 'abstract_inverted_index')),
+        Case('parse_work', lambda work: fetcher._parse_work(work, 'BRIN'), fixture),
+        Case('has_indonesian_affiliation', fetcher._has_indonesian_affiliation, fixture),
+        Case('identify_primary_institution', fetcher._identify_primary_institution, fixture),
+        Case('train_topic_model', train, lambda n: [[t for chunk in texts(n) for t in chunk]],
+             batch=True, max_items=MAX_TRAIN_DOCUMENTS),
+        Case('assign_topics',
+             lambda args: assign_topics(args[0], args[1], list(range(N_TOPICS)), threshold=0.1),
+             doc_topics, batch=True),
+    ]
+
+def _run_items(case: Case, n: int, repeat: int) -> Dict:
+    fn = case.fn
+    inputs = case.inputs
+    if n <= CHUNK_SIZE:
+        chunks = list(inputs(n))
+        inputs = lambda n: chunks  # small inputs are generated once
+    for item in next(iter(inputs(min(n, 100)))):
+        fn(item)  # warm-up
+
+    # Throughput: tight loop, best of `repeat`
+    best = 0.0
+    for _ in range(repeat):
+        elapsed, items = 0.0, 0
+        while elapsed < MIN_REPEAT_SECONDS or not items:
+            for chunk in inputs(n):
+                started = time.perf_counter()
+                for item in chunk:
+                    fn(item)
+                elapsed += time.perf_counter() - started
+                items += len(chunk)
+        best = max(best, items / elapsed)
+
+    # Latency: one instrumented pass
+    clock = time.perf_counter_ns
+    latencies = []
+    for chunk in inputs(n):
+        times = np.empty(len(chunk), dtype=np.int64)
+        for i, item in enumerate(chunk):
+            started = clock()
+            fn(item)
+            times[i] = clock() - started
+        latencies.append(times)
+    latencies = np.concatenate(latencies) / 1000.0
+
+    # Memory: peak above the inputs while processing the first chunk
+    chunk = next(iter(inputs(n)))
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        for item in chunk:
+            fn(item)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    return {'items': n, 'items_per_second': best, 'latencies_us': latencies, 'peak_bytes': peak}
+
+def _run_batch(case: Case, n: int, repeat: int) -> Dict:
+    args = next(iter(case.inputs(n)))
+
+    runs = []
+    while len(runs) < repeat or sum(runs) < MIN_REPEAT_SECONDS:
+        gc.collect()
+        started = time.perf_counter()
+        case.fn(args)
+        runs.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        case.fn(args)
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+
+    return {'items': n, 'items_per_second': n / min(runs), 'latencies_us': np.array(runs) * 1e6, 'peak_bytes': peak}
+
+def run_case(case: Case, size: str, repeat: int) -> Dict:
+    n = SIZES[size]
+    if case.max_items:
+        n = min(n, case.max_items)
+    gc.collect()
+    raw = (_run_batch if case.batch else _run_items)(case, n, repeat)
+    return {
+        'case': case.name,
+        'size': size,
+        'items': raw['items'],
+        'items_per_second': round(raw['items_per_second'], 1),
+        'p50_us': round(float(np.percentile(raw['latencies_us'], 50)), 2),
+        'p95_us': round(float(np.percentile(raw['latencies_us'], 95)), 2),
+        'peak_mib': round(raw['peak_bytes'] / 2**20, 3),
+    }
+
+def machine_info() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float = TOLERANCE) -> List[str]:
+    """
+    Regressions of results against baseline['results']
+
+    A case regresses when its throughput drops, or its peak memory grows,
+    by more than `tolerance` (relative). Cases missing from the baseline
+    are not compared.
+    """
+    regressions = []
+    for result in results:
+        key = f"{result['case']}@{result['size']}"
+        expected = baseline.get('results', {}).get(key)
+        if not expected:
+            continue
+
+        floor = expected['items_per_second'] * (1 - tolerance)
+        if result['items_per_second'] < floor:
+            regressions.append(
+                f"{key}: {result['items_per_second']:,.0f} items/s, "
+                f"baseline {expected['items_per_second']:,.0f} (-{1 - result['items_per_second'] / expected['items_per_second']:.0%})"
+            )
+
+        ceiling = expected['peak_mib'] * (1 + tolerance)
+        if result['peak_mib'] > max(ceiling, expected['peak_mib'] + MIN_MEMORY_DELTA_MIB):
+            regressions.append(
+                f"{key}: peak {result['peak_mib']:.2f} MiB, baseline {expected['peak_mib']:.2f} MiB"
+            )
+    return regressions
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'machine': None, 'results': {}}
+
+def save_baseline(results: List[Dict], path: str = BASELINE_PATH):
+    """Merge results into the baseline (other sizes and cases are kept)"""
+    baseline = load_baseline(path)
+    baseline['machine'] = machine_info()
+    for result in results:
+        baseline['results'][f"{result['case']}@{result['size']}"] = {
+            k: result[k] for k in ('items', 'items_per_second', 'p50_us', 'p95_us', 'peak_mib')
+        }
+    baseline['results'] = dict(sorted(baseline['results'].items()))
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+
+def print_report(results: List[Dict], baseline: Dict):
+    print(f"\n  {'case':30} {'size':>5} {'items':>8} {'items/s':>12} {'p50 µs':>10} "
+          f"{'p95 µs':>10} {'peak MiB':>9} {'vs base':>8}")
+    for r in results:
+        expected = baseline.get('results', {}).get(f"{r['case']}@{r['size']}")
+        delta = f"{r['items_per_second'] / expected['items_per_second'] - 1:+.0%}" if expected else 'new'
+        print(f"  {r['case']:30} {r['size']:>5} {r['items']:8} {r['items_per_second']:12,.1f} "
+              f"{r['p50_us']:10,.2f} {r['p95_us']:10,.2f} {r['peak_mib']:9.3f} {delta:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the offline microbenchmark suite')
+    parser.add_argument('--sizes', type=str, default='1k', help=f"Comma separated, from {', '.join(SIZES)}")
+    parser.add_argument('--cases', type=str, default=None, help='Comma separated case names (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repeats per case (best one counts)')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='Allowed relative regression')
+    parser.add_argument('--baseline', type=str, default=BASELINE_PATH, help='Baseline JSON file')
+    parser.add_argument('--fixture', type=str, default=SYNTHETIC_FIXTURE_PATH, help='Works pages (.json.gz)')
+    parser.add_argument('--update-baseline', action='store_true', help='Store these results as the baseline')
+    parser.add_argument('--output', type=str, default=None, help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    sizes = args.sizes.split(',')
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)}")
+
+    cases = build_cases(fixture_path=args.fixture)
+    if args.cases:
+        wanted = set(args.cases.split(','))
+        missing = wanted - {c.name for c in cases}
+        if missing:
+            parser.error(f"unknown case(s): {', '.join(sorted(missing))}")
+        cases = [c for c in cases if c.name in wanted]
+
+    baseline = load_baseline(args.baseline)
+    if baseline.get('machine') and baseline['machine'] != machine_info():
+        print(f"⚠️  Baseline was recorded on another machine: {baseline['machine']}")
+
+    results = []
+    for size in sizes:
+        for case in cases:
+            print(f"⏱️  {case.name} @ {size}...", flush=True)
+            results.append(run_case(case, size, args.repeat))
+
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'machine': machine_info(), 'results': results}, f, indent=2)
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"\n✅ Baseline updated: {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\n" + "!" * 72)
+        print(f"❌ PERFORMANCE REGRESSION ({len(regressions)}), tolerance {args.tolerance:.0%}:")
+        for line in regressions:
+            print(f"   - {line}")
+        print("!" * 72)
+        sys.exit(1)
+
+    print(f"\n✅ No regressions (tolerance {args.tolerance:.0%})")
+
+if __name__ == '__main__':
+    main()
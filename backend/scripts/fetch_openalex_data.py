@@ -5,215 +5,93 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from app.services.openalex_fetcher import OpenAlexFetcher
 from app.database import SessionLocal
 from app.models import Publication, Author, Topic, PublicationTopic
+from app.services.counts import refresh_count_summary
+from app.services.analytics import get_analytics_snapshot, refresh_analytics_snapshot
+from app.services.authors import AuthorResolver
+from app.services.ingest import upsert_publications
+from app.services.pipeline import run_ingest_pipeline, print_pipeline_report, PARSE_WORKERS, QUEUE_SIZE
+from app.services.watermarks import harvest_query_key, harvest_complete, get_watermark, set_watermark
+from app.services.run_profiler import RunProfiler, load_history, save_report, print_profile_report, PROFILE_DIR
+from app.services.retrain import retrain_topics
+from datetime import datetime, timezone
 import json
 import argparse
 
-def save_to_database(publications: list, db, run_topic_modeling: bool = True):
+def save_to_database(publications: list, db, run_topic_modeling: bool = True, profile_dir: str = None):
     """Save publications to database"""
     print("\n💾 Saving to database...")
     
-    saved_count = 0
-    skipped_count = 0
+    # Upsert keyed on openalex_id: new works inserted, changed works updated
+    resolver = AuthorResolver(db)
+    stats = upsert_publications(db, publications, resolver=resolver)
     
-    for pub_data in publications:
-        # Check duplicate
-        exists = db.query(Publication).filter(
-            Publication.title == pub_data['title']
-        ).first()
-        
-        if exists:
-            skipped_count += 1
-            continue
-        
-        # Create publication
-        pub = Publication(
-            title=pub_data['title'],
-            abstract=pub_data.get('abstract', ''),
-            year=pub_data.get('year'),
-            source=pub_data.get('source', 'OpenAlex'),
-            url=pub_data.get('url', '')
-        )
-        
-        # Add authors - prioritize Indonesian affiliations
-        author_names = pub_data.get('authors', [])
-        affiliations = pub_data.get('affiliations', [])
-        
-        for i, author_name in enumerate(author_names[:10]):
-            if not author_name or author_name == 'Unknown':
-                continue
-            
-            # Find or create author
-            author = db.query(Author).filter(
-                Author.name == author_name
-            ).first()
-            
-            if not author:
-                affiliation = affiliations[i] if i < len(affiliations) else None
-                author = Author(
-                    name=author_name,
-                    affiliation=affiliation
-                )
-                db.add(author)
-            
-            pub.authors.append(author)
-        
-        db.add(pub)
-        saved_count += 1
-        
-        # Commit every 50 records
-        if saved_count % 50 == 0:
-            db.commit()
-            print(f"  Progress: {saved_count} saved, {skipped_count} skipped")
-    
-    db.commit()
-    
-    print(f"\n✅ Saved {saved_count} new publications")
-    print(f"⏭️  Skipped {skipped_count} duplicates")
+    return finish_ingest(db, stats, resolver, run_topic_modeling, profile_dir)
+
+def finish_ingest(db, stats: dict, resolver: AuthorResolver, run_topic_modeling: bool = True,
+                  profile_dir: str = None):
+    """Report upsert results, then refresh topics and count summary"""
+    saved_count = stats['inserted'] + stats['updated']
+    
+    print(f"\n✅ Saved {stats['inserted']} new publications")
+    print(f"🔄 Updated {stats['updated']} changed publications")
+    print(f"⏭️  Skipped {stats['unchanged']} unchanged, {stats['skipped']} duplicates, "
+          f"{stats.get('near_duplicates', 0)} near-duplicates")
+    print(f"👥 Authors: {resolver.stats['created']} new, "
+          f"{resolver.stats['matched_id']} matched by ID, "
+          f"{resolver.stats['matched_name'] + resolver.stats['matched_fuzzy']} matched by name")
     
     # Run topic modeling
     if run_topic_modeling and saved_count > 0:
         print("\n🤖 Running topic modeling...")
-        run_topic_modeling_process(db)
+        run_topic_modeling_process(db, profile_dir)
+    
+    if saved_count > 0:
+        refresh_count_summary(db)
+        refresh_analytics_snapshot(db, full=stats['updated'] > 0)
     
     return saved_count
 
-def run_topic_modeling_process(db):
-    """Run improved topic modeling"""
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.decomposition import LatentDirichletAllocation
-    from app.services.preprocessor import preprocess_text
-    
-    # Get all publications with good abstracts
-    publications = db.query(Publication).filter(
-        Publication.abstract != None,
-        Publication.abstract != '',
-        Publication.abstract != 'No abstract available'
-    ).all()
-    
-    # Filter only publications with substantial abstracts
-    publications = [p for p in publications if len(p.abstract) > 100]
-    
-    if len(publications) < 10:
-        print("❌ Not enough publications for topic modeling (need at least 10 with good abstracts)")
-        return
-    
-    print(f"  Processing {len(publications)} publications...")
-    
-    # Prepare documents - combine title and abstract
-    documents = []
-    pub_ids = []
-    
-    for pub in publications:
-        # Combine title (weighted more) and abstract
-        text = f"{pub.title} {pub.title} {pub.abstract}"
-        documents.append(text)
-        pub_ids.append(pub.id)
-    
-    # Preprocess
-    print("  Preprocessing texts...")
-    cleaned_docs = [preprocess_text(doc) for doc in documents]
-    
-    # Remove empty docs
-    valid_docs = []
-    valid_pub_ids = []
-    for i, doc in enumerate(cleaned_docs):
-        if len(doc.split()) >= 10:  # At least 10 words
-            valid_docs.append(doc)
-            valid_pub_ids.append(pub_ids[i])
-    
-    if len(valid_docs) < 10:
-        print(f"❌ Not enough valid documents after preprocessing ({len(valid_docs)})")
-        return
-    
-    print(f"  Valid documents: {len(valid_docs)}")
-    
-    # Vectorize with better parameters
-    print("  Vectorizing...")
-    vectorizer = TfidfVectorizer(
-        max_features=500,
-        min_df=2,
-        max_df=0.7,
-        ngram_range=(1, 2),
-        stop_words='english'
-    )
-    
+def run_topic_modeling_process(db, profile_dir: str = None):
+    """Run improved topic modeling; with profile_dir, save a per-stage run report"""
+    profiler = RunProfiler('topic_modeling')
     try:
-        tfidf = vectorizer.fit_transform(valid_docs)
-    except ValueError as e:
-        print(f"❌ Vectorization error: {e}")
-        return
-    
-    # Dynamic topic count
-    n_topics = min(12, max(5, len(valid_docs) // 15))
-    
-    print(f"  Training LDA with {n_topics} topics...")
-    
-    # Use LDA instead of NMF for better results
-    lda = LatentDirichletAllocation(
-        n_components=n_topics,
-        max_iter=50,
-        learning_method='online',
-        random_state=42,
-        n_jobs=-1
-    )
-    
-    doc_topics = lda.fit_transform(tfidf)
-    
-    # Clear old topics
-    db.query(PublicationTopic).delete()
-    db.query(Topic).delete()
-    db.commit()
-    
-    # Extract and save topics
-    feature_names = vectorizer.get_feature_names_out()
-    
-    print(f"\n  📋 Discovered Topics:")
-    
-    for topic_idx, topic in enumerate(lda.components_):
-        # Get top keywords
-        top_indices = topic.argsort()[-10:][::-1]
-        top_keywords = [feature_names[i] for i in top_indices]
-        top_weights = topic[top_indices]
-        
-        # Filter out common/generic words
-        filtered_keywords = []
-        for kw in top_keywords:
-            if len(kw) > 3 and kw not in ['data', 'study', 'research', 'analysis', 'results']:
-                filtered_keywords.append(kw)
-        
-        if len(filtered_keywords) < 3:
-            filtered_keywords = top_keywords[:5]
-        
-        # Create descriptive name
-        descriptive_name = ' / '.join(filtered_keywords[:3]).title()
-        
-        print(f"    Topic {topic_idx + 1}: {', '.join(filtered_keywords[:5])}")
-        
-        topic_obj = Topic(
-            name=descriptive_name[:100],  # Limit length
-            keywords=json.dumps(filtered_keywords[:10])
-        )
-        db.add(topic_obj)
-        db.flush()
-        
-        # Assign publications to topics
-        for pub_idx, topic_weight in enumerate(doc_topics[:, topic_idx]):
-            if topic_weight > 0.05:  # Threshold
-                pub_topic = PublicationTopic(
-                    publication_id=valid_pub_ids[pub_idx],
-                    topic_id=topic_obj.id,
-                    probability=f"{topic_weight:.4f}"
-                )
-                db.add(pub_topic)
-    
-    db.commit()
-    print(f"\n✅ Created {n_topics} topics with LDA")
+        retrain_topics(db, profiler)
+    finally:
+        # Also on failure: a partial report still shows where time went
+        if profile_dir and profiler.stages:
+            history = load_history(profiler.run, profile_dir)
+            report = profiler.report()
+            path = save_report(report, profile_dir)
+            print_profile_report(report, history[-1] if history else None)
+            print(f"  📝 Profile saved to {path}")
 
 def get_statistics(db):
     """Get database statistics"""
     from sqlalchemy import func
     from app.models import publication_authors
     
+    # Refreshed at the end of every harvest, so current here
+    snapshot = get_analytics_snapshot()
+    if snapshot is not None:
+        totals = snapshot.totals()
+        top_authors = snapshot.top_authors(15)
+        stats = {
+            'total_publications': totals['publications'],
+            'total_authors': totals['authors'],
+            'total_topics': totals['topics'],
+            'publications_by_year': dict(snapshot.publications_by_year()),
+            'top_authors': [
+                {'name': name, 'affiliation': aff, 'publications': count}
+                for name, aff, count in top_authors
+            ],
+            'top_institutions': {}
+        }
+        for _, aff, _ in top_authors:
+            if aff:
+                inst = aff.split(',')[0][:30]
+                stats['top_institutions'][inst] = stats['top_institutions'].get(inst, 0) + 1
+        return stats
+    
     stats = {
         'total_publications': db.query(Publication).count(),
         'total_authors': db.query(Author).count(),
@@ -257,6 +135,151 @@ def get_statistics(db):
     
     return stats
 
+def run_batch(args, fetcher: OpenAlexFetcher, db, query_key: str, since, run_started):
+    """Sharded (optionally checkpointed) harvest, saved once complete"""
+    publications = fetcher.fetch_indonesian_publications(
+        limit=args.limit,
+        year_from=args.year_from,
+        year_to=args.year_to,
+        institutions=args.institutions,
+        fields=args.fields,
+        since=since,
+        since_field=args.since_field,
+        workers=args.workers,
+        shard_by=args.shard_by,
+        checkpoint_dir=args.checkpoint_dir
+    )
+    
+    complete = harvest_complete(fetcher.stats)
+    
+    if not publications and args.incremental:
+        if complete:
+            set_watermark(db, query_key, run_started, 0)
+            print("\n✅ Already up to date, no new or changed works")
+        else:
+            print("\n⚠️  Harvest had errors; watermark not advanced")
+        return
+    
+    if not publications:
+        print("\n❌ No publications found!")
+        print("\nTroubleshooting:")
+        print("  1. Try with --test to check API connection")
+        print("  2. Try increasing --limit")
+        print("  3. Try different year range")
+        return
+    
+    # Save to database
+    saved = save_to_database(
+        publications, 
+        db, 
+        run_topic_modeling=not args.no_topics,
+        profile_dir=args.profile_dir if args.profile else None
+    )
+    
+    if args.incremental:
+        if fetcher.stats['errors']:
+            print("\n⚠️  Harvest had errors; watermark not advanced")
+        elif not complete or len(publications) >= args.limit:
+            print_limit_hit(args.limit)
+        else:
+            set_watermark(db, query_key, run_started, len(publications))
+            print(f"\n🔖 Watermark for next run: {run_started.isoformat()}")
+    
+    if saved > 0:
+        print_statistics(db)
+
+def run_pipeline(args, fetcher: OpenAlexFetcher, db, query_key: str, since, run_started):
+    """Fetch -> parse -> load streaming harvest (memory independent of --limit)"""
+    print("\n🚰 Streaming pipeline: fetch -> parse/verify -> load")
+    if since:
+        print(f"  • Incremental: works {args.since_field} since {since}")
+    
+    resolver = AuthorResolver(db)
+    result = run_ingest_pipeline(
+        fetcher,
+        db,
+        limit=args.limit,
+        year_from=args.year_from,
+        year_to=args.year_to,
+        institutions=args.institutions,
+        fields=args.fields,
+        since=since,
+        since_field=args.since_field,
+        parse_workers=args.parse_workers,
+        queue_size=args.queue_size,
+        resolver=resolver
+    )
+    
+    fetcher._print_summary()
+    print_pipeline_report(result)
+    
+    # Per-institution requests that failed are only in fetcher.stats
+    complete = harvest_complete(fetcher.stats, result['errors'])
+    
+    if not result['verified'] and complete:
+        if args.incremental:
+            set_watermark(db, query_key, run_started, 0)
+            print("\n✅ Already up to date, no new or changed works")
+        else:
+            print("\n❌ No publications found!")
+        return
+    
+    saved = finish_ingest(
+        db, result['written'], resolver, run_topic_modeling=not args.no_topics,
+        profile_dir=args.profile_dir if args.profile else None
+    )
+    
+    if args.incremental:
+        if not complete:
+            print("\n⚠️  Harvest had errors; watermark not advanced")
+        elif result['verified'] >= args.limit:
+            print_limit_hit(args.limit)
+        else:
+            set_watermark(db, query_key, run_started, result['verified'])
+            print(f"\n🔖 Watermark for next run: {run_started.isoformat()}")
+    
+    if saved > 0:
+        print_statistics(db)
+
+def print_limit_hit(limit: int):
+    """The next run repeats this window from its start (cursors are not kept)"""
+    print(f"\n⚠️  Hit --limit {limit}; watermark not advanced. The next run fetches "
+          f"the same window from the start again: raise --limit to get past it")
+
+def print_statistics(db):
+    """Print database statistics after a harvest"""
+    # Show statistics
+    print("\n" + "=" * 70)
+    print("📊 DATABASE STATISTICS")
+    print("=" * 70)
+    
+    stats = get_statistics(db)
+    
+    print(f"\n📚 Total Publications: {stats['total_publications']}")
+    print(f"👥 Total Authors: {stats['total_authors']}")
+    print(f"🏷️  Total Topics: {stats['total_topics']}")
+    
+    print("\n📅 Publications by Year:")
+    for year in sorted(stats['publications_by_year'].keys(), reverse=True):
+        count = stats['publications_by_year'][year]
+        bar = "█" * (count // 10) if count > 0 else ""
+        print(f"  {year}: {count:4} {bar}")
+    
+    print("\n🏆 Top 10 Most Prolific Authors:")
+    for i, author in enumerate(stats['top_authors'][:10], 1):
+        aff = (author['affiliation'] or 'N/A')[:30]
+        print(f"  {i:2}. {author['name']:35} ({aff}) - {author['publications']} pubs")
+    
+    if stats['top_institutions']:
+        print("\n🏛️  Top Institutions (by author count):")
+        sorted_inst = sorted(
+            stats['top_institutions'].items(),
+            key=lambda x: x[1],
+            reverse=True
+        )
+        for inst, count in sorted_inst[:10]:
+            print(f"  • {inst}: {count}")
+
 def main():
     parser = argparse.ArgumentParser(
         description='Fetch Indonesian National Research Publications (IMPROVED)'
@@ -300,11 +323,75 @@ def main():
         action='store_true', 
         help='Skip topic modeling'
     )
+    parser.add_argument(
+        '--report',
+        type=str,
+        default=None,
+        help='Write a JSON run report (counts, transfer, per-request latency / retries / throttles)'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Record per-stage time / memory / matrix sizes of the topic modeling run'
+    )
+    parser.add_argument(
+        '--profile-dir',
+        type=str,
+        default=PROFILE_DIR,
+        help=f'Where --profile writes JSON run reports and history.jsonl (default: {PROFILE_DIR})'
+    )
     parser.add_argument(
         '--test', 
         action='store_true', 
         help='Test API connection only'
     )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only fetch works changed since the last successful run of this query'
+    )
+    parser.add_argument(
+        '--since',
+        type=str,
+        default=None,
+        help='Override the incremental watermark (YYYY-MM-DD)'
+    )
+    parser.add_argument(
+        '--since-field',
+        choices=['updated', 'created'],
+        default='updated',
+        help='Incremental date filter: from_updated_date or from_created_date (default: updated)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Parallel harvest workers, one date shard each (default: 1)'
+    )
+    parser.add_argument(
+        '--shard-by',
+        choices=['year', 'month'],
+        default='year',
+        help='Date shard size for parallel harvesting (default: year)'
+    )
+    parser.add_argument(
+        '--checkpoint-dir',
+        type=str,
+        default=None,
+        help='Save per-shard progress here so an interrupted harvest can resume'
+    )
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=PARSE_WORKERS,
+        help=f'Parse/verify threads in the streaming pipeline (default: {PARSE_WORKERS})'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=QUEUE_SIZE,
+        help=f'Pages buffered between pipeline stages (default: {QUEUE_SIZE})'
+    )
     
     args = parser.parse_args()
     
@@ -320,71 +407,38 @@ def main():
         fetcher.close()
         return
     
+    db = SessionLocal()
+    
     # Fetch publications
     try:
-        publications = fetcher.fetch_indonesian_publications(
-            limit=args.limit,
-            year_from=args.year_from,
-            year_to=args.year_to,
-            institutions=args.institutions,
-            fields=args.fields
+        query_key = harvest_query_key(
+            args.year_from, args.year_to, args.institutions, args.fields
         )
+        since = args.since
+        if args.incremental and not since:
+            watermark = get_watermark(db, query_key)
+            since = watermark.isoformat() if watermark else None
+            if not since:
+                print("\nℹ️  No watermark yet for this query, running a full harvest")
         
-        if not publications:
-            print("\n❌ No publications found!")
-            print("\nTroubleshooting:")
-            print("  1. Try with --test to check API connection")
-            print("  2. Try increasing --limit")
-            print("  3. Try different year range")
-            return
+        # Taken before fetching so works changed during the run are picked up next time
+        run_started = datetime.now(timezone.utc).date()
         
-        # Save to database
-        db = SessionLocal()
-        try:
-            saved = save_to_database(
-                publications, 
-                db, 
-                run_topic_modeling=not args.no_topics
-            )
-            
-            if saved > 0:
-                # Show statistics
-                print("\n" + "=" * 70)
-                print("📊 DATABASE STATISTICS")
-                print("=" * 70)
-                
-                stats = get_statistics(db)
-                
-                print(f"\n📚 Total Publications: {stats['total_publications']}")
-                print(f"👥 Total Authors: {stats['total_authors']}")
-                print(f"🏷️  Total Topics: {stats['total_topics']}")
-                
-                print("\n📅 Publications by Year:")
-                for year in sorted(stats['publications_by_year'].keys(), reverse=True):
-                    count = stats['publications_by_year'][year]
-                    bar = "█" * (count // 10) if count > 0 else ""
-                    print(f"  {year}: {count:4} {bar}")
-                
-                print("\n🏆 Top 10 Most Prolific Authors:")
-                for i, author in enumerate(stats['top_authors'][:10], 1):
-                    aff = (author['affiliation'] or 'N/A')[:30]
-                    print(f"  {i:2}. {author['name']:35} ({aff}) - {author['publications']} pubs")
-                
-                if stats['top_institutions']:
-                    print("\n🏛️  Top Institutions (by author count):")
-                    sorted_inst = sorted(
-                        stats['top_institutions'].items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )
-                    for inst, count in sorted_inst[:10]:
-                        print(f"  • {inst}: {count}")
-                
-        finally:
-            db.close()
+        # Streaming pipeline by default; sharded/checkpointed harvests still
+        # collect everything first and save at the end
+        if args.workers <= 1 and not args.checkpoint_dir:
+            run_pipeline(args, fetcher, db, query_key, since, run_started)
+        else:
+            run_batch(args, fetcher, db, query_key, since, run_started)
         
     finally:
+        db.close()
         fetcher.close()
+        if args.report:
+            # Also after a failed run: the request log shows what went wrong
+            with open(args.report, 'w') as f:
+                json.dump(fetcher.run_report(), f, indent=2)
+            print(f"\n📝 Run report saved to {args.report}")
     
     print("\n" + "=" * 70)
     print("✅ FETCHING COMPLETED!")
@@ -0,0 +1,390 @@
+# backend/scripts/generate_synthetic_data.py
+"""
+Generate and bulk-load a production-sized synthetic dataset
+
+    python scripts/generate_synthetic_data.py --publications 20000000 --workers 8
+
+Publications come from benchmarks/corpus.py (Indonesian and English
+titles/abstracts, recent-year skew). Author productivity follows Lotka's
+law, each publication gets a dominant topic (its domain) plus up to two
+secondary ones with probabilities. Rows are generated in parallel blocks,
+each seeded on its own, so the same seed gives the same data whatever the
+worker count, and loaded through COPY. MinHash signatures are not
+generated.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import io
+import json
+import time
+import argparse
+import numpy as np
+from multiprocessing import Pool
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from app.database import engine, SessionLocal
+from app.models import Publication, Author, Topic, PublicationTopic
+from app.services.authors import normalize_name, blocking_key
+from app.services.counts import refresh_count_summary
+from benchmarks.corpus import CorpusGenerator, DOMAINS, DOMAIN_TERMS
+
+SOURCE = 'SYNTHETIC'
+DOI_PREFIX = '10.5555/synthetic'
+
+# Publications per generated block (one COPY transaction each)
+BLOCK_SIZE = 10000
+
+# Lotka's law: the number of authors with n publications ~ n^-LOTKA_EXPONENT
+LOTKA_EXPONENT = 2.2
+MAX_AUTHOR_WEIGHT = 1000
+
+# Authors per publication: 1 + Poisson(mean), capped
+CO_AUTHORS_MEAN = 2.5
+MAX_AUTHORS_PER_PUBLICATION = 15
+
+# Same cut-off as the LDA topic assignment
+TOPIC_THRESHOLD = 0.05
+
+GIVEN_NAMES = ['Budi', 'Siti', 'Agus', 'Dewi', 'Rizki', 'Putri', 'Andi', 'Nur', 'Hendra', 'Ayu',
+               'Ahmad', 'Fitri', 'Eko', 'Sri', 'Bambang', 'Wahyu', 'Indah', 'Dian', 'Yusuf',
+               'Ratna', 'Arief', 'Lina', 'Fajar', 'Mega', 'Teguh', 'Rina', 'Dimas', 'Intan',
+               'Hadi', 'Kartika', 'Joko', 'Maya', 'Irfan', 'Wulan', 'Reza', 'Novi', 'Kenji',
+               'Wei', 'Anna', 'David', 'Mohd', 'Thanh']
+MIDDLE_NAMES = ['', '', '', 'Nur', 'Dwi', 'Tri', 'Adi', 'Putra', 'Sari', 'Eka', 'Budi', 'Indra',
+                'Ayu', 'Rahmat', 'Puspita', 'Surya', 'Bayu', 'Dewi']
+FAMILY_NAMES = ['Santoso', 'Rahmawati', 'Wijaya', 'Hidayat', 'Saputra', 'Lestari', 'Pratama',
+                'Kurniawan', 'Suryani', 'Nugroho', 'Setiawan', 'Wibowo', 'Siregar', 'Nasution',
+                'Lubis', 'Harahap', 'Simanjuntak', 'Sitompul', 'Rahman', 'Hakim', 'Susanto',
+                'Purnomo', 'Handayani', 'Permana', 'Firmansyah', 'Utami', 'Gunawan', 'Halim',
+                'Tanaka', 'Chen', 'Smith', 'Nguyen', 'Abdullah']
+HONORIFICS = ['', '', '', '', '', '', 'Dr. ', 'Prof. ', 'Ir. ']
+INSTITUTIONS = ['BRIN', 'Universitas Indonesia', 'Institut Teknologi Bandung', 'Universitas Gadjah Mada',
+                'IPB University', 'Institut Teknologi Sepuluh Nopember', 'Universitas Airlangga',
+                'Universitas Diponegoro', 'Universitas Padjadjaran', 'Universitas Brawijaya',
+                'Universitas Hasanuddin', 'Universitas Sumatera Utara', 'Universitas Andalas',
+                'Universitas Sebelas Maret', 'Bina Nusantara University', 'Telkom University',
+                'Universitas Negeri Malang', 'Universitas Udayana', 'Universitas Syiah Kuala',
+                'Universitas Sam Ratulangi', 'Politeknik Negeri Jakarta', 'Universitas Mulawarman']
+
+def _rows_text(rows) -> str:
+    """
+    COPY text format; generated values never contain tabs, newlines or
+    backslashes, so nothing needs escaping
+    """
+    return ''.join('\t'.join(map(str, row)) + '\n' for row in rows)
+
+def _zipf_cdf(n: int, s: float = 1.0) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return np.cumsum(weights) / weights.sum()
+
+def _pick(cdf: np.ndarray, u: np.ndarray) -> np.ndarray:
+    return np.minimum(np.searchsorted(cdf, u, side='right'), len(cdf) - 1)
+
+class SyntheticDataset:
+    """
+    Row generator for one dataset definition
+
+    Row content depends only on (seed, publications, authors); ids are
+    offset by first_publication_id / first_author_id so a dataset can be
+    appended to a non-empty database.
+    """
+
+    def __init__(
+        self,
+        publications: int,
+        authors: int,
+        topic_ids: List[int],
+        seed: int = 42,
+        first_publication_id: int = 1,
+        first_author_id: int = 1
+    ):
+        self.publications = publications
+        self.authors = authors
+        self.topic_ids = np.asarray(topic_ids)
+        self.seed = seed
+        self.first_publication_id = first_publication_id
+        self.first_author_id = first_author_id
+        self.corpus = CorpusGenerator(seed=seed, block_size=BLOCK_SIZE)
+
+        if len(topic_ids) != len(self.corpus.domains):
+            raise ValueError(f"Need one topic id per corpus domain ({len(self.corpus.domains)})")
+
+        # Selection weight of every author, Lotka distributed
+        rng = np.random.default_rng([seed, 0xA7])
+        weights = np.minimum(rng.zipf(LOTKA_EXPONENT, size=authors), MAX_AUTHOR_WEIGHT).astype(np.float64)
+        self.author_cdf = np.cumsum(weights) / weights.sum()
+
+    @property
+    def blocks(self) -> int:
+        return -(-self.publications // BLOCK_SIZE)
+
+    def author_rows(self, chunk_size: int = 100000) -> Iterator[str]:
+        """COPY chunks of (id, name, affiliation, name_key, block_key)"""
+        institution_cdf = _zipf_cdf(len(INSTITUTIONS))
+        for start in range(0, self.authors, chunk_size):
+            n = min(chunk_size, self.authors - start)
+            rng = np.random.default_rng([self.seed, 0xA8, start])
+            given = rng.integers(len(GIVEN_NAMES), size=n)
+            middle = rng.integers(len(MIDDLE_NAMES), size=n)
+            family = rng.integers(len(FAMILY_NAMES), size=n)
+            honorific = rng.integers(len(HONORIFICS), size=n)
+            # Mononyms are common in Indonesia
+            mononym = rng.random(n) < 0.08
+            institution = _pick(institution_cdf, rng.random(n))
+
+            rows = []
+            for i in range(n):
+                parts = [GIVEN_NAMES[given[i]]] if mononym[i] else [
+                    GIVEN_NAMES[given[i]], MIDDLE_NAMES[middle[i]], FAMILY_NAMES[family[i]]
+                ]
+                name = HONORIFICS[honorific[i]] + ' '.join(p for p in parts if p)
+                name_key = normalize_name(name)
+                rows.append((
+                    self.first_author_id + start + i, name, INSTITUTIONS[institution[i]],
+                    name_key, blocking_key(name_key)
+                ))
+            yield _rows_text(rows)
+
+    def block(self, index: int) -> Dict:
+        """
+        COPY data of one block of publications and their author/topic links
+
+        Returns:
+            {'publications', 'publication_authors', 'publication_topics'
+             (COPY text, COPY_COLUMNS order), 'rows': publication count}
+        """
+        start = index * BLOCK_SIZE
+        n = min(BLOCK_SIZE, self.publications - start)
+        docs = list(self.corpus.documents(n, start=start))
+        pub_ids = self.first_publication_id + start + np.arange(n)
+        rng = np.random.default_rng([self.seed, 0xB1, index])
+
+        publications = _rows_text(
+            (int(pub_id), d['title'], d['abstract'], d['year'], SOURCE, f"{DOI_PREFIX}.{pub_id}")
+            for pub_id, d in zip(pub_ids, docs)
+        )
+
+        # Authorships: prolific authors are picked more often; a repeated
+        # pick within one publication collapses into one link
+        counts = np.minimum(1 + rng.poisson(CO_AUTHORS_MEAN, size=n), MAX_AUTHORS_PER_PUBLICATION)
+        owners = np.repeat(np.arange(n), counts)
+        picked = _pick(self.author_cdf, rng.random(len(owners)))
+        pairs = np.unique(owners.astype(np.int64) * self.authors + picked)
+        links = _rows_text(zip(
+            (pub_ids[pairs // self.authors]).tolist(),
+            (self.first_author_id + pairs % self.authors).tolist()
+        ))
+
+        # Topics: the document's domain dominates, up to two other topics
+        # share the rest; weights under TOPIC_THRESHOLD are dropped like LDA
+        k = len(self.topic_ids)
+        domain_index = {name: i for i, name in enumerate(self.corpus.domains)}
+        dominant = np.array([domain_index[d['domain']] for d in docs])
+        main = rng.beta(6, 2, size=n)
+        first = rng.integers(1, k, size=n)
+        second = rng.integers(1, k - 1, size=n)
+        second += second >= first
+        split = rng.beta(2, 2, size=n)
+        secondary = rng.integers(0, 3, size=n)
+
+        topic_index = np.stack([dominant, (dominant + first) % k, (dominant + second) % k], axis=1)
+        weights = np.stack([main, (1 - main) * split, (1 - main) * (1 - split)], axis=1)
+        weights[secondary < 1, 1] = 0
+        weights[secondary < 2, 2] = 0
+        rows, slots = np.nonzero(weights > TOPIC_THRESHOLD)
+        topics = _rows_text(zip(
+            pub_ids[rows].tolist(),
+            self.topic_ids[topic_index[rows, slots]].tolist(),
+            [round(w, 4) for w in weights[rows, slots].tolist()]
+        ))
+
+        return {
+            'publications': publications,
+            'publication_authors': links,
+            'publication_topics': topics,
+            'rows': n,
+        }
+
+# Worker process state (set by _init_worker)
+_dataset: Optional[SyntheticDataset] = None
+
+def _init_worker(config: Dict):
+    global _dataset
+    _dataset = SyntheticDataset(**config)
+
+def _generate_block(index: int) -> Dict:
+    return _dataset.block(index)
+
+COPY_COLUMNS = {
+    'authors': ['id', 'name', 'affiliation', 'name_key', 'block_key'],
+    'publications': ['id', 'title', 'abstract', 'year', 'source', 'doi'],
+    'publication_authors': ['publication_id', 'author_id'],
+    'publication_topics': ['publication_id', 'topic_id', 'probability'],
+}
+
+def _copy(conn: Connection, table: str, data: str):
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(COPY_COLUMNS[table])}) FROM STDIN",
+            io.StringIO(data)
+        )
+    finally:
+        cursor.close()
+
+# Checked row by row during COPY; re-adding them validates in one pass
+_LINK_CONSTRAINTS = """
+    SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+    FROM pg_constraint
+    WHERE contype IN ('f', 'u')
+      AND conrelid IN ('publication_authors'::regclass, 'publication_topics'::regclass)
+"""
+
+def _secondary_indexes():
+    return [
+        index for table in (Publication.__table__, Author.__table__, PublicationTopic.__table__)
+        for index in table.indexes
+    ]
+
+def _drop_load_overhead(conn: Connection):
+    """Drop secondary indexes and link-table constraints; returns what to restore"""
+    indexes = _secondary_indexes()
+    for index in indexes:
+        index.drop(conn, checkfirst=True)
+    constraints = conn.execute(text(_LINK_CONSTRAINTS)).all()
+    for table, name, _ in constraints:
+        conn.execute(text(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"'))
+    return indexes, constraints
+
+def _restore_load_overhead(conn: Connection, indexes, constraints):
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+    for table, name, definition in constraints:
+        conn.execute(text(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}'))
+
+def _create_topics(conn: Connection) -> List[int]:
+    """One topic per corpus domain, keywords from the domain vocabulary"""
+    topic_ids = []
+    for domain, _ in DOMAINS:
+        topic_ids.append(conn.execute(
+            Topic.__table__.insert().values(
+                name=f"{domain.title()} (synthetic)",
+                keywords=json.dumps(DOMAIN_TERMS[domain]['en'][:10])
+            ).returning(Topic.__table__.c.id)
+        ).scalar_one())
+    return topic_ids
+
+def load_synthetic_data(
+    engine: Engine,
+    publications: int,
+    authors: int,
+    seed: int = 42,
+    workers: int = 1,
+    truncate: bool = False,
+    keep_indexes: bool = False
+) -> Dict:
+    """
+    Generate a synthetic dataset and COPY it into the database
+
+    Secondary indexes and the link tables' foreign key / unique
+    constraints are dropped during the load and rebuilt afterwards in one
+    pass each (keep_indexes=True skips that). One transaction per block.
+    """
+    started = time.perf_counter()
+
+    with engine.begin() as conn:
+        if conn.dialect.name != 'postgresql':
+            raise RuntimeError("Synthetic data is loaded through COPY and requires PostgreSQL")
+        if truncate:
+            print("🗑️  Truncating publications, authors and topics...")
+            conn.execute(text(
+                "TRUNCATE publications, authors, topics, publication_authors, publication_topics, "
+                "publication_counts, publication_signatures, publication_lsh_buckets RESTART IDENTITY"
+            ))
+        first_publication_id = conn.execute(text("SELECT coalesce(max(id), 0) + 1 FROM publications")).scalar()
+        first_author_id = conn.execute(text("SELECT coalesce(max(id), 0) + 1 FROM authors")).scalar()
+        topic_ids = _create_topics(conn)
+
+    config = {
+        'publications': publications, 'authors': authors, 'topic_ids': topic_ids, 'seed': seed,
+        'first_publication_id': first_publication_id, 'first_author_id': first_author_id,
+    }
+    dataset = SyntheticDataset(**config)
+    stats = {'publications': 0, 'authors': authors, 'topics': len(topic_ids), 'copy_seconds': 0.0}
+
+    indexes, constraints = [], []
+    if not keep_indexes:
+        with engine.begin() as conn:
+            indexes, constraints = _drop_load_overhead(conn)
+
+    try:
+        print(f"👥 Loading {authors:,} authors...")
+        for chunk in dataset.author_rows():
+            with engine.begin() as conn:
+                _copy(conn, 'authors', chunk)
+
+        print(f"📄 Loading {publications:,} publications in {dataset.blocks} blocks ({workers} workers)...")
+        load_started = time.perf_counter()
+        with Pool(workers, initializer=_init_worker, initargs=(config,)) as pool:
+            for number, block in enumerate(pool.imap(_generate_block, range(dataset.blocks)), 1):
+                copy_started = time.perf_counter()
+                with engine.begin() as conn:
+                    # Regenerable data: don't wait for the WAL flush per block
+                    conn.execute(text("SET LOCAL synchronous_commit = off"))
+                    for table in ('publications', 'publication_authors', 'publication_topics'):
+                        _copy(conn, table, block[table])
+                stats['copy_seconds'] += time.perf_counter() - copy_started
+                stats['publications'] += block['rows']
+                if number % 10 == 0 or number == dataset.blocks:
+                    rate = stats['publications'] / (time.perf_counter() - load_started)
+                    print(f"  block {number}/{dataset.blocks}: {stats['publications']:,} rows ({rate:,.0f} rows/s)")
+    finally:
+        if indexes or constraints:
+            print(f"🔧 Rebuilding {len(indexes)} indexes and {len(constraints)} constraints...")
+            with engine.begin() as conn:
+                _restore_load_overhead(conn, indexes, constraints)
+
+    with engine.begin() as conn:
+        for table in ('publications', 'authors'):
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            ))
+        conn.execute(text("ANALYZE publications, authors, publication_authors, publication_topics"))
+
+    stats['copy_seconds'] = round(stats['copy_seconds'], 2)
+    stats['seconds'] = round(time.perf_counter() - started, 2)
+    stats['rows_per_second'] = round(stats['publications'] / max(stats['seconds'], 1e-9), 1)
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate and bulk-load a synthetic dataset (PostgreSQL)')
+    parser.add_argument('--publications', type=int, default=1_000_000, help='Publications to generate (default: 1,000,000)')
+    parser.add_argument('--authors', type=int, default=None, help='Distinct authors (default: publications / 2)')
+    parser.add_argument('--seed', type=int, default=42, help='Same seed, same data (default: 42)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Generator processes (default: all CPUs)')
+    parser.add_argument('--truncate', action='store_true', help='Delete ALL existing publications, authors and topics first')
+    parser.add_argument('--keep-indexes', action='store_true', help='Load with indexes and constraints in place instead of rebuilding them afterwards')
+    args = parser.parse_args()
+
+    stats = load_synthetic_data(
+        engine,
+        publications=args.publications,
+        authors=args.authors or max(1, args.publications // 2),
+        seed=args.seed,
+        workers=args.workers,
+        truncate=args.truncate,
+        keep_indexes=args.keep_indexes
+    )
+
+    db = SessionLocal()
+    try:
+        refresh_count_summary(db)
+    finally:
+        db.close()
+
+    print(f"\n✅ {stats['publications']:,} publications, {stats['authors']:,} authors, {stats['topics']} topics")
+    print(f"⏱️  {stats['seconds']}s ({stats['rows_per_second']:,.0f} publications/s, "
+          f"{stats['copy_seconds']}s in COPY)")
@@ -1,26 +1,51 @@
 # backend/scripts/ingest_data.py
-from app.database import SessionLocal
-from app.models import Publication, Author
-from app.services.scraper import scrape_garuda_sample
-import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-def ingest_publications():
-    db = SessionLocal()
-    df = scrape_garuda_sample()
+from app.database import engine, SessionLocal
+from app.services.bulk_ingest import ingest_file, CHUNK_SIZE
+from app.services.counts import refresh_count_summary
+from app.services.analytics import refresh_analytics_snapshot
+import argparse
+
+def ingest_publications(path: str, chunk_size: int = CHUNK_SIZE, signatures: bool = True):
+    """Stream a GARUDA/SINTA CSV or Parquet dump into the database"""
+    print(f"📥 Ingesting {path} ({chunk_size} rows per chunk)...")
+    stats = ingest_file(engine, path, chunk_size=chunk_size, signatures=signatures)
     
-    for _, row in df.iterrows():
-        pub = Publication(
-            title=row['title'],
-            abstract=row['abstract'],
-            year=row['year'],
-            source=row['source'],
-            url=row.get('url', '')
-        )
-        db.add(pub)
+    db = SessionLocal()
+    try:
+        refresh_count_summary(db)
+        refresh_analytics_snapshot(db)
+    finally:
+        db.close()
     
-    db.commit()
-    db.close()
-    print(f"Ingested {len(df)} publications")
+    print(f"\n✅ {stats['inserted']} new publications from {stats['rows']} rows")
+    print(f"⏭️  {stats['duplicates']} duplicates, {stats['skipped']} rows without title")
+    print(f"👥 {stats['authors_created']} new authors, {stats['links']} author links")
+    print(f"⏱️  {stats['seconds']}s ({stats['rows_per_second']:,.0f} rows/s)")
+    return stats
 
 if __name__ == "__main__":
-    ingest_publications()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Bulk-ingest a publication dump (CSV or Parquet)')
+    parser.add_argument(
+        'path',
+        nargs='?',
+        default='data/raw/brin_publications.csv',
+        help='CSV or .parquet file (default: data/raw/brin_publications.csv)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=CHUNK_SIZE,
+        help=f'Rows per COPY/merge chunk (default: {CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--no-signatures',
+        action='store_true',
+        help='Skip MinHash signatures (faster; run migrate_database.py later to backfill)'
+    )
+    args = parser.parse_args()
+    
+    ingest_publications(args.path, args.chunk_size, signatures=not args.no_signatures)
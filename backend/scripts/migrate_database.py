@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Script untuk migrasi schema database yang sudah ada
+Setiap langkah idempotent: aman dijalankan berulang kali
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.database import engine, SessionLocal
+from app.models import PublicationCount, Author, Publication, PublicationSignature, PublicationLSHBucket, Job, HarvestWatermark
+from app.services.counts import refresh_count_summary
+from app.services.authors import normalize_name, blocking_key
+from app.services.dedup import minhash_signature
+from app.services.ingest import store_signatures
+from sqlalchemy import inspect, text
+
+def _column_type(table: str, column: str) -> str:
+    """Return the current SQL type name of a column (upper case)"""
+    inspector = inspect(engine)
+    for col in inspector.get_columns(table):
+        if col['name'] == column:
+            return str(col['type']).upper()
+    return ''
+
+def _column_names(table: str) -> set:
+    inspector = inspect(engine)
+    return {col['name'] for col in inspector.get_columns(table)}
+
+def _index_names(table: str) -> set:
+    inspector = inspect(engine)
+    return {idx['name'] for idx in inspector.get_indexes(table)}
+
+def migrate_topic_probability():
+    """publication_topics.probability: VARCHAR -> DOUBLE PRECISION + ranked index"""
+    col_type = _column_type('publication_topics', 'probability')
+
+    with engine.begin() as conn:
+        if 'CHAR' in col_type or col_type == 'TEXT':
+            print("  • Converting publication_topics.probability to float...")
+            conn.execute(text(
+                "ALTER TABLE publication_topics "
+                "ALTER COLUMN probability TYPE DOUBLE PRECISION "
+                "USING NULLIF(probability, '')::double precision"
+            ))
+        else:
+            print(f"  • probability already numeric ({col_type})")
+
+        if 'ix_publication_topics_topic_probability' not in _index_names('publication_topics'):
+            print("  • Creating index (topic_id, probability DESC, publication_id DESC)...")
+            conn.execute(text(
+                "CREATE INDEX ix_publication_topics_topic_probability "
+                "ON publication_topics (topic_id, probability DESC, publication_id DESC)"
+            ))
+
+        conn.execute(text("ANALYZE publication_topics"))
+
+def migrate_publication_counts():
+    """Create and fill the per-(year, topic) publication count summary"""
+    PublicationCount.__table__.create(bind=engine, checkfirst=True)
+
+    db = SessionLocal()
+    try:
+        refresh_count_summary(db)
+    finally:
+        db.close()
+
+def migrate_author_keys():
+    """authors: openalex_id (unique), name_key and block_key + backfill"""
+    existing = _column_names('authors')
+
+    with engine.begin() as conn:
+        for column in ['openalex_id', 'name_key', 'block_key']:
+            if column not in existing:
+                print(f"  • Adding authors.{column}...")
+                conn.execute(text(f"ALTER TABLE authors ADD COLUMN {column} VARCHAR"))
+
+        indexes = _index_names('authors')
+        if 'ix_authors_openalex_id' not in indexes:
+            conn.execute(text("CREATE UNIQUE INDEX ix_authors_openalex_id ON authors (openalex_id)"))
+        if 'ix_authors_name_key' not in indexes:
+            conn.execute(text("CREATE INDEX ix_authors_name_key ON authors (name_key)"))
+        if 'ix_authors_block_key' not in indexes:
+            conn.execute(text("CREATE INDEX ix_authors_block_key ON authors (block_key)"))
+
+    # Backfill matching keys in batches
+    db = SessionLocal()
+    try:
+        filled = 0
+        while True:
+            rows = db.query(Author.id, Author.name).filter(
+                Author.name_key == None
+            ).limit(5000).all()
+            if not rows:
+                break
+
+            updates = []
+            for author_id, name in rows:
+                key = normalize_name(name)
+                updates.append({'id': author_id, 'name_key': key, 'block_key': blocking_key(key)})
+
+            db.bulk_update_mappings(Author, updates)
+            db.commit()
+            filled += len(updates)
+
+        print(f"  • Backfilled name keys for {filled} authors")
+    finally:
+        db.close()
+
+def migrate_publication_identifiers():
+    """publications: openalex_id / doi (unique) + unique publication_authors links"""
+    existing = _column_names('publications')
+
+    with engine.begin() as conn:
+        for column in ['openalex_id', 'doi']:
+            if column not in existing:
+                print(f"  • Adding publications.{column}...")
+                conn.execute(text(f"ALTER TABLE publications ADD COLUMN {column} VARCHAR"))
+
+        # OpenAlex rows stored the work ID in url; keep it on the oldest copy
+        result = conn.execute(text(
+            "UPDATE publications p SET openalex_id = p.url "
+            "WHERE p.openalex_id IS NULL AND p.url LIKE 'https://openalex.org/W%' "
+            "AND p.id = (SELECT min(q.id) FROM publications q WHERE q.url = p.url)"
+        ))
+        print(f"  • Backfilled openalex_id for {result.rowcount} publications")
+
+        indexes = _index_names('publications')
+        if 'ix_publications_openalex_id' not in indexes:
+            conn.execute(text("CREATE UNIQUE INDEX ix_publications_openalex_id ON publications (openalex_id)"))
+        if 'ix_publications_doi' not in indexes:
+            conn.execute(text("CREATE UNIQUE INDEX ix_publications_doi ON publications (doi)"))
+
+        constraints = {
+            c['name'] for c in inspect(engine).get_unique_constraints('publication_authors')
+        }
+        if 'uq_publication_authors' not in constraints:
+            print("  • Removing duplicate author links...")
+            conn.execute(text(
+                "DELETE FROM publication_authors a USING publication_authors b "
+                "WHERE a.ctid < b.ctid AND a.publication_id = b.publication_id "
+                "AND a.author_id = b.author_id"
+            ))
+            conn.execute(text(
+                "ALTER TABLE publication_authors ADD CONSTRAINT uq_publication_authors "
+                "UNIQUE (publication_id, author_id)"
+            ))
+
+def migrate_publication_signatures():
+    """publication_signatures + publication_lsh_buckets + backfill"""
+    PublicationSignature.__table__.create(bind=engine, checkfirst=True)
+    PublicationLSHBucket.__table__.create(bind=engine, checkfirst=True)
+
+    # Backfill MinHash signatures in batches (publications without one)
+    db = SessionLocal()
+    try:
+        filled = 0
+        while True:
+            rows = db.query(
+                Publication.id, Publication.title, Publication.abstract
+            ).outerjoin(
+                PublicationSignature, PublicationSignature.publication_id == Publication.id
+            ).filter(
+                PublicationSignature.publication_id == None
+            ).limit(5000).all()
+            if not rows:
+                break
+
+            store_signatures(db, {
+                pub_id: minhash_signature(title, abstract)
+                for pub_id, title, abstract in rows
+            })
+            db.commit()
+            filled += len(rows)
+
+        print(f"  • Backfilled signatures for {filled} publications")
+    finally:
+        db.close()
+
+def migrate_title_index():
+    """Expression index on lower(title) for bulk-ingestion dedup"""
+    if 'ix_publications_title_lower' not in _index_names('publications'):
+        print("  • Creating index on lower(title)...")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE INDEX ix_publications_title_lower ON publications (lower(title))"))
+
+def migrate_jobs():
+    """jobs table for the background worker"""
+    Job.__table__.create(bind=engine, checkfirst=True)
+
+def migrate_harvest_watermarks():
+    """harvest_watermarks table for incremental harvests"""
+    HarvestWatermark.__table__.create(bind=engine, checkfirst=True)
+
+# Ordered list of migration steps - append new steps at the end
+MIGRATIONS = [
+    ('001_topic_probability_float', migrate_topic_probability),
+    ('002_publication_count_summary', migrate_publication_counts),
+    ('003_author_keys', migrate_author_keys),
+    ('004_publication_identifiers', migrate_publication_identifiers),
+    ('005_publication_signatures', migrate_publication_signatures),
+    ('006_publication_title_index', migrate_title_index),
+    ('007_jobs', migrate_jobs),
+    ('008_harvest_watermarks', migrate_harvest_watermarks),
+]
+
+def main():
+    print("=" * 70)
+    print("🗄️  DATABASE MIGRATION")
+    print("=" * 70)
+
+    for name, step in MIGRATIONS:
+        print(f"\n▶️  {name}")
+        try:
+            step()
+        except Exception as e:
+            print(f"\n❌ Migration {name} failed: {e}")
+            # Non-zero exit so deploy scripts stop here
+            sys.exit(1)
+
+    print("\n" + "=" * 70)
+    print("✅ DATABASE MIGRATION COMPLETE!")
+    print("=" * 70)
+
+if __name__ == "__main__":
+    main()
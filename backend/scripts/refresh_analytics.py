@@ -0,0 +1,46 @@
+# backend/scripts/refresh_analytics.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.analytics import ANALYTICS_DIR, read_manifest, refresh_analytics_snapshot
+import argparse
+import time
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Update the columnar snapshot behind /api/topics/trends and /api/publications/stats'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Rewrite every table (after edits, merges or deletes) instead of appending new rows'
+    )
+    parser.add_argument(
+        '--topics',
+        action='store_true',
+        help='Also rewrite topics and publication_topics'
+    )
+    parser.add_argument(
+        '--dir',
+        default=ANALYTICS_DIR,
+        help=f'Snapshot directory (default: {ANALYTICS_DIR})'
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        manifest = refresh_analytics_snapshot(db, topics=args.topics, full=args.full, snapshot_dir=args.dir)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+
+    if manifest is None:
+        manifest = read_manifest(args.dir)
+        print(f"ℹ️  Snapshot {manifest['version']} already up to date ({elapsed:.1f}s)")
+    else:
+        print(f"✅ Snapshot {manifest['version']} written in {elapsed:.1f}s")
+    for table, rows in manifest['rows'].items():
+        print(f"  {table:20} {rows:>12,} rows in {len(manifest['tables'][table])} part(s)")
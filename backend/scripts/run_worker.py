@@ -0,0 +1,58 @@
+# backend/scripts/run_worker.py
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.schemas import JOB_PARAMS
+from app.services.jobs import JOB_KINDS, POLL_INTERVAL, JobConflict, run_worker, submit_job
+import argparse
+import json
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Run queued harvest / retrain / reindex jobs (submit them via POST /api/jobs)'
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        default=2,
+        help='Jobs running at the same time, one pool process each (default: 2)'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=POLL_INTERVAL,
+        help=f'Seconds between queue polls while idle (default: {POLL_INTERVAL:g})'
+    )
+    parser.add_argument(
+        '--submit',
+        choices=JOB_KINDS,
+        default=None,
+        help='Queue a job of this kind first (e.g. from cron)'
+    )
+    parser.add_argument(
+        '--params',
+        type=str,
+        default='{}',
+        help='JSON parameters for --submit, e.g. \'{"limit": 2000, "incremental": true}\''
+    )
+    parser.add_argument(
+        '--exit-when-idle',
+        action='store_true',
+        help='Stop once no job is queued or running'
+    )
+    args = parser.parse_args()
+
+    if args.submit:
+        db = SessionLocal()
+        try:
+            params = JOB_PARAMS[args.submit](**json.loads(args.params)).model_dump(exclude_none=True)
+            job = submit_job(db, args.submit, params)
+            print(f"📥 Queued {job.kind} job {job.id}")
+        except JobConflict as e:
+            print(f"ℹ️  {e}")
+        finally:
+            db.close()
+
+    run_worker(args.processes, args.poll_interval, exit_when_idle=args.exit_when_idle)
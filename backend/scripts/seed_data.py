@@ -3,6 +3,7 @@ sys.path.append('.')
 
 from app.database import SessionLocal, engine, Base
 from app.models import Publication, Author, Topic, PublicationTopic
+from app.services.counts import refresh_count_summary
 import json
 
 # Create tables
@@ -117,11 +118,12 @@ def seed_data():
                 pub_topic = PublicationTopic(
                     publication_id=pub.id,
                     topic_id=topics[topic_id].id,
-                    probability="0.85"
+                    probability=0.85
                 )
                 db.add(pub_topic)
         
         db.commit()
+        refresh_count_summary(db)
         print("✓ Data seeding completed successfully!")
         print(f"  - {len(authors)} authors created")
         print(f"  - {len(topics)} topics created")
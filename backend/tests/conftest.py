@@ -0,0 +1,26 @@
+# backend/tests/conftest.py
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.database import Base, get_engine
+import app.models  # noqa: F401  (registers the tables on Base)
+
+@pytest.fixture(scope='session', autouse=True)
+def database_schema():
+    # The app no longer creates tables on import; the test database gets them here
+    Base.metadata.create_all(bind=get_engine())
+
+@pytest.fixture
+def sqlite_engine():
+    """Private in-memory database with every table, usable from any thread"""
+    engine = create_engine('sqlite://', poolclass=StaticPool, connect_args={'check_same_thread': False})
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def sqlite_session(sqlite_engine):
+    session = sessionmaker(bind=sqlite_engine)()
+    yield session
+    session.close()
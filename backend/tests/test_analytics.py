@@ -0,0 +1,101 @@
+# backend/tests/test_analytics.py
+import os
+import threading
+import pytest
+from app.models import Author, Publication, PublicationTopic, Topic
+from app.services import analytics
+from app.services.analytics import AnalyticsSnapshot, get_analytics_snapshot, read_manifest, refresh_analytics_snapshot
+
+pytest.importorskip('duckdb')
+
+@pytest.fixture
+def db(sqlite_session):
+    session = sqlite_session
+    topics = [Topic(name='Padi'), Topic(name='Terumbu Karang')]
+    authors = [Author(name=f'Penulis {i}', affiliation='BRIN') for i in range(3)]
+    session.add_all(topics + authors)
+    for i in range(12):
+        pub = Publication(title=f'Publikasi {i}', year=2020 + i % 3, authors=authors[:1 + i % 3])
+        session.add(pub)
+        session.flush()
+        session.add(PublicationTopic(publication_id=pub.id, topic_id=topics[i % 2].id, probability=0.8))
+    session.commit()
+    return session
+
+def _snapshot(path):
+    return AnalyticsSnapshot(str(path), read_manifest(str(path)))
+
+def test_snapshot_answers_match_the_database(db, tmp_path):
+    refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+    snapshot = _snapshot(tmp_path)
+
+    assert snapshot.totals() == {'publications': 12, 'authors': 3, 'topics': 2}
+    assert snapshot.publications_by_year() == [(2020, 4), (2021, 4), (2022, 4)]
+    assert snapshot.top_authors(2) == [('Penulis 0', 'BRIN', 12), ('Penulis 1', 'BRIN', 8)]
+    # 2020 rows are publications 0, 3, 6, 9: topics Padi, Terumbu, Padi, Terumbu
+    assert snapshot.topic_trends()[:2] == [(2020, 'Padi', 2), (2020, 'Terumbu Karang', 2)]
+
+def test_refresh_appends_new_rows_rewrites_topics_and_compacts(db, tmp_path, monkeypatch):
+    first = refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+    assert refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path)) is None
+
+    monkeypatch.setattr(analytics, 'MAX_PARTS', 2)
+    parts = []
+    for round_ in range(3):
+        db.add(Publication(title=f'Baru {round_}', year=2024, authors=[Author(name=f'Baru {round_}')]))
+        db.commit()
+        manifest = refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+        assert manifest['rows']['publications'] == 13 + round_
+        # Topic tables are only rewritten on request
+        assert manifest['tables']['topics'] == first['tables']['topics']
+        parts.append(len(manifest['tables']['publications']))
+
+    # The third part exceeds MAX_PARTS: compacted into one, then appended to again
+    assert parts == [2, 1, 2]
+    assert _snapshot(tmp_path).totals() == {'publications': 15, 'authors': 6, 'topics': 2}
+
+    db.query(PublicationTopic).delete()
+    db.commit()
+    manifest = refresh_analytics_snapshot(db, topics=True, snapshot_dir=str(tmp_path))
+    assert manifest['rows']['publication_topics'] == 0
+    assert _snapshot(tmp_path).topic_trends() == []
+
+    # Only the live and the previous version stay on disk
+    assert len([m for m in os.listdir(tmp_path) if m.startswith('manifest-')]) == 2
+    live_parts = {p for table_parts in manifest['tables'].values() for p in table_parts}
+    assert live_parts <= set(os.listdir(tmp_path / 'parts'))
+
+def test_rows_changed_below_the_high_water_mark_force_a_rewrite(db, tmp_path):
+    refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+
+    # Publication 5 is merged away, then a row with its id commits late
+    pub = db.get(Publication, 5)
+    pub.authors = []
+    db.query(PublicationTopic).filter(PublicationTopic.publication_id == 5).delete()
+    db.delete(pub)
+    db.commit()
+    manifest = refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+    assert manifest['rows']['publications'] == 11 and len(manifest['tables']['publications']) == 1
+    assert _snapshot(tmp_path).totals()['publications'] == 11
+
+    db.add(Publication(id=5, title='Terlambat', year=2019, authors=[db.get(Author, 1)]))
+    db.commit()
+    refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+    snapshot = _snapshot(tmp_path)
+    assert snapshot.totals()['publications'] == 12
+    assert snapshot.publications_by_year()[0] == (2019, 1)
+
+def test_new_versions_are_warmed_before_they_are_served(db, tmp_path):
+    refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+    live = get_analytics_snapshot(str(tmp_path))
+    assert live.totals()['publications'] == 12
+
+    db.add(Publication(title='Baru', year=2024))
+    db.commit()
+    refresh_analytics_snapshot(db, snapshot_dir=str(tmp_path))
+
+    # Still the old version while the new one is warmed in the background
+    assert get_analytics_snapshot(str(tmp_path)) is live
+    for thread in [t for t in threading.enumerate() if t.name == 'analytics-warm']:
+        thread.join(10)
+    assert get_analytics_snapshot(str(tmp_path)).totals()['publications'] == 13
@@ -12,4 +12,8 @@ def test_read_root():
 def test_get_publications():
     response = client.get("/api/publications")
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
\ No newline at end of file
+    assert isinstance(response.json(), list)
+
+def test_get_topic_publications_unknown_topic():
+    response = client.get("/api/topics/999999/publications")
+    assert response.status_code == 404
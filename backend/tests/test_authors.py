@@ -0,0 +1,95 @@
+# backend/tests/test_authors.py
+import pytest
+from app.models import Author
+from app.query_profiler import install_query_hooks, track_queries
+from app.services.authors import AuthorResolver, normalize_name, blocking_key, _compatible
+
+def _author(name, affiliation=None, openalex_id=None):
+    key = normalize_name(name)
+    return Author(name=name, affiliation=affiliation, openalex_id=openalex_id,
+                  name_key=key, block_key=blocking_key(key))
+
+@pytest.fixture
+def db(sqlite_engine, sqlite_session):
+    install_query_hooks(sqlite_engine)
+    sqlite_session.add_all([
+        _author('Siti Rahma', 'BRIN', 'https://openalex.org/A1'),
+        # Loaded before authors had IDs
+        _author('Dr. Ahmad Fauzi', 'BRIN'),
+        # Two people sharing a name
+        _author('Budi Santoso', 'ITB'),
+        _author('Budi Santoso', 'UGM'),
+    ])
+    sqlite_session.commit()
+    return sqlite_session
+
+def _by_name(db, name, affiliation=None):
+    query = db.query(Author).filter(Author.name == name)
+    if affiliation:
+        query = query.filter(Author.affiliation == affiliation)
+    return query.one()
+
+def test_normalize_name_strips_titles_degrees_and_accents():
+    assert normalize_name("Prof. Dr. Budi Santoso, M.T.") == "budi santoso"
+    assert normalize_name("Budi  Santósó") == "budi santoso"
+    assert normalize_name("Dr") == "dr"
+
+def test_blocking_key_and_compatibility():
+    assert blocking_key("ahmad budi santoso") == "santoso|a"
+    assert blocking_key("siti") == "siti|"
+    assert _compatible("a budi santoso", "ahmad budi santoso")
+    assert not _compatible("budi santoso", "bambang santoso")
+
+def test_openalex_id_matches_whatever_the_name(db):
+    resolver = AuthorResolver(db)
+    [author] = resolver.resolve([('S. Rahma', 'https://openalex.org/A1', None)])
+
+    assert author is _by_name(db, 'Siti Rahma')
+    assert resolver.stats == {'matched_id': 1, 'matched_name': 0, 'matched_fuzzy': 0, 'created': 0}
+
+def test_legacy_author_is_claimed_by_normalized_name(db):
+    resolver = AuthorResolver(db)
+    [author] = resolver.resolve([('Ahmad Fauzi, M.Si.', 'https://openalex.org/A2', 'BRIN')])
+    db.commit()
+
+    assert author is _by_name(db, 'Dr. Ahmad Fauzi')
+    assert author.openalex_id == 'https://openalex.org/A2'
+    assert db.query(Author).count() == 4
+
+    # Later works of the same author now match by ID
+    again = AuthorResolver(db)
+    assert again.resolve([('A. Fauzi', 'https://openalex.org/A2', None)]) == [author]
+    assert again.stats['matched_id'] == 1
+
+def test_namesakes_are_kept_apart_by_affiliation(db):
+    resolver = AuthorResolver(db)
+    ugm, itb, unknown, claimed = resolver.resolve([
+        ('Budi Santoso', None, 'UGM'),
+        ('Budi Santoso', None, 'ITB'),
+        # Neither namesake works here: not guessed, a new author
+        ('Budi Santoso', None, 'UI'),
+        ('Budi Santoso', 'https://openalex.org/A3', 'UGM'),
+    ])
+    db.commit()
+
+    assert ugm is _by_name(db, 'Budi Santoso', 'UGM')
+    assert itb is _by_name(db, 'Budi Santoso', 'ITB')
+    assert unknown.affiliation == 'UI' and unknown not in (ugm, itb)
+    assert claimed is ugm and ugm.openalex_id == 'https://openalex.org/A3'
+    assert db.query(Author).filter(Author.name == 'Budi Santoso').count() == 3
+
+def test_batch_costs_a_bounded_number_of_queries(db):
+    refs = [(f'Penulis {i} Santoso', f'https://openalex.org/A{100 + i}', 'BRIN') for i in range(40)]
+    refs += [('Budi Santoso', None, 'ITB'), ('Siti Rahma', None, 'BRIN')] * 20
+
+    resolver = AuthorResolver(db)
+    with track_queries('resolve', strict=True) as stats:
+        authors = resolver.resolve(refs)
+    # One lookup by ID, one by blocking key, however many refs
+    assert stats.count == 2
+    assert resolver.stats['created'] == 40
+
+    # Everything is remembered for the rest of the run
+    with track_queries('resolve again', strict=True) as stats:
+        assert resolver.resolve(refs) == authors
+    assert stats.count == 0
@@ -0,0 +1,50 @@
+# backend/tests/test_benchmarks.py
+import numpy as np
+from app.services.topic_modeling import assign_topics
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.run_benchmarks import compare
+
+def _result(case, items_per_second, peak_mib):
+    return {'case': case, 'size': '1k', 'items': 1000,
+            'items_per_second': items_per_second, 'p50_us': 1.0, 'p95_us': 2.0, 'peak_mib': peak_mib}
+
+def test_compare_flags_slowdowns_and_memory_growth_only_beyond_tolerance():
+    baseline = {'results': {
+        'fast@1k': {'items_per_second': 1000.0, 'peak_mib': 10.0},
+        'slow@1k': {'items_per_second': 1000.0, 'peak_mib': 10.0},
+        'fat@1k': {'items_per_second': 1000.0, 'peak_mib': 10.0},
+        'tiny@1k': {'items_per_second': 1000.0, 'peak_mib': 0.01},
+    }}
+    results = [
+        _result('fast', 800.0, 12.0),     # within 25%
+        _result('slow', 700.0, 10.0),     # 30% slower
+        _result('fat', 1000.0, 13.0),     # 30% more memory
+        _result('tiny', 1000.0, 0.5),     # under the absolute memory floor
+        _result('new', 1.0, 100.0),       # not in the baseline
+    ]
+
+    regressions = compare(results, baseline, tolerance=0.25)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith('slow@1k')
+    assert regressions[1].startswith('fat@1k')
+
+def test_corpus_is_deterministic_per_block():
+    corpus = CorpusGenerator(seed=7, block_size=50)
+    docs = list(corpus.documents(100))
+
+    assert docs == list(CorpusGenerator(seed=7, block_size=50).documents(100))
+    assert docs[50:] == list(corpus.documents(50, start=50))
+    assert {d['language'] for d in docs} == {'en', 'id'}
+    assert docs != list(CorpusGenerator(seed=8, block_size=50).documents(100))
+
+def test_assign_topics_keeps_weights_above_threshold():
+    doc_topics = np.array([[0.5, 0.05], [0.12345, 0.2]])
+
+    rows = assign_topics(doc_topics, [10, 11], [1, 2], threshold=0.1)
+
+    assert rows == [
+        {'publication_id': 10, 'topic_id': 1, 'probability': 0.5},
+        {'publication_id': 11, 'topic_id': 1, 'probability': 0.1235},
+        {'publication_id': 11, 'topic_id': 2, 'probability': 0.2},
+    ]
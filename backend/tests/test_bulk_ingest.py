@@ -0,0 +1,88 @@
+# backend/tests/test_bulk_ingest.py
+import pandas as pd
+import pytest
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.database import get_engine
+from app.models import Author, Publication, PublicationLSHBucket, PublicationSignature, publication_authors
+from app.services.bulk_ingest import ingest_file, prepare_chunk
+
+def test_prepare_chunk_normalizes_rows_and_splits_authors():
+    chunk = pd.DataFrame({
+        'title': ['  Padi dan Irigasi ', '', 'Vaksin'],
+        'year': [2021, 2022, None],
+        'doi': ['https://doi.org/10.1/ABC', None, ''],
+        'authors': ['Dr. Budi Santoso; Siti Rahma', 'X', None],
+        'affiliations': ['UI; ', 'ITB', None],
+    })
+
+    pubs, authors = prepare_chunk(chunk, first_row=100)
+
+    assert list(pubs['row_no']) == [100, 101]
+    assert list(pubs['title']) == ['Padi dan Irigasi', 'Vaksin']
+    assert pubs['doi'].iloc[0] == '10.1/abc' and pd.isna(pubs['doi'].iloc[1])
+    assert list(pubs['source']) == ['GARUDA', 'GARUDA']
+
+    assert list(authors['name_key']) == ['budi santoso', 'siti rahma']
+    assert list(authors['block_key']) == ['santoso|b', 'rahma|s']
+    assert authors['affiliation'].iloc[0] == 'UI' and pd.isna(authors['affiliation'].iloc[1])
+
+def test_prepare_chunk_aligns_author_ids():
+    chunk = pd.DataFrame({
+        'title': ['Gempa'],
+        'authors': ['Budi Santoso; Siti Rahma'],
+        'author_ids': [' ; https://openalex.org/A2'],
+    })
+
+    _, authors = prepare_chunk(chunk, first_row=0)
+
+    assert pd.isna(authors['openalex_id'].iloc[0])
+    assert authors['openalex_id'].iloc[1] == 'https://openalex.org/A2'
+
+@pytest.fixture
+def postgres():
+    engine = get_engine()
+    if engine.dialect.name != 'postgresql':
+        pytest.skip("bulk ingestion needs PostgreSQL (COPY)")
+    yield engine
+    with engine.begin() as conn:
+        ids = select(Publication.id).where(Publication.title.like('bulk-test %')).scalar_subquery()
+        conn.execute(delete(publication_authors).where(publication_authors.c.publication_id.in_(ids)))
+        conn.execute(delete(PublicationLSHBucket).where(PublicationLSHBucket.publication_id.in_(ids)))
+        conn.execute(delete(PublicationSignature).where(PublicationSignature.publication_id.in_(ids)))
+        conn.execute(delete(Publication).where(Publication.title.like('bulk-test %')))
+        conn.execute(delete(Author).where(Author.name_key.like('bulktest %')))
+
+def test_ingest_file_dedups_across_doi_and_resolves_authors_like_the_api(postgres, tmp_path):
+    with Session(postgres) as db:
+        db.add_all([
+            Author(name='Bulktest Budi', affiliation='UI', name_key='bulktest budi', block_key='budi|b'),
+            Author(name='Bulktest Budi', affiliation='ITB', name_key='bulktest budi', block_key='budi|b'),
+            Author(name='Bulktest Siti', openalex_id='https://openalex.org/A-bulktest',
+                   name_key='bulktest siti', block_key='siti|b'),
+        ])
+        db.commit()
+
+    path = tmp_path / 'dump.csv'
+    pd.DataFrame({
+        'title': ['bulk-test Padi', 'bulk-test padi', 'bulk-test Karang'],
+        'year': [2021, 2021, 2022],
+        'doi': ['10.1/bulktest', None, None],
+        'authors': ['Bulktest Budi; Bulktest Sitti', 'Bulktest Budi', 'Bulktest Budi'],
+        'affiliations': ['ITB; BRIN', 'ITB', 'UGM'],
+        'author_ids': [' ; https://openalex.org/A-bulktest', '', ''],
+    }).to_csv(path, index=False)
+
+    stats = ingest_file(postgres, str(path), signatures=False)
+
+    # The row without DOI is the same work as the DOI row
+    assert stats['inserted'] == 2 and stats['duplicates'] == 1
+    with Session(postgres) as db:
+        padi = db.query(Publication).filter(Publication.doi == '10.1/bulktest').one()
+        karang = db.query(Publication).filter(Publication.title == 'bulk-test Karang').one()
+        # Affiliation picks between the two Budis; the ID wins over the spelling
+        assert sorted((a.name, a.affiliation) for a in padi.authors) == [
+            ('Bulktest Budi', 'ITB'), ('Bulktest Siti', None)]
+        # Two candidates and no matching affiliation: ambiguous, so a new author
+        assert [(a.affiliation, a.id > 0) for a in karang.authors] == [('UGM', True)]
+        assert stats['authors_created'] == 1
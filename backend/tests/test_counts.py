@@ -0,0 +1,24 @@
+# backend/tests/test_counts.py
+from app.services import counts
+
+def test_count_cache_is_bounded_and_drops_expired_entries(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(counts.time, 'monotonic', lambda: clock[0])
+    monkeypatch.setattr(counts, 'CACHE_MAX_ENTRIES', 3)
+    counts.clear_count_cache()
+
+    for term in ('padi', 'karang', 'iklim', 'gempa'):
+        counts._cache_count((0, 0, term), 10, True)
+    # Least recently used signature is evicted first
+    assert list(counts._count_cache) == [(0, 0, 'karang'), (0, 0, 'iklim'), (0, 0, 'gempa')]
+
+    assert counts._cached_count((0, 0, 'karang')) == (10, True)
+    counts._cache_count((0, 0, 'banjir'), 5, False)
+    assert (0, 0, 'karang') in counts._count_cache and (0, 0, 'iklim') not in counts._count_cache
+
+    clock[0] += counts.CACHE_TTL + 1
+    assert counts._cached_count((0, 0, 'gempa')) is None
+    assert (0, 0, 'gempa') not in counts._count_cache
+    counts._cache_count((0, 0, 'longsor'), 1, False)
+    assert list(counts._count_cache) == [(0, 0, 'longsor')]
+    counts.clear_count_cache()
@@ -0,0 +1,24 @@
+# backend/tests/test_dedup.py
+from app.services.dedup import NearDuplicateIndex, minhash_signature, estimate_similarity
+
+ABSTRACT = (
+    "We study rice yield prediction in Central Java using satellite imagery "
+    "and rainfall records from 2010 to 2020. A gradient boosting model trained "
+    "on district level data outperforms linear baselines and identifies "
+    "irrigation coverage as the strongest predictor of yield variability."
+)
+
+def test_signature_ignores_case_punctuation_and_accents():
+    a = minhash_signature("Rice Yield Prediction in Central Java", ABSTRACT)
+    b = minhash_signature("RICE YIELD PREDICTION IN CENTRAL JAVA.", ABSTRACT.replace(",", ""))
+    c = minhash_signature("Deep learning for Indonesian sign language", "A new dataset of gestures.")
+    assert estimate_similarity(a, b) == 1.0
+    assert estimate_similarity(a, c) < 0.2
+
+def test_index_flags_near_duplicates_only():
+    index = NearDuplicateIndex()
+    assert index.check_and_add("W1", "Rice yield prediction in Central Java", ABSTRACT) is None
+    preprint = ABSTRACT + " Code and data are available on request."
+    assert index.check_and_add("W2", "Rice yield prediction in Central Java", preprint) == "W1"
+    assert index.check_and_add("W3", "Deep learning for Indonesian sign language", "Gestures.") is None
+    assert len(index) == 2
@@ -0,0 +1,73 @@
+# backend/tests/test_export.py
+import csv
+import io
+import json
+import pytest
+from fastapi.testclient import TestClient
+from app.database import SessionLocal
+from app.main import app
+from app.models import Author, Publication
+from app.services import export
+from app.services.export import EXPORT_COLUMNS, build_export_query, stream_export
+
+ROWS = 10
+BATCH = 4  # 4 + 4 + 2: two full batches and a partial one
+
+@pytest.fixture
+def db(sqlite_session):
+    author = Author(name='Budi Santoso')
+    sqlite_session.add_all(
+        Publication(title=f'Publikasi {i}', abstract='"kutipan", baris\nbaru', year=2020 + i % 3,
+                    source='GARUDA', url='', authors=[author] if i % 2 else [])
+        for i in range(ROWS)
+    )
+    sqlite_session.commit()
+    return sqlite_session
+
+def _export(db, fmt):
+    return list(stream_export(db, build_export_query('sqlite'), fmt, batch_size=BATCH))
+
+def _expected_titles():
+    return [f'Publikasi {i}' for i in range(ROWS)]
+
+def test_csv_export_has_every_row_across_batches(db):
+    chunks = _export(db, 'csv')
+    assert len(chunks) == 3
+
+    rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert rows[0] == EXPORT_COLUMNS
+    assert [r[1] for r in rows[1:]] == _expected_titles()
+    assert rows[2][2] == '"kutipan", baris\nbaru' and rows[2][6] == 'Budi Santoso'
+
+def test_ndjson_export_has_every_row_across_batches(db):
+    chunks = _export(db, 'ndjson')
+    assert len(chunks) == 3
+
+    records = [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()]
+    assert [r['title'] for r in records] == _expected_titles()
+    assert [r['id'] for r in records] == sorted(r['id'] for r in records)
+
+def test_parquet_export_has_every_row_across_batches(db):
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    table = pq.ParquetFile(io.BytesIO(b''.join(_export(db, 'parquet'))))
+    assert table.metadata.num_row_groups == 3
+    assert table.read().column('title').to_pylist() == _expected_titles()
+
+def test_export_endpoint_streams_every_matching_row(monkeypatch):
+    monkeypatch.setattr(export, 'BATCH_SIZE', BATCH)
+    session = SessionLocal()
+    pubs = [Publication(title=f'ekspor-uji {i}', year=2021) for i in range(ROWS)]
+    session.add_all(pubs)
+    session.commit()
+    try:
+        response = TestClient(app).get('/api/publications/export',
+                                       params={'format': 'ndjson', 'search': 'ekspor-uji'})
+        assert response.status_code == 200
+        titles = [json.loads(line)['title'] for line in response.text.splitlines()]
+        assert sorted(titles) == sorted(f'ekspor-uji {i}' for i in range(ROWS))
+    finally:
+        for pub in pubs:
+            session.delete(pub)
+        session.commit()
+        session.close()
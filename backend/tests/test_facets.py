@@ -0,0 +1,36 @@
+# backend/tests/test_facets.py
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.models import Author, Publication, PublicationTopic, Topic
+from app.services.facets import compute_facets
+
+def test_facets_count_each_publication_once_per_value():
+    db = SessionLocal()
+    marker = 'facet-test'
+    topics = [Topic(name=f'{marker} {i}', keywords='[]') for i in range(2)]
+    authors = [Author(name=f'Penulis {i}', affiliation=f'{marker} Univ {i % 2}') for i in range(3)]
+    pubs = [Publication(title=f'{marker} {i}', year=2020 + i % 2) for i in range(3)]
+    # Every publication has both topics and all three authors: a joined
+    # source would see 2 x 3 rows per publication
+    for pub in pubs:
+        pub.authors = authors
+    db.add_all(topics + authors + pubs)
+    db.flush()
+    db.add_all(PublicationTopic(publication_id=p.id, topic_id=t.id, probability=0.5) for p in pubs for t in topics)
+    db.commit()
+
+    try:
+        filtered = select(Publication.id, Publication.year).where(Publication.title.like(f'{marker}%'))
+        result = compute_facets(db, filtered)
+        assert result['total'] == 3
+        assert result['facets']['year'] == [{'value': 2021, 'count': 1}, {'value': 2020, 'count': 2}]
+        assert sorted((t['name'], t['count']) for t in result['facets']['topic']) == [
+            (f'{marker} 0', 3), (f'{marker} 1', 3)]
+        assert sorted((i['value'], i['count']) for i in result['facets']['institution']) == [
+            (f'{marker} Univ 0', 3), (f'{marker} Univ 1', 3)]
+    finally:
+        db.query(PublicationTopic).filter(PublicationTopic.publication_id.in_([p.id for p in pubs])).delete()
+        for obj in pubs + authors + topics:
+            db.delete(obj)
+        db.commit()
+        db.close()
@@ -0,0 +1,131 @@
+# backend/tests/test_fetch_openalex_data.py
+import argparse
+import os
+from datetime import date
+import httpx
+import pytest
+from app.database import SessionLocal
+from app.models import HarvestWatermark
+from app.services import openalex_fetcher
+from app.services.openalex_fetcher import OpenAlexFetcher
+from benchmarks.record_fixtures import synthetic_pages
+from scripts import fetch_openalex_data
+from scripts.fetch_openalex_data import run_batch, run_pipeline
+
+QUERY_KEY = 'test-run-batch'
+
+class StubFetcher:
+    """Returns `publications` and reports the given errors / unfinished shards"""
+
+    def __init__(self, publications, errors=(), incomplete_shards=()):
+        self.publications = publications
+        self.stats = {'errors': list(errors), 'incomplete_shards': list(incomplete_shards)}
+
+    def fetch_indonesian_publications(self, **kwargs):
+        return self.publications
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Publications handed to save_to_database, per run"""
+    runs = []
+    monkeypatch.setattr(fetch_openalex_data, 'save_to_database',
+                        lambda pubs, db, **kw: runs.append(pubs) or len(pubs))
+    return runs
+
+@pytest.fixture
+def db(saved, monkeypatch):
+    monkeypatch.setattr(fetch_openalex_data, 'print_statistics', lambda db: None)
+    session = SessionLocal()
+    yield session
+    session.query(HarvestWatermark).filter(HarvestWatermark.query_key == QUERY_KEY).delete()
+    session.commit()
+    session.close()
+
+def _args(limit=100, year_to=2021, checkpoint_dir=None):
+    return argparse.Namespace(
+        limit=limit, year_from=2020, year_to=year_to, institutions=None, fields=None,
+        since_field='updated', workers=2, shard_by='year', checkpoint_dir=checkpoint_dir,
+        parse_workers=2, queue_size=4,
+        incremental=True, no_topics=True, profile=False, profile_dir=None
+    )
+
+def _watermark(db):
+    db.expire_all()
+    row = db.get(HarvestWatermark, QUERY_KEY)
+    return row.watermark if row else None
+
+@pytest.mark.parametrize('fetcher', [
+    StubFetcher([], errors=[{'shard': '2020-01-01..2020-12-31', 'error': 'timeout'}]),
+    StubFetcher([{'title': 'A'}], errors=[{'status': 502}]),
+    StubFetcher([{'title': 'A'}], incomplete_shards=['2021-01-01..2021-12-31']),
+])
+def test_failed_or_unfinished_harvest_keeps_the_watermark(db, fetcher):
+    run_batch(_args(), fetcher, db, QUERY_KEY, '2024-01-01', date(2024, 6, 1))
+    assert _watermark(db) is None
+
+@pytest.mark.parametrize('publications', [[], [{'title': 'A'}]])
+def test_complete_harvest_advances_the_watermark(db, publications):
+    run_batch(_args(), StubFetcher(publications), db, QUERY_KEY, '2024-01-01', date(2024, 6, 1))
+    assert _watermark(db) == date(2024, 6, 1)
+
+def test_interrupted_shard_resumes_from_its_checkpoint(db, saved, tmp_path, monkeypatch):
+    monkeypatch.setattr(openalex_fetcher.time, 'sleep', lambda seconds: None)
+    pages = synthetic_pages(3, 20)
+    next_cursor = {'*': 'c1', 'c1': 'c2', 'c2': None}
+    requested = []
+    failing = {'c2'}
+
+    def handler(request):
+        cursor = request.url.params.get('cursor')
+        if cursor is None:  # per-institution fallback
+            return httpx.Response(200, json={'results': []})
+        requested.append(cursor)
+        if cursor in failing:
+            return httpx.Response(500)
+        page = pages[['*', 'c1', 'c2'].index(cursor)]
+        return httpx.Response(200, json={'results': page, 'meta': {'next_cursor': next_cursor[cursor]}})
+
+    def fetcher():
+        f = OpenAlexFetcher(requests_per_second=1000.0)
+        f.session = httpx.Client(transport=httpx.MockTransport(handler))
+        return f
+
+    checkpoints = tmp_path / 'checkpoints'
+    args = _args(limit=1000, year_to=2020, checkpoint_dir=str(checkpoints))
+
+    run_batch(args, fetcher(), db, QUERY_KEY, '2024-01-01', date(2024, 6, 1))
+    assert _watermark(db) is None
+    # The first two pages are saved; the shard's checkpoint is kept for the next run
+    first_run = saved[0]
+    assert first_run and os.listdir(checkpoints)
+
+    failing.clear()
+    requested.clear()
+    run_batch(args, fetcher(), db, QUERY_KEY, '2024-01-01', date(2024, 6, 1))
+
+    # Only the page that failed is fetched again
+    assert requested == ['c2']
+    assert _watermark(db) == date(2024, 6, 1)
+    assert not os.listdir(checkpoints)
+    resumed = saved[1]
+    assert [p['openalex_id'] for p in resumed[:len(first_run)]] == [p['openalex_id'] for p in first_run]
+    parsed = OpenAlexFetcher().parse_page([w for page in pages for w in page])
+    assert [p['openalex_id'] for p in resumed] == [p['openalex_id'] for p in parsed]
+
+def test_failed_institution_requests_keep_the_pipeline_watermark(db, monkeypatch):
+    monkeypatch.setattr(openalex_fetcher.time, 'sleep', lambda seconds: None)
+    monkeypatch.setattr(fetch_openalex_data, 'finish_ingest', lambda db, stats, resolver, **kw: 0)
+
+    def handler(request):
+        if 'cursor' in request.url.params:  # country-wide pages: nothing new
+            return httpx.Response(200, json={'results': [], 'meta': {'next_cursor': None}})
+        return httpx.Response(500)  # per-institution fallback
+
+    fetcher = OpenAlexFetcher(requests_per_second=1000.0)
+    fetcher.session = httpx.Client(transport=httpx.MockTransport(handler))
+
+    run_pipeline(_args(), fetcher, db, QUERY_KEY, '2024-01-01', date(2024, 6, 1))
+
+    # The fetch stage catches these, so they are not among the pipeline errors
+    assert fetcher.stats['errors']
+    assert _watermark(db) is None
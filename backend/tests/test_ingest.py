@@ -0,0 +1,61 @@
+# backend/tests/test_ingest.py
+import pytest
+from app.models import Publication
+from app.services.ingest import upsert_publications
+
+PADI = (
+    "We study rice yield prediction in Central Java using satellite imagery "
+    "and rainfall records from 2010 to 2020. A gradient boosting model trained "
+    "on district level data outperforms linear baselines and identifies "
+    "irrigation coverage as the strongest predictor of yield variability."
+)
+KARANG = (
+    "Coral reef cover along the Bali coast was surveyed at forty sites. "
+    "Bleaching after the 2016 heat wave was followed by partial recovery, "
+    "fastest where fishing pressure and sediment runoff were lowest."
+)
+GEMPA = (
+    "Ground motion records of the 2018 Palu earthquake are used to calibrate "
+    "a liquefaction hazard map for Central Sulawesi settlements."
+)
+
+@pytest.fixture
+def db(sqlite_session):
+    # Loaded from a CSV dump: DOI but no OpenAlex id yet
+    sqlite_session.add(Publication(title='Legacy row', doi='10.1/legacy', year=2019, source='GARUDA'))
+    sqlite_session.commit()
+    return sqlite_session
+
+def _work(oid, title, abstract, doi=None, authors=('Budi Santoso',)):
+    return {
+        'openalex_id': oid and f'https://openalex.org/{oid}', 'doi': doi, 'title': title,
+        'abstract': abstract, 'year': 2021, 'source': 'OpenAlex',
+        'authors': list(authors), 'author_ids': [], 'affiliations': ['BRIN'] * len(authors),
+    }
+
+def test_upsert_inserts_updates_claims_dois_and_skips_duplicates(db):
+    first = upsert_publications(db, [
+        _work('W1', 'Rice yield prediction', PADI, doi='10.1/padi', authors=('Budi Santoso', 'Siti Rahma')),
+        _work('W2', 'Gempa Palu', GEMPA, doi='https://doi.org/10.1/LEGACY'),
+        _work('W3', 'Rice yield prediction', PADI + ' Code and data are available on request.'),
+        _work(None, 'No OpenAlex id', KARANG),
+        _work('W5', 'Same DOI as W1', KARANG, doi='10.1/PADI'),
+    ])
+
+    # W2 claimed the CSV row holding its DOI and updated it instead of inserting
+    assert first == {'inserted': 1, 'updated': 1, 'unchanged': 0, 'skipped': 2, 'near_duplicates': 1}
+    legacy = db.query(Publication).filter(Publication.doi == '10.1/legacy').one()
+    assert legacy.openalex_id == 'https://openalex.org/W2' and legacy.title == 'Gempa Palu'
+
+    second = upsert_publications(db, [
+        _work('W1', 'Rice yield prediction', PADI, doi='10.1/padi'),
+        _work('W2', 'Gempa Palu', GEMPA + ' Revised.', doi='10.1/legacy'),
+        _work('W6', 'Coral reef recovery', KARANG),
+        _work('W7', 'DOI owned by W1', GEMPA, doi='10.1/padi'),
+    ])
+
+    assert second == {'inserted': 1, 'updated': 1, 'unchanged': 1, 'skipped': 1, 'near_duplicates': 0}
+    assert db.query(Publication).count() == 3
+    padi = db.query(Publication).filter(Publication.openalex_id == 'https://openalex.org/W1').one()
+    assert sorted(a.name for a in padi.authors) == ['Budi Santoso', 'Siti Rahma']
+    assert db.query(Publication).filter(Publication.id == legacy.id).one().abstract.endswith('Revised.')
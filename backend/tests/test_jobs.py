@@ -0,0 +1,167 @@
+# backend/tests/test_jobs.py
+import json
+import multiprocessing
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.database import SessionLocal
+from app.main import app
+from app.models import HarvestWatermark, Job
+from app.services import jobs, openalex_fetcher
+from app.services.jobs import JobConflict, JobContext, cancel_job, claim_next_job, execute_job, finish_job, run_harvest, run_worker, submit_job
+from app.services.watermarks import harvest_query_key
+
+client = TestClient(app)
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    session.query(Job).delete()
+    session.commit()
+    yield session
+    session.query(Job).delete()
+    session.commit()
+    session.close()
+
+def test_one_queued_and_one_running_job_per_kind(db):
+    first = submit_job(db, 'harvest', {'limit': 10})
+    with pytest.raises(JobConflict):
+        submit_job(db, 'harvest')
+
+    assert claim_next_job(db, 'w1').id == first.id
+    second = submit_job(db, 'harvest')
+    reindex = submit_job(db, 'reindex')
+
+    # The second harvest waits for the first; other kinds are not blocked
+    assert claim_next_job(db, 'w1').id == reindex.id
+    assert claim_next_job(db, 'w1') is None
+
+    assert cancel_job(db, second).status == 'cancelled'
+    running = cancel_job(db, first)
+    assert running.status == 'running' and running.cancel_requested
+    with pytest.raises(JobConflict):
+        cancel_job(db, second)
+
+def test_retrain_and_reindex_never_run_together(db):
+    retrain = submit_job(db, 'retrain')
+    reindex = submit_job(db, 'reindex')
+    harvest = submit_job(db, 'harvest')
+
+    assert claim_next_job(db, 'w1').id == retrain.id
+    # reindex is older than harvest but must wait for the retrain
+    assert claim_next_job(db, 'w2').id == harvest.id
+    assert claim_next_job(db, 'w2') is None
+
+    finish_job(retrain.id, 'succeeded')
+    assert claim_next_job(db, 'w2').id == reindex.id
+
+def test_finish_job_leaves_jobs_finished_elsewhere_alone(db):
+    job = submit_job(db, 'harvest')
+    claim_next_job(db, 'w1')
+    finish_job(job.id, 'failed', error='Worker stopped')
+    finish_job(job.id, 'succeeded', result={'late': True})
+
+    db.refresh(job)
+    assert job.status == 'failed' and job.error == 'Worker stopped' and job.result is None
+
+def test_execute_job_stores_result_error_or_cancellation(db, monkeypatch):
+    def ok(ctx, params):
+        ctx.progress('working', force=True)
+        return {'echo': params}
+
+    def boom(ctx, params):
+        raise RuntimeError('no abstracts')
+
+    def cancelled(ctx, params):
+        session = SessionLocal()
+        session.query(Job).filter(Job.id == ctx.job_id).update({'cancel_requested': True})
+        session.commit()
+        session.close()
+        ctx.progress('stage 2', force=True)
+        raise AssertionError('progress() should have raised JobCancelled')
+
+    outcomes = {}
+    for kind, handler in (('harvest', ok), ('retrain', boom), ('reindex', cancelled)):
+        monkeypatch.setitem(jobs.JOB_HANDLERS, kind, handler)
+        job = submit_job(db, kind, {'n': 1})
+        claim_next_job(db, 'w1')
+        execute_job(job.id)
+        db.refresh(job)
+        outcomes[kind] = job
+
+    assert outcomes['harvest'].status == 'succeeded'
+    assert json.loads(outcomes['harvest'].result) == {'echo': {'n': 1}}
+    assert outcomes['harvest'].progress == 'working'
+    assert outcomes['retrain'].status == 'failed' and 'no abstracts' in outcomes['retrain'].error
+    assert outcomes['reindex'].status == 'cancelled' and outcomes['reindex'].progress == 'stage 2'
+
+def test_harvest_with_failed_requests_keeps_the_watermark(db, monkeypatch):
+    monkeypatch.setattr(openalex_fetcher.time, 'sleep', lambda seconds: None)
+    real_fetcher = openalex_fetcher.OpenAlexFetcher
+
+    def handler(request):
+        if 'cursor' in request.url.params:  # country-wide pages: nothing new
+            return httpx.Response(200, json={'results': [], 'meta': {'next_cursor': None}})
+        return httpx.Response(500)  # per-institution fallback
+
+    def fetcher(**kwargs):
+        f = real_fetcher(requests_per_second=1000.0, **kwargs)
+        f.session = httpx.Client(transport=httpx.MockTransport(handler))
+        return f
+    monkeypatch.setattr(openalex_fetcher, 'OpenAlexFetcher', fetcher)
+
+    job = submit_job(db, 'harvest')
+    query_key = harvest_query_key(1999, 1999)
+    params = {'incremental': True, 'year_from': 1999, 'year_to': 1999, 'retrain': False}
+    try:
+        result = run_harvest(JobContext(job.id), params)
+        assert result['requests']['failed'] and not result['errors']
+        assert db.get(HarvestWatermark, query_key) is None
+    finally:
+        db.query(HarvestWatermark).filter(HarvestWatermark.query_key == query_key).delete()
+        db.commit()
+
+def test_jobs_api_submit_inspect_cancel(db):
+    created = client.post('/api/jobs/', json={'kind': 'retrain'})
+    assert created.status_code == 202
+    job_id = created.json()['id']
+
+    assert client.post('/api/jobs/', json={'kind': 'retrain'}).status_code == 409
+    assert client.post('/api/jobs/', json={'kind': 'harvest', 'params': {'limit': 0}}).status_code == 422
+    assert client.post('/api/jobs/', json={'kind': 'retrain', 'params': {'x': 1}}).status_code == 422
+    assert client.post('/api/jobs/', json={'kind': 'compile'}).status_code == 422
+
+    assert client.get(f'/api/jobs/{job_id}').json()['status'] == 'queued'
+    assert [j['id'] for j in client.get('/api/jobs/', params={'kind': 'retrain'}).json()] == [job_id]
+
+    assert client.post(f'/api/jobs/{job_id}/cancel').json()['status'] == 'cancelled'
+    assert client.post(f'/api/jobs/{job_id}/cancel').status_code == 409
+    assert client.get('/api/jobs/999999').status_code == 404
+
+def test_worker_runs_jobs_in_pool_processes(db, tmp_path, monkeypatch):
+    # Pool processes are spawned and read their settings from the environment
+    monkeypatch.setenv('SIMILARITY_INDEX_DIR', str(tmp_path / 'similarity'))
+    monkeypatch.setenv('ANALYTICS_DIR', str(tmp_path / 'analytics'))
+    job = submit_job(db, 'reindex')
+
+    run_worker(processes=1, poll_interval=0.1, exit_when_idle=True)
+
+    db.refresh(job)
+    assert job.status == 'succeeded', job.error
+    assert job.worker and job.finished_at >= job.started_at
+    assert json.loads(job.result)['profile']['run'] == 'reindex'
+
+def test_interrupted_worker_stops_its_pool_processes(db, tmp_path, monkeypatch):
+    monkeypatch.setenv('SIMILARITY_INDEX_DIR', str(tmp_path / 'similarity'))
+    monkeypatch.setenv('ANALYTICS_DIR', str(tmp_path / 'analytics'))
+    job = submit_job(db, 'reindex')
+
+    def interrupt(futures, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(jobs, 'wait', interrupt)
+
+    run_worker(processes=1, poll_interval=0.1)
+
+    db.refresh(job)
+    assert job.status == 'failed' and job.error == 'Worker stopped'
+    assert not multiprocessing.active_children()
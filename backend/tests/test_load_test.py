@@ -0,0 +1,42 @@
+# backend/tests/test_load_test.py
+import asyncio
+import random
+import httpx
+from benchmarks.load_test import MIX, Targets, build_request, compare, run_load
+
+TARGETS = Targets(publication_ids=[1, 2], years=[2021], topic_ids=[7], terms=['padi'], total_publications=2)
+
+def test_every_request_type_builds_a_frontend_call():
+    rng = random.Random(0)
+    for name in MIX:
+        path, params = build_request(name, rng, TARGETS)
+        assert path.startswith('/api/')
+    assert build_request('detail', rng, TARGETS)[0] in ('/api/publications/1', '/api/publications/2')
+    assert build_request('search', rng, TARGETS)[1]['q'] in ('pa', 'pad', 'padi')
+
+def test_run_load_counts_requests_and_errors_per_type():
+    def handler(request):
+        return httpx.Response(500 if request.url.path == '/api/topics/trends' else 200, json={})
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url='http://test') as client:
+            return await run_load(client, TARGETS, duration=0.3, concurrency=2)
+
+    result = asyncio.run(run())
+
+    assert result['requests'] > 0
+    assert set(result['endpoints']) <= set(MIX)
+    trends = result['endpoints'].get('trends')
+    assert trends is None or trends['error_rate'] == 1.0
+    assert result['errors'] == (trends['requests'] if trends else 0)
+
+def test_compare_flags_slower_runs_of_the_same_scenario_only():
+    baseline = {'scenarios': {'concurrency=16': {'throughput': 100.0, 'p95_ms': 50.0, 'error_rate': 0.0}}}
+    run = {'mode': 'concurrency', 'concurrency': 16, 'rate': None,
+           'throughput': 60.0, 'p95_ms': 52.0, 'error_rate': 0.02}
+
+    regressions = compare(run, baseline, tolerance=0.3)
+
+    assert len(regressions) == 2
+    assert 'req/s' in regressions[0] and 'error rate' in regressions[1]
+    assert compare(dict(run, concurrency=8), baseline) == []
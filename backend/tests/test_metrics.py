@@ -0,0 +1,33 @@
+# backend/tests/test_metrics.py
+from fastapi.testclient import TestClient
+from app.main import app
+from app.metrics import REGISTRY
+
+client = TestClient(app)
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+def test_requests_are_recorded_per_route_template():
+    before = _sample('http_request_duration_seconds_count', method='GET', route='/api/topics/{topic_id}/publications', status='404')
+    queries_before = _sample('http_request_db_queries_sum', method='GET', route='/api/topics/{topic_id}/publications')
+
+    client.get("/api/topics/999999/publications")
+    client.get("/api/topics/999998/publications")
+
+    after = _sample('http_request_duration_seconds_count', method='GET', route='/api/topics/{topic_id}/publications', status='404')
+    assert after - before == 2
+    assert _sample('http_request_db_queries_sum', method='GET', route='/api/topics/{topic_id}/publications') > queries_before
+    assert _sample('http_requests_in_flight') == 0
+
+def test_metrics_endpoint_uses_prometheus_text_format():
+    client.get("/health")
+    client.get("/no-such-page")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain')
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/health",status="200"}' in response.text
+    assert 'route="unmatched"' in response.text
+    assert 'http_response_size_bytes_sum{method="GET",route="/health"}' in response.text
@@ -0,0 +1,94 @@
+# backend/tests/test_openalex_fetcher.py
+import httpx
+import pytest
+from app.services import openalex_fetcher
+from app.services.openalex_fetcher import OpenAlexFetcher
+from benchmarks.record_fixtures import synthetic_pages
+
+def _fetcher(monkeypatch, responses):
+    """Fetcher whose HTTP calls return `responses` in order; sleeps are recorded, not slept"""
+    sleeps = []
+    monkeypatch.setattr(openalex_fetcher.time, 'sleep', sleeps.append)
+    queue = list(responses)
+
+    def handler(request):
+        return queue.pop(0)
+
+    fetcher = OpenAlexFetcher(requests_per_second=1000.0)
+    fetcher.session = httpx.Client(transport=httpx.MockTransport(handler))
+    return fetcher, sleeps
+
+def test_retry_after_pauses_and_rate_recovers_additively(monkeypatch):
+    fetcher, sleeps = _fetcher(monkeypatch, [
+        httpx.Response(429, headers={'Retry-After': '0'}),
+        httpx.Response(200, json={'results': [1]}),
+    ])
+
+    assert fetcher._make_request('works', {}) == {'results': [1]}
+
+    requests = fetcher.stats['requests']
+    assert requests['ok'] == 1 and requests['throttled'] == 1 and requests['retries'] == 1
+    assert requests['rate_decreases'] == 1 and requests['min_rate'] == 500.0
+    assert fetcher._rate == 500.0 + OpenAlexFetcher.RATE_STEP
+    assert not [s for s in sleeps if s >= 1]
+    assert fetcher.request_log[0]['attempts'] == 2 and fetcher.request_log[0]['throttled'] == 1
+
+def test_server_errors_back_off_with_jitter_then_get_logged(monkeypatch):
+    fetcher, sleeps = _fetcher(monkeypatch, [httpx.Response(502) for _ in range(3)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetcher._make_request('works', {}, retry=3)
+
+    # Full jitter: attempt n sleeps at most base * 2^n
+    backoffs = [s for s in sleeps if s > 0.01]
+    assert len(fetcher.request_log) == 1 and fetcher.stats['requests']['retries'] == 2
+    assert all(s <= OpenAlexFetcher.BACKOFF_BASE * 2 ** 1 for s in backoffs)
+    assert fetcher.stats['errors'][0]['status'] == 502
+    assert fetcher.stats['errors'][0]['attempts'] == 3
+
+def test_retry_after_is_honoured_on_any_retryable_status(monkeypatch):
+    fetcher, sleeps = _fetcher(monkeypatch, [
+        httpx.Response(502, headers={'Retry-After': '7'}),
+        httpx.Response(200, json={'results': []}),
+    ])
+
+    assert fetcher._make_request('works', {}) == {'results': []}
+
+    # The server's wait replaces the jittered backoff; the rate is not cut
+    requests = fetcher.stats['requests']
+    assert [round(s) for s in sleeps if s > 0.01] == [7]
+    assert requests['retries'] == 1 and requests['backoff_seconds'] == 7.0
+    assert requests['throttled'] == 0 and requests['rate_decreases'] == 0
+
+def test_client_errors_are_not_retried(monkeypatch):
+    fetcher, _ = _fetcher(monkeypatch, [httpx.Response(400, text='bad filter')])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        fetcher._make_request('works', {'filter': 'nope'})
+
+    report = fetcher.run_report()
+    assert report['requests']['failed'] == 1 and report['requests']['attempts'] == 1
+    assert report['errors'][0]['error'] == 'bad filter'
+
+def test_work_requests_select_only_parsed_fields_at_full_page_size(monkeypatch):
+    monkeypatch.setattr(openalex_fetcher.time, 'sleep', lambda seconds: None)
+    page = synthetic_pages(1, 20)[0]
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.params)
+        if 'cursor' not in request.url.params:  # per-institution fallback
+            return httpx.Response(200, json={'results': []})
+        return httpx.Response(200, json={'results': page, 'meta': {'next_cursor': None}})
+
+    fetcher = OpenAlexFetcher(requests_per_second=1000.0)
+    fetcher.session = httpx.Client(transport=httpx.MockTransport(handler))
+
+    # Streaming pipeline and sharded harvest
+    list(fetcher.iter_work_pages(limit=1000, year_from=2020, year_to=2020))
+    fetcher.fetch_indonesian_publications(limit=1000, year_from=2020, year_to=2021, workers=2, shard_by='year')
+
+    paged = [params for params in requests if 'cursor' in params]
+    assert len(paged) == 3
+    assert all(params['per-page'] == str(OpenAlexFetcher.PER_PAGE) == '200' for params in paged)
+    assert all(params['select'] == ','.join(OpenAlexFetcher.WORK_FIELDS) for params in requests)
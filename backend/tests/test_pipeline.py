@@ -0,0 +1,106 @@
+# backend/tests/test_pipeline.py
+import itertools
+import threading
+import pytest
+from app.models import Publication
+from app.services.pipeline import run_ingest_pipeline
+
+PAGE_SIZE = 5
+QUEUE_SIZE = 2
+PARSE_WORKERS = 2
+
+def _fetch_bound(loaded_pages):
+    """Pages an endless source can get ahead of the load stage: both queues
+    full, one page in each parser, one held by the fetch stage and the one
+    it fetches before it sees the stop"""
+    return loaded_pages + 2 * QUEUE_SIZE + PARSE_WORKERS + 2
+
+class StubFetcher:
+    """Endless (or `pages`-long) stream of distinct works; optional failures"""
+
+    def __init__(self, pages=None, fail_fetch_at=None, fail_parse_at=None):
+        self.pages = pages
+        self.fail_fetch_at = fail_fetch_at
+        self.fail_parse_at = fail_parse_at
+        self.fetched = 0
+        self.stats = {'indonesian_verified': 0}
+
+    def iter_work_pages(self, **kwargs):
+        for page in itertools.count() if self.pages is None else range(self.pages):
+            if page == self.fail_fetch_at:
+                raise RuntimeError('connection reset')
+            self.fetched += 1
+            yield [self._work(page * PAGE_SIZE + i) for i in range(PAGE_SIZE)], None
+
+    @staticmethod
+    def _work(n):
+        return {
+            'openalex_id': f'https://openalex.org/W{n}', 'title': f'Judul {n}',
+            'abstract': ' '.join(f'kata{n}x{j}' for j in range(20)), 'year': 2021,
+            'authors': [], 'author_ids': [], 'affiliations': [],
+        }
+
+    def parse_page(self, works, institution=None, target_institutions=None):
+        if self.fail_parse_at is not None and works[0]['title'] == f'Judul {self.fail_parse_at * PAGE_SIZE}':
+            raise ValueError('bad page')
+        return works
+
+    def record_publications(self, publications):
+        pass
+
+@pytest.fixture
+def db(sqlite_session):
+    # The pipeline runs in a thread of its own, the assertions in this one
+    return sqlite_session
+
+def _run(timeout=20, **kwargs):
+    """run_ingest_pipeline in a thread; fails the test if it does not return"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = run_ingest_pipeline(**kwargs)
+        except BaseException as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), 'pipeline did not shut down'
+    assert not [t for t in threading.enumerate() if t.name.startswith('pipeline-')]
+    return outcome
+
+def test_failing_stages_are_reported_and_the_pipeline_winds_down(db):
+    outcome = _run(fetcher=StubFetcher(pages=6, fail_fetch_at=4, fail_parse_at=1),
+                   db=db, limit=1000, year_from=2020, queue_size=QUEUE_SIZE,
+                   parse_workers=PARSE_WORKERS, batch_size=4)
+
+    result = outcome['result']
+    # Pages 0, 2 and 3 were loaded; page 1 failed to parse, page 4 to fetch
+    assert sorted(e['stage'] for e in result['errors']) == ['fetch', 'parse']
+    assert result['verified'] == 3 * PAGE_SIZE
+    assert result['written']['inserted'] == 3 * PAGE_SIZE == db.query(Publication).count()
+
+def test_load_failure_is_raised_after_every_stage_stopped(db):
+    def cancel(totals):
+        if totals['loaded'] >= 10:
+            raise KeyboardInterrupt  # e.g. Ctrl+C or a job cancellation
+
+    fetcher = StubFetcher()
+    outcome = _run(fetcher=fetcher, db=db, limit=10**6, year_from=2020,
+                   queue_size=QUEUE_SIZE,
+                   parse_workers=PARSE_WORKERS, batch_size=5, on_batch=cancel)
+
+    assert isinstance(outcome['error'], KeyboardInterrupt)
+    # The endless fetch stage stopped shortly after, held back by the bounded queues
+    assert db.query(Publication).count() == 10
+    assert fetcher.fetched <= _fetch_bound(2)
+
+def test_reaching_the_limit_stops_an_endless_source(db):
+    fetcher = StubFetcher()
+    outcome = _run(fetcher=fetcher, db=db, limit=12, year_from=2020, queue_size=QUEUE_SIZE,
+                   parse_workers=PARSE_WORKERS, batch_size=5)
+
+    assert outcome['result']['verified'] == 12 == db.query(Publication).count()
+    assert outcome['result']['errors'] == []
+    assert fetcher.fetched <= _fetch_bound(3)
@@ -0,0 +1,64 @@
+# backend/tests/test_query_profiler.py
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from app import query_profiler
+from app.database import get_db, get_read_db
+from app.main import app
+from app.models import Author, Publication
+from app.query_profiler import NPlusOneError, install_query_hooks, statement_shape, track_queries
+
+@pytest.fixture
+def session_factory(sqlite_engine):
+    install_query_hooks(sqlite_engine)
+    Session = sessionmaker(bind=sqlite_engine)
+
+    db = Session()
+    for i in range(8):
+        db.add(Publication(
+            title=f'Publikasi {i}', year=2020 + i % 3, source='TEST', doi=f'10.1/{i}',
+            authors=[Author(name=f'Penulis {i}')]
+        ))
+    db.commit()
+    db.close()
+    return Session
+
+def test_statement_shape_ignores_literals_and_whitespace():
+    assert statement_shape("SELECT * FROM t WHERE id = 12 AND name = 'it''s'") == \
+        statement_shape("SELECT *\n  FROM t WHERE id = 7 AND name = 'x'")
+
+def test_lazy_loading_in_a_loop_fails_in_strict_mode(session_factory):
+    db = session_factory()
+
+    with pytest.raises(NPlusOneError, match='publication_authors'):
+        with track_queries('lazy authors', strict=True):
+            for pub in db.query(Publication).all():
+                pub.authors
+
+    db.expire_all()
+    with track_queries('single query', strict=True) as stats:
+        db.query(Publication).all()
+    assert stats.count == 1
+
+def test_publication_endpoints_have_no_n_plus_one(session_factory, monkeypatch):
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    monkeypatch.setattr(query_profiler, 'N_PLUS_ONE_STRICT', True)
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    try:
+        client = TestClient(app)
+        listing = client.get('/api/publications/', params={'per_page': 8})
+        detail = client.get(f"/api/publications/{listing.json()['items'][0]['id']}")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert listing.status_code == 200
+    assert all(len(item['authors']) == 1 for item in listing.json()['items'])
+    assert detail.status_code == 200
+    assert detail.json()['authors'][0]['name'].startswith('Penulis')
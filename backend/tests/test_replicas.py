@@ -0,0 +1,78 @@
+# backend/tests/test_replicas.py
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app import database
+from app.database import Base
+from app.main import app
+from app.models import Topic
+from app import replicas
+from app.replicas import ReplicaRouter
+
+def _database(path, topic_name):
+    engine = create_engine(f'sqlite:///{path}')
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(Topic(name=topic_name, keywords='uji'))
+        db.commit()
+    return engine, Session
+
+def _topic_names(session):
+    with session as db:
+        return [t.name for t in db.query(Topic).all()]
+
+def test_reads_go_to_current_replicas_and_fall_back_to_primary(tmp_path):
+    _, Primary = _database(tmp_path / 'primary.db', 'Primer')
+    replica, _ = _database(tmp_path / 'replica.db', 'Replika')
+    lags = {'lag': 0.0}
+    router = ReplicaRouter(Primary, [replica], max_lag=5, check_interval=0,
+                           lag_probe=lambda conn: lags['lag'])
+
+    assert _topic_names(router.session()) == ['Replika']
+
+    lags['lag'] = 30.0
+    assert _topic_names(router.session()) == ['Primer']
+    assert router.status()[0]['usable'] is False
+
+    lags['lag'] = None  # standby that has not replayed anything yet
+    assert _topic_names(router.session()) == ['Primer']
+
+    lags['lag'] = 1.0
+    assert _topic_names(router.session()) == ['Replika']
+    assert router.routed == {'replica0': 2, 'primary': 2}
+
+def test_unreachable_replica_is_skipped_and_probes_are_cached(tmp_path):
+    _, Primary = _database(tmp_path / 'primary.db', 'Primer')
+    first, _ = _database(tmp_path / 'first.db', 'Replika')
+    broken = create_engine(f'sqlite:///{tmp_path}/missing/dir/replica.db')
+    probes = []
+    router = ReplicaRouter(Primary, [broken, first], check_interval=60,
+                           lag_probe=lambda conn: probes.append(1) or 0.0)
+
+    assert [_topic_names(router.session()) for _ in range(4)] == [['Replika']] * 4
+    assert 'unable to open database file' in router.status()[0]['error']
+    # One probe of the healthy replica serves all four sessions
+    assert len(probes) == 1
+
+def test_postgres_replicas_get_a_connect_timeout(monkeypatch):
+    created = {}
+    def fake_create_engine(url, **kwargs):
+        created[url] = kwargs
+        return create_engine('sqlite://')
+    monkeypatch.setattr(replicas, 'create_engine', fake_create_engine)
+
+    ReplicaRouter.from_urls(lambda: None, ['postgresql://u@replica1/db', 'sqlite:///copy.db'])
+
+    assert created['postgresql://u@replica1/db']['connect_args'] == {
+        'connect_timeout': replicas.REPLICA_CONNECT_TIMEOUT}
+    assert created['sqlite:///copy.db']['connect_args'] == {}
+
+def test_read_endpoints_use_the_router(tmp_path, monkeypatch):
+    replica, _ = _database(tmp_path / 'replica.db', 'Replika')
+    router = ReplicaRouter(database.SessionLocal, [replica], check_interval=0)
+    monkeypatch.setattr(database, '_read_router', router)
+
+    client = TestClient(app)
+    assert [t['name'] for t in client.get('/api/topics/').json()] == ['Replika']
+    assert router.routed['replica0'] == 1
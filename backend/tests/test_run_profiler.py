@@ -0,0 +1,47 @@
+# backend/tests/test_run_profiler.py
+import json
+import numpy as np
+import scipy.sparse as sp
+from app.services.run_profiler import RunProfiler, describe_matrix, load_history, save_report
+
+def test_describe_matrix_dense_and_sparse():
+    dense = np.array([[0.0, 1.0], [0.0, 0.0]])
+    sparse = sp.csr_matrix(dense)
+
+    assert describe_matrix(dense)['nnz'] == describe_matrix(sparse)['nnz'] == 1
+    assert describe_matrix(sparse)['shape'] == [2, 2]
+    assert describe_matrix(sparse)['density'] == 0.25
+
+def test_stages_are_recorded_even_when_they_fail():
+    profiler = RunProfiler('unit', documents=3)
+
+    with profiler.stage('allocate', n=1) as stage:
+        stage['matrix'] = describe_matrix(np.ones((1000, 100)))
+    try:
+        with profiler.stage('explode'):
+            raise ValueError
+    except ValueError:
+        pass
+
+    report = profiler.report()
+    assert [s['stage'] for s in report['stages']] == ['allocate', 'explode']
+    allocate = report['stages'][0]
+    assert allocate['n'] == 1 and allocate['matrix']['shape'] == [1000, 100]
+    assert allocate['wall_seconds'] >= 0 and allocate['cpu_seconds'] >= 0
+    assert report['meta'] == {'documents': 3}
+
+def test_history_keeps_one_summary_per_run(tmp_path):
+    for _ in range(2):
+        profiler = RunProfiler('topic_modeling')
+        with profiler.stage('fit'):
+            pass
+        path = save_report(profiler.report(), str(tmp_path))
+    other = RunProfiler('other')
+    save_report(other.report(), str(tmp_path))
+
+    history = load_history('topic_modeling', str(tmp_path))
+
+    assert len(history) == 2
+    assert set(history[-1]['stages']['fit']) == {'wall_seconds', 'cpu_seconds', 'peak_rss_mib'}
+    with open(path) as f:
+        assert json.load(f)['stages'][0]['stage'] == 'fit'
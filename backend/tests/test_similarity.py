@@ -0,0 +1,30 @@
+# backend/tests/test_similarity.py
+import numpy as np
+from app.services.similarity import build_similarity_index, get_similarity_index
+
+def test_related_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(0)
+    doc_topics = rng.dirichlet(np.ones(8), size=500)
+    pub_ids = list(range(1000, 500, -1))
+    build_similarity_index(pub_ids, doc_topics, index_dir=str(tmp_path))
+
+    index = get_similarity_index(str(tmp_path))
+    related = index.related(900, k=5)
+
+    normed = doc_topics / np.linalg.norm(doc_topics, axis=1, keepdims=True)
+    query = normed[pub_ids.index(900)]
+    expected = [pub_ids[i] for i in np.argsort(-(normed @ query))[1:6]]
+
+    assert [pub_id for pub_id, _ in related] == expected
+    assert index.related(1, k=5) is None
+
+def test_rebuild_switches_current_version(tmp_path):
+    doc_topics = np.eye(3)
+    first = build_similarity_index([1, 2, 3], doc_topics, index_dir=str(tmp_path))
+    second = build_similarity_index([4, 5, 6], doc_topics, index_dir=str(tmp_path))
+
+    index = get_similarity_index(str(tmp_path))
+    assert first != second
+    assert index.version_dir.endswith(second)
+    assert index.related(1) is None
+    assert len(index.related(4, k=10)) == 2
@@ -0,0 +1,49 @@
+# backend/tests/test_startup.py
+import json
+import os
+import subprocess
+import sys
+
+# Seconds `import app.main` may add on top of FastAPI / SQLAlchemy / Pydantic
+# themselves. Every autoscaled worker pays this before serving its first request.
+IMPORT_BUDGET = 0.5
+
+# Only needed by particular endpoints or by the job worker
+HEAVY_MODULES = ('numpy', 'scipy', 'sklearn', 'pyarrow', 'duckdb', 'httpx', 'psycopg2')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import fastapi, pydantic, sqlalchemy.orm
+frameworks = time.perf_counter()
+import app.main
+done = time.perf_counter()
+
+from app import database
+result = {
+    'app_seconds': done - frameworks,
+    'framework_seconds': frameworks - start,
+    'heavy': [m for m in %r if m in sys.modules],
+    'engine_created': database._engine is not None,
+}
+
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    result['health'] = client.get('/health').status_code
+print(json.dumps(result))
+""" % (HEAVY_MODULES,)
+
+def test_app_import_is_fast_and_needs_no_database():
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # Nothing listens here: import and startup must not try to connect
+    env = dict(os.environ, DATABASE_URL='postgresql://nobody@127.0.0.1:9/unreachable')
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], cwd=backend, env=env,
+        capture_output=True, text=True, check=True, timeout=60
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result['heavy'] == []
+    assert result['engine_created'] is False
+    assert result['health'] == 200
+    assert result['app_seconds'] < IMPORT_BUDGET, result
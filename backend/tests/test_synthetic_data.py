@@ -0,0 +1,34 @@
+# backend/tests/test_synthetic_data.py
+from collections import Counter
+from scripts.generate_synthetic_data import SyntheticDataset, TOPIC_THRESHOLD
+
+TOPIC_IDS = list(range(101, 110))
+
+def _rows(text):
+    return [line.split('\t') for line in text.splitlines()]
+
+def test_blocks_are_deterministic_and_ids_only_shift_with_offsets():
+    a = SyntheticDataset(1200, 300, TOPIC_IDS, seed=3).block(0)
+    b = SyntheticDataset(1200, 300, TOPIC_IDS, seed=3).block(0)
+    shifted = SyntheticDataset(1200, 300, TOPIC_IDS, seed=3, first_publication_id=1001).block(0)
+
+    assert a == b
+    assert [r[1:5] for r in _rows(a['publications'])] == [r[1:5] for r in _rows(shifted['publications'])]
+    assert _rows(shifted['publications'])[0][0] == '1001'
+
+def test_block_links_stay_inside_the_dataset():
+    dataset = SyntheticDataset(500, 200, TOPIC_IDS, seed=5, first_author_id=50)
+    block = dataset.block(0)
+
+    pubs = {int(r[0]) for r in _rows(block['publications'])}
+    links = [(int(p), int(a)) for p, a in _rows(block['publication_authors'])]
+    topics = [(int(p), int(t), float(w)) for p, t, w in _rows(block['publication_topics'])]
+
+    assert block['rows'] == len(pubs) == 500
+    assert len(links) == len(set(links))
+    assert {p for p, _ in links} == pubs
+    assert all(50 <= a < 250 for _, a in links)
+
+    assert {p for p, _, _ in topics} == pubs
+    assert all(t in TOPIC_IDS and TOPIC_THRESHOLD < w <= 1 for _, t, w in topics)
+    assert max(Counter(p for p, _, _ in topics).values()) <= 3
@@ -0,0 +1,52 @@
+# backend/tests/test_topic_growth.py
+import numpy as np
+from fastapi.testclient import TestClient
+from app.main import app
+from app.services import topic_growth
+from app.services.topic_growth import compute_growth, emerging_topics
+
+ROWS = [(year, 'Stabil', 10) for year in range(2019, 2025)] + [
+    (2019, 'Naik', 2), (2020, 'Naik', 2), (2021, 'Naik', 2),
+    (2022, 'Naik', 6), (2023, 'Naik', 12), (2024, 'Naik', 20),
+    (2024, 'Baru', 1),
+]
+
+def test_growth_figures_match_a_per_topic_calculation():
+    result = compute_growth(ROWS, window=3, limit=5, min_publications=2)
+
+    assert result['recent_years'] == [2022, 2024] and result['previous_years'] == [2019, 2021]
+    assert [t['topic'] for t in result['topics']] == ['Naik', 'Stabil']  # 'Baru' is under min_publications
+
+    naik = result['topics'][0]
+    totals = {y: sum(c for yy, _, c in ROWS if yy == y) for y in range(2019, 2025)}
+    share = {y: c / totals[y] for y, t, c in ROWS if t == 'Naik'}
+    recent, previous = np.mean([share[y] for y in (2022, 2023, 2024)]), np.mean([share[y] for y in (2019, 2020, 2021)])
+    assert naik['share_change'] == round((recent - previous) * 100, 2)
+    assert naik['growth'] == round(20 / 12 - 1, 4)
+    assert naik['average_growth'] == round(np.mean([6 / 2 - 1, 12 / 6 - 1, 20 / 12 - 1]), 4)
+    assert naik['moving_average'] == round((6 + 12 + 20) / 3, 2)
+    assert naik['counts'] == {2019: 2, 2020: 2, 2021: 2, 2022: 6, 2023: 12, 2024: 20}
+    assert compute_growth([], window=3)['topics'] == []
+
+def test_results_are_cached_per_data_version(monkeypatch):
+    monkeypatch.setattr(topic_growth, '_cache', {})
+    monkeypatch.setattr(topic_growth, '_cache_version', None)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return ROWS
+
+    first = emerging_topics('v1', load, window=2)
+    assert emerging_topics('v1', load, window=2) is first
+    emerging_topics('v1', load, window=3)
+    emerging_topics('v2', load, window=2)
+    assert len(loads) == 3
+
+def test_emerging_endpoint():
+    response = TestClient(app).get('/api/topics/emerging', params={'window': 2, 'limit': 3, 'min_publications': 0})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body['topics']) <= 3 and body['version']
+    assert [t['rank'] for t in body['topics']] == list(range(1, len(body['topics']) + 1))
+    assert TestClient(app).get('/api/topics/emerging', params={'window': 0}).status_code == 422
@@ -26,6 +26,11 @@ export const getPublicationStats = async () => {
   return response.data;
 };
 
+export const getPublicationFacets = async (params = {}) => {
+  const response = await api.get('/api/publications/facets', { params });
+  return response.data;
+};
+
 export const getPublicationById = async (id) => {
   const response = await api.get(`/api/publications/${id}`);
   return response.data;
@@ -41,4 +46,9 @@ export const getTopicTrends = async () => {
   return response.data;
 };
 
+export const getEmergingTopics = async (params = {}) => {
+  const response = await api.get('/api/topics/emerging', { params });
+  return response.data;
+};
+
 export default api;
\ No newline at end of file